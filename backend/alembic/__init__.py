@@ -1,2 +0,0 @@
-# backend/app/__init__.py
-# Empty file to make the directory a Python package
\ No newline at end of file
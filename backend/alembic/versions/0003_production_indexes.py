@@ -0,0 +1,89 @@
+"""production indexes
+
+Foreign-key, filter and ordering indexes for the hot read paths, plus the
+uniqueness rules the services already assume (one enrollment per user and
+course, one completion per user and lesson).
+
+On PostgreSQL the indexes are built with CREATE INDEX CONCURRENTLY outside
+the migration transaction so large tables stay writable. The unique
+constraints fail if duplicate rows already exist; remove them first.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_courses_certification_type', 'courses', ['certification_type']),
+    ('ix_courses_difficulty_level', 'courses', ['difficulty_level']),
+    ('ix_modules_course_id_order_index', 'modules', ['course_id', 'order_index']),
+    ('ix_lessons_module_id_order', 'lessons', ['module_id', 'order']),
+    ('ix_enrollments_course_id', 'enrollments', ['course_id']),
+    ('ix_enrollments_status', 'enrollments', ['status']),
+    ('ix_assessments_course_id', 'assessments', ['course_id']),
+    ('ix_assessments_module_id', 'assessments', ['module_id']),
+    ('ix_questions_assessment_id', 'questions', ['assessment_id']),
+    ('ix_answers_question_id', 'answers', ['question_id']),
+    ('ix_user_assessments_assessment_id', 'user_assessments', ['assessment_id']),
+    ('ix_user_assessments_user_id_assessment_id_status', 'user_assessments', ['user_id', 'assessment_id', 'status']),
+    ('ix_user_answers_user_assessment_id', 'user_answers', ['user_assessment_id']),
+    ('ix_user_answers_question_id', 'user_answers', ['question_id']),
+    ('ix_lesson_completions_lesson_id', 'lesson_completions', ['lesson_id']),
+    ('ix_assessment_attempts_user_id_assessment_id', 'assessment_attempts', ['user_id', 'assessment_id']),
+    ('ix_forum_topics_user_id', 'forum_topics', ['user_id']),
+    ('ix_forum_topics_course_id', 'forum_topics', ['course_id']),
+    ('ix_forum_topics_created_at', 'forum_topics', ['created_at']),
+    ('ix_forum_replies_user_id', 'forum_replies', ['user_id']),
+    ('ix_forum_replies_topic_id', 'forum_replies', ['topic_id']),
+]
+
+UNIQUE_CONSTRAINTS = [
+    ('uq_enrollments_user_id_course_id', 'enrollments', ['user_id', 'course_id']),
+    ('uq_lesson_completions_user_id_lesson_id', 'lesson_completions', ['user_id', 'lesson_id']),
+]
+
+
+def _is_postgresql() -> bool:
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def upgrade() -> None:
+    if _is_postgresql():
+        with op.get_context().autocommit_block():
+            for name, table, columns in INDEXES:
+                op.create_index(name, table, columns, unique=False,
+                                postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False)
+
+    for name, table, columns in UNIQUE_CONSTRAINTS:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.create_unique_constraint(name, columns)
+
+
+def downgrade() -> None:
+    for name, table, columns in reversed(UNIQUE_CONSTRAINTS):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_constraint(name, type_='unique')
+
+    if _is_postgresql():
+        with op.get_context().autocommit_block():
+            for name, table, columns in reversed(INDEXES):
+                op.drop_index(name, table_name=table,
+                              postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table)
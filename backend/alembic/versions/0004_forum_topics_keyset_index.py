@@ -0,0 +1,44 @@
+"""forum_topics keyset index
+
+Replaces the single-column created_at index with (created_at, id), the
+ordering used by cursor pagination of forum topics.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.create_index('ix_forum_topics_created_at_id', 'forum_topics', ['created_at', 'id'],
+                            unique=False, postgresql_concurrently=True, if_not_exists=True)
+            op.drop_index('ix_forum_topics_created_at', table_name='forum_topics',
+                          postgresql_concurrently=True, if_exists=True)
+    else:
+        op.create_index('ix_forum_topics_created_at_id', 'forum_topics', ['created_at', 'id'], unique=False)
+        op.drop_index('ix_forum_topics_created_at', table_name='forum_topics')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.create_index('ix_forum_topics_created_at', 'forum_topics', ['created_at'],
+                            unique=False, postgresql_concurrently=True, if_not_exists=True)
+            op.drop_index('ix_forum_topics_created_at_id', table_name='forum_topics',
+                          postgresql_concurrently=True, if_exists=True)
+    else:
+        op.create_index('ix_forum_topics_created_at', 'forum_topics', ['created_at'], unique=False)
+        op.drop_index('ix_forum_topics_created_at_id', table_name='forum_topics')
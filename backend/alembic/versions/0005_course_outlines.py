@@ -0,0 +1,42 @@
+"""course_outlines
+
+Pre-serialized course trees read by the catalog and course detail endpoints.
+Existing courses get their outline from ``python -m app.db.init_db``, which
+runs after the migrations on deploy.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('course_outlines',
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('is_published', sa.Boolean(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('header', sa.Text(), nullable=False),
+    sa.Column('modules', sa.Text(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('course_id')
+    )
+    op.create_index('ix_course_outlines_is_published_course_id', 'course_outlines',
+                    ['is_published', 'course_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_course_outlines_is_published_course_id', table_name='course_outlines')
+    op.drop_table('course_outlines')
@@ -0,0 +1,73 @@
+"""search_documents
+
+Searchable text of courses, modules and lessons, with a full-text index
+maintained by the database: a generated tsvector column and GIN index on
+PostgreSQL, an FTS5 table kept in step by triggers on SQLite (see
+app/db/fulltext.py). Existing rows are indexed here.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db import fulltext
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('search_documents',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=16), nullable=False),
+    sa.Column('object_id', sa.Integer(), nullable=False),
+    sa.Column('course_id', sa.Integer(), nullable=False),
+    sa.Column('module_id', sa.Integer(), nullable=True),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('body', sa.Text(), nullable=False),
+    sa.Column('is_published', sa.Boolean(), nullable=False),
+    sa.Column('course_published', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_search_documents_kind_object_id', 'search_documents', ['kind', 'object_id'], unique=True)
+    op.create_index(op.f('ix_search_documents_course_id'), 'search_documents', ['course_id'], unique=False)
+    op.create_index(op.f('ix_search_documents_module_id'), 'search_documents', ['module_id'], unique=False)
+    fulltext.create_index(None, op.get_bind())
+
+    op.execute("""
+        INSERT INTO search_documents (kind, object_id, course_id, module_id, title, body, is_published, course_published)
+        SELECT 'course', id, id, NULL, title, coalesce(description, ''),
+               coalesce(is_published, false), coalesce(is_published, false)
+        FROM courses
+    """)
+    op.execute("""
+        INSERT INTO search_documents (kind, object_id, course_id, module_id, title, body, is_published, course_published)
+        SELECT 'module', m.id, m.course_id, m.id, m.title,
+               coalesce(m.description, '') || ' ' || coalesce(m.content, ''),
+               coalesce(m.is_published, false), coalesce(c.is_published, false)
+        FROM modules m JOIN courses c ON c.id = m.course_id
+    """)
+    op.execute("""
+        INSERT INTO search_documents (kind, object_id, course_id, module_id, title, body, is_published, course_published)
+        SELECT 'lesson', l.id, m.course_id, m.id, l.title, l.content,
+               coalesce(l.is_published, false), coalesce(c.is_published, false)
+        FROM lessons l JOIN modules m ON m.id = l.module_id JOIN courses c ON c.id = m.course_id
+    """)
+
+
+def downgrade() -> None:
+    fulltext.drop_index(None, op.get_bind())
+    op.drop_index(op.f('ix_search_documents_module_id'), table_name='search_documents')
+    op.drop_index(op.f('ix_search_documents_course_id'), table_name='search_documents')
+    op.drop_index('ix_search_documents_kind_object_id', table_name='search_documents')
+    op.drop_table('search_documents')
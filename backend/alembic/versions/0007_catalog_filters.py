@@ -0,0 +1,65 @@
+"""catalog filters and facet counts
+
+Copies the filterable course columns into course_outlines with composite
+indexes for filtered catalog pages, and adds course_facet_counts, the
+per-value course counts maintained by the course writers (see
+app/services/facet_service.py). Both are filled from the existing courses.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FACETS = ('certification_type', 'difficulty_level')
+
+
+def upgrade() -> None:
+    op.add_column('course_outlines', sa.Column('certification_type', sa.String(), nullable=True))
+    op.add_column('course_outlines', sa.Column('difficulty_level', sa.String(), nullable=True))
+    op.add_column('course_outlines', sa.Column('estimated_duration', sa.Integer(), nullable=True))
+    op.execute("""
+        UPDATE course_outlines SET
+            certification_type = (SELECT c.certification_type FROM courses c WHERE c.id = course_outlines.course_id),
+            difficulty_level = (SELECT c.difficulty_level FROM courses c WHERE c.id = course_outlines.course_id),
+            estimated_duration = (SELECT c.estimated_duration FROM courses c WHERE c.id = course_outlines.course_id)
+    """)
+    op.create_index('ix_course_outlines_certification', 'course_outlines',
+                    ['is_published', 'certification_type', 'difficulty_level', 'course_id'], unique=False)
+    op.create_index('ix_course_outlines_difficulty', 'course_outlines',
+                    ['is_published', 'difficulty_level', 'course_id'], unique=False)
+
+    op.create_table('course_facet_counts',
+    sa.Column('facet', sa.String(length=32), nullable=False),
+    sa.Column('value', sa.String(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('published', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('facet', 'value')
+    )
+    for facet in FACETS:
+        op.execute(f"""
+            INSERT INTO course_facet_counts (facet, value, total, published)
+            SELECT '{facet}', {facet}, count(*), sum(CASE WHEN is_published THEN 1 ELSE 0 END)
+            FROM courses WHERE {facet} IS NOT NULL GROUP BY {facet}
+        """)
+
+
+def downgrade() -> None:
+    op.drop_table('course_facet_counts')
+    op.drop_index('ix_course_outlines_difficulty', table_name='course_outlines')
+    op.drop_index('ix_course_outlines_certification', table_name='course_outlines')
+    with op.batch_alter_table('course_outlines') as batch_op:
+        batch_op.drop_column('estimated_duration')
+        batch_op.drop_column('difficulty_level')
+        batch_op.drop_column('certification_type')
@@ -0,0 +1,114 @@
+"""content_blobs
+
+Moves lesson and module bodies into content_blobs, compressed and stored
+once per distinct text; the rows keep the SHA-256 of their body in
+content_hash (see app/db/content_store.py).
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db import content_store
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+blobs = sa.table('content_blobs',
+    sa.column('hash', sa.String), sa.column('encoding', sa.String),
+    sa.column('size', sa.Integer), sa.column('data', sa.LargeBinary),
+)
+
+
+def _move_bodies(table_name: str) -> None:
+    # Hash and compress in Python, in id order and in batches
+    connection = op.get_bind()
+    rows = sa.table(table_name, sa.column('id', sa.Integer), sa.column('content', sa.Text),
+                    sa.column('content_hash', sa.String))
+    stored = set(connection.execute(sa.select(blobs.c.hash)).scalars())
+    last_id = 0
+    while True:
+        batch = connection.execute(
+            sa.select(rows.c.id, rows.c.content)
+            .where(rows.c.id > last_id, rows.c.content.is_not(None))
+            .order_by(rows.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not batch:
+            break
+        new_blobs, hashes = [], []
+        for row_id, text in batch:
+            content_hash = content_store.digest(text)
+            if content_hash not in stored:
+                encoding, data = content_store.encode(text)
+                new_blobs.append({'hash': content_hash, 'encoding': encoding,
+                                  'size': len(text.encode()), 'data': data})
+                stored.add(content_hash)
+            hashes.append({'row_id': row_id, 'new_hash': content_hash})
+        if new_blobs:
+            connection.execute(blobs.insert(), new_blobs)
+        connection.execute(
+            rows.update().where(rows.c.id == sa.bindparam('row_id')).values(content_hash=sa.bindparam('new_hash')),
+            hashes,
+        )
+        last_id = batch[-1][0]
+
+
+def _restore_bodies(table_name: str) -> None:
+    connection = op.get_bind()
+    rows = sa.table(table_name, sa.column('id', sa.Integer), sa.column('content', sa.Text),
+                    sa.column('content_hash', sa.String))
+    for row_id, encoding, data in connection.execute(
+        sa.select(rows.c.id, blobs.c.encoding, blobs.c.data).join(blobs, blobs.c.hash == rows.c.content_hash)
+    ):
+        connection.execute(
+            rows.update().where(rows.c.id == row_id).values(content=content_store.decode(encoding, data))
+        )
+
+
+def upgrade() -> None:
+    op.create_table('content_blobs',
+    sa.Column('hash', sa.String(length=64), nullable=False),
+    sa.Column('encoding', sa.String(length=16), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('data', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('hash')
+    )
+    op.add_column('lessons', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('modules', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    _move_bodies('lessons')
+    _move_bodies('modules')
+
+    with op.batch_alter_table('lessons') as batch_op:
+        batch_op.alter_column('content_hash', existing_type=sa.String(length=64), nullable=False)
+        batch_op.create_foreign_key('fk_lessons_content_hash', 'content_blobs', ['content_hash'], ['hash'])
+        batch_op.drop_column('content')
+    with op.batch_alter_table('modules') as batch_op:
+        batch_op.create_foreign_key('fk_modules_content_hash', 'content_blobs', ['content_hash'], ['hash'])
+        batch_op.drop_column('content')
+
+
+def downgrade() -> None:
+    op.add_column('lessons', sa.Column('content', sa.Text(), nullable=True))
+    op.add_column('modules', sa.Column('content', sa.Text(), nullable=True))
+    _restore_bodies('lessons')
+    _restore_bodies('modules')
+    with op.batch_alter_table('modules') as batch_op:
+        batch_op.drop_constraint('fk_modules_content_hash', type_='foreignkey')
+        batch_op.drop_column('content_hash')
+    with op.batch_alter_table('lessons') as batch_op:
+        batch_op.drop_constraint('fk_lessons_content_hash', type_='foreignkey')
+        batch_op.drop_column('content_hash')
+        batch_op.alter_column('content', existing_type=sa.Text(), nullable=False)
+    op.drop_table('content_blobs')
@@ -0,0 +1,42 @@
+"""rendered_contents
+
+Adds rendered_contents, the sanitized HTML, table of contents and reading
+time of each lesson body, written by the lesson writers (see
+app/services/render_service.py). Existing lessons are not rendered here:
+each is rendered on its first read.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('rendered_contents',
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('renderer_version', sa.Integer(), nullable=False),
+    sa.Column('html_hash', sa.String(length=64), nullable=False),
+    sa.Column('toc', sa.JSON(), nullable=False),
+    sa.Column('word_count', sa.Integer(), nullable=False),
+    sa.Column('reading_time_minutes', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['content_hash'], ['content_blobs.hash'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['html_hash'], ['content_blobs.hash'], ),
+    sa.PrimaryKeyConstraint('content_hash')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('rendered_contents')
@@ -0,0 +1,39 @@
+"""search_documents.module_published
+
+Copies each module's publication onto the search documents of its lessons
+(and of the module itself), so student searches leave out lessons of
+unpublished modules. Course documents are true.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-17 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, Sequence[str], None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('search_documents',
+                  sa.Column('module_published', sa.Boolean(), server_default=sa.true(), nullable=False))
+    op.execute("""
+        UPDATE search_documents SET module_published = coalesce(
+            (SELECT m.is_published FROM modules m WHERE m.id = search_documents.module_id), false
+        )
+        WHERE kind IN ('module', 'lesson')
+    """)
+
+
+def downgrade() -> None:
+    # Not batch mode: recreating the table on SQLite would drop the triggers
+    # of its full-text index (see app/db/fulltext.py)
+    op.execute("ALTER TABLE search_documents DROP COLUMN module_published")
@@ -0,0 +1,45 @@
+"""course outlines without bodies
+
+Drops the module and lesson bodies from the stored course outlines: they
+list modules and lessons only (ModuleSummary, LessonSummary in
+app/schemas/course.py), and bodies are read one lesson at a time.
+Downgrading leaves the outlines as they are; the next write to a course
+rebuilds its outline either way.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17 00:00:00
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, Sequence[str], None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+outlines = sa.table('course_outlines', sa.column('course_id', sa.Integer), sa.column('modules', sa.Text))
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    for course_id, modules in connection.execute(sa.select(outlines.c.course_id, outlines.c.modules)).all():
+        modules = json.loads(modules)
+        for module in modules:
+            module.pop('content', None)
+            for lesson in module['lessons']:
+                lesson.pop('content', None)
+        connection.execute(
+            outlines.update().where(outlines.c.course_id == course_id)
+            .values(modules=json.dumps(modules, separators=(',', ':'), ensure_ascii=False))
+        )
+
+
+def downgrade() -> None:
+    pass
@@ -1,7 +1,7 @@
 # backend/app/api/api.py
 from fastapi import APIRouter
 
-from app.api.endpoints import users, courses, enrollments, assessments, forums, progress
+from app.api.endpoints import users, courses, enrollments, assessments, forums, progress, admin, search
 
 api_router = APIRouter()
 api_router.include_router(users.router, prefix="/users", tags=["users"])
@@ -9,4 +9,6 @@ api_router.include_router(courses.router, prefix="/courses", tags=["courses"])
 api_router.include_router(enrollments.router, prefix="/enrollments", tags=["enrollments"])
 api_router.include_router(assessments.router, prefix="/assessments", tags=["assessments"])
 api_router.include_router(forums.router, prefix="/forums", tags=["forums"])
-api_router.include_router(progress.router, prefix="/progress", tags=["progress"])
\ No newline at end of file
+api_router.include_router(progress.router, prefix="/progress", tags=["progress"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
\ No newline at end of file
@@ -1,13 +1,15 @@
 # backend/app/api/deps.py
-from typing import Generator, Optional
+from typing import Generator, Literal, Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.db.async_session import get_async_db
 from app.db.session import get_db
 from app.models.user import User
 from app.schemas.token import TokenPayload
@@ -15,23 +17,102 @@ from app.services import user_service
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/users/login")
 
-def get_current_user(
-        db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> User:
-    """
-    Validate token and return current user.
-    """
+def _decode_token(token: str) -> TokenPayload:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=["HS256"]
         )
-        token_data = TokenPayload(**payload)
+        return TokenPayload(**payload)
     except (jwt.JWTError, ValidationError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
 
+def _claims_from_user(token_data: TokenPayload, user: Optional[User]) -> TokenPayload:
+    # Tokens issued before claims were embedded: take them from the user
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    token_data.role = user.role
+    token_data.is_active = user.is_active
+    token_data.token_version = user.token_version
+    return token_data
+
+def _token_revoked() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Token has been revoked",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+def _require_active(token_data: TokenPayload) -> TokenPayload:
+    if not user_service.is_active(token_data):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Inactive user"
+        )
+    return token_data
+
+def _require_superuser(token_data: TokenPayload) -> TokenPayload:
+    if not user_service.is_superuser(token_data):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    return token_data
+
+def _require_instructor(token_data: TokenPayload) -> TokenPayload:
+    if not user_service.is_instructor_or_admin(token_data):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    return token_data
+
+def get_token_data(
+        db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> TokenPayload:
+    """
+    Validate token and return its claims.
+    """
+    token_data = _decode_token(token)
+    if token_data.token_version is None:
+        return _claims_from_user(token_data, user_service.get(db, id=token_data.sub))
+    if not user_service.is_token_current(db, token_data):
+        raise _token_revoked()
+    return token_data
+
+def get_active_token_data(token_data: TokenPayload = Depends(get_token_data)) -> TokenPayload:
+    """
+    Claims of an active user.
+    """
+    return _require_active(token_data)
+
+def get_superuser_token_data(
+        token_data: TokenPayload = Depends(get_active_token_data),
+) -> TokenPayload:
+    """
+    Claims of an active admin user.
+    """
+    return _require_superuser(token_data)
+
+def get_instructor_token_data(
+        token_data: TokenPayload = Depends(get_active_token_data),
+) -> TokenPayload:
+    """
+    Claims of an active instructor or admin user.
+    """
+    return _require_instructor(token_data)
+
+def get_current_user(
+        db: Session = Depends(get_db), token_data: TokenPayload = Depends(get_token_data)
+) -> User:
+    """
+    Return current user.
+    """
     user = user_service.get(db, id=token_data.sub)
     if not user:
         raise HTTPException(
@@ -40,39 +121,166 @@ def get_current_user(
         )
     return user
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+# The role-gated dependencies below authorize from the token claims, which are
+# resolved before the user is loaded, so rejected requests never reach the DB.
+
+def get_current_active_user(
+        token_data: TokenPayload = Depends(get_active_token_data),
+        current_user: User = Depends(get_current_user),
+) -> User:
     """
     Get current active user.
     """
-    if not user_service.is_active(current_user):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Inactive user"
-        )
     return current_user
 
 def get_current_active_superuser(
-        current_user: User = Depends(get_current_active_user),
+        token_data: TokenPayload = Depends(get_superuser_token_data),
+        current_user: User = Depends(get_current_user),
 ) -> User:
     """
     Get current active admin user.
     """
-    if not user_service.is_superuser(current_user):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
-        )
     return current_user
 
 def get_current_active_instructor(
-        current_user: User = Depends(get_current_active_user),
+        token_data: TokenPayload = Depends(get_instructor_token_data),
+        current_user: User = Depends(get_current_user),
 ) -> User:
     """
     Get current active instructor or admin user.
     """
-    if not user_service.is_instructor_or_admin(current_user):
+    return current_user
+
+# AsyncSession variants for async handlers. Every dependency in this chain
+# is a coroutine, so an ``async def`` route using them never waits for a
+# threadpool token (FastAPI runs plain ``def`` dependencies on the pool).
+
+async def get_token_data_async(
+        db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
+) -> TokenPayload:
+    """
+    Validate token and return its claims.
+    """
+    token_data = _decode_token(token)
+    if token_data.token_version is None:
+        return _claims_from_user(token_data, await db.run_sync(user_service.get, token_data.sub))
+    if not await user_service.is_token_current_async(db, token_data):
+        raise _token_revoked()
+    return token_data
+
+async def get_active_token_data_async(
+        token_data: TokenPayload = Depends(get_token_data_async),
+) -> TokenPayload:
+    """
+    Claims of an active user.
+    """
+    return _require_active(token_data)
+
+async def get_superuser_token_data_async(
+        token_data: TokenPayload = Depends(get_active_token_data_async),
+) -> TokenPayload:
+    """
+    Claims of an active admin user.
+    """
+    return _require_superuser(token_data)
+
+async def get_instructor_token_data_async(
+        token_data: TokenPayload = Depends(get_active_token_data_async),
+) -> TokenPayload:
+    """
+    Claims of an active instructor or admin user.
+    """
+    return _require_instructor(token_data)
+
+async def get_current_user_async(
+        db: AsyncSession = Depends(get_async_db), token_data: TokenPayload = Depends(get_token_data_async)
+) -> User:
+    """
+    Return current user loaded through the async session.
+    """
+    user = await db.run_sync(user_service.get, token_data.sub)
+    if not user:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
         )
-    return current_user
\ No newline at end of file
+    return user
+
+async def get_current_active_user_async(
+        token_data: TokenPayload = Depends(get_active_token_data_async),
+        current_user: User = Depends(get_current_user_async),
+) -> User:
+    """
+    Get current active user.
+    """
+    return current_user
+
+async def get_current_active_superuser_async(
+        token_data: TokenPayload = Depends(get_superuser_token_data_async),
+        current_user: User = Depends(get_current_user_async),
+) -> User:
+    """
+    Get current active admin user.
+    """
+    return current_user
+
+async def get_current_active_instructor_async(
+        token_data: TokenPayload = Depends(get_instructor_token_data_async),
+        current_user: User = Depends(get_current_user_async),
+) -> User:
+    """
+    Get current active instructor or admin user.
+    """
+    return current_user
+
+class Pagination:
+    """
+    Paging parameters shared by list routes.
+
+    Offset paging (skip/limit) is the default. Passing ``paginate=cursor`` or
+    a ``cursor`` from a previous page switches to keyset paging, which returns
+    a CursorPage with next/prev cursors.
+    """
+
+    def __init__(
+            self,
+            skip: int = 0,
+            limit: int = 100,
+            cursor: Optional[str] = None,
+            paginate: Literal["offset", "cursor"] = "offset",
+    ):
+        self.skip = skip
+        self.limit = limit
+        self.cursor = cursor
+        self.use_cursor = paginate == "cursor" or cursor is not None
+
+
+class Shaping:
+    """
+    ``expand`` / ``fields`` parameters of routes returning nested resources;
+    parsed against the route's response tree by its service.
+    """
+
+    def __init__(self, expand: Optional[str] = None, fields: Optional[str] = None):
+        self.expand = expand
+        self.fields = fields
+
+class CourseFilters:
+    """
+    Catalog filters of ``GET /courses/``; ``facets=true`` adds the number of
+    courses per certification type and difficulty to the response.
+    """
+
+    def __init__(
+            self,
+            certification_type: Optional[str] = None,
+            difficulty_level: Optional[str] = None,
+            min_duration: Optional[int] = Query(None, ge=0),
+            max_duration: Optional[int] = Query(None, ge=0),
+            facets: bool = False,
+    ):
+        self.certification_type = certification_type
+        self.difficulty_level = difficulty_level
+        self.min_duration = min_duration
+        self.max_duration = max_duration
+        self.facets = facets
@@ -0,0 +1,59 @@
+# backend/app/api/endpoints/admin.py
+from typing import Any
+from fastapi import APIRouter, Depends, HTTPException, Response
+from app.api.deps import get_current_active_superuser, get_current_active_superuser_async
+from app.core.cache import cache
+from app.core.profiling import create_profile_token, get_profile
+from app.db.pool import pool_status
+from app.db.session import engine
+from app.models.user import User
+from app.schemas.admin import CacheStatsResponse, PoolStatsResponse, ProfileTokenResponse
+
+router = APIRouter()
+
+# Async routes use only async dependencies and never block: this one reads
+# in-memory counters. Cache stats stay sync since the Redis backend does I/O.
+@router.get("/db/pool", response_model=PoolStatsResponse)
+async def read_pool_stats(
+        current_user: User = Depends(get_current_active_superuser_async),
+) -> Any:
+    """
+    Connection pool occupancy and wait statistics for this worker. Admin only.
+    """
+    return pool_status(engine.pool)
+
+@router.get("/cache", response_model=CacheStatsResponse)
+def read_cache_stats(
+        current_user: User = Depends(get_current_active_superuser),
+) -> Any:
+    """
+    Application cache hit, miss and eviction counts for this worker. Admin only.
+    """
+    return cache.stats()
+
+@router.post("/profiling/token", response_model=ProfileTokenResponse)
+async def create_profiling_token(
+        current_user: User = Depends(get_current_active_superuser_async),
+) -> Any:
+    """
+    Short-lived token that profiles the requests carrying it. Admin only.
+    """
+    token, expires_at = create_profile_token(current_user.id)
+    return {"token": token, "expires_at": expires_at}
+
+@router.get("/profiles/{profile_id}", response_class=Response)
+def read_profile(
+        profile_id: str,
+        current_user: User = Depends(get_current_active_superuser),
+) -> Any:
+    """
+    A request profile as folded stacks, ready for flamegraph.pl or
+    speedscope. Admin only.
+    """
+    profile = get_profile(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=404,
+            detail="The profile does not exist or has expired",
+        )
+    return Response(profile, media_type="text/plain")
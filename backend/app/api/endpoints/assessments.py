@@ -1,8 +1,13 @@
 # backend/app/api/endpoints/assessments.py
-from typing import Any, List, Dict
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, List, Dict, Union
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.api.deps import get_current_active_user, get_current_active_instructor, get_db
+from app.api.deps import (
+    Pagination, get_async_db, get_current_active_user, get_current_active_user_async,
+    get_current_active_instructor, get_db,
+)
+from app.core.http_cache import conditional_response
 from app.models.user import User
 from app.models.assessment import Assessment, UserAssessment
 from app.schemas.assessment import (
@@ -11,25 +16,32 @@ from app.schemas.assessment import (
     UserAssessmentCreate, UserAssessmentResponse,
     SubmitAssessmentRequest
 )
+from app.schemas.pagination import CursorPage
 from app.services import assessment_service, course_service
 
 router = APIRouter()
 
-@router.get("/", response_model=List[AssessmentResponse])
+@router.get("/", response_model=Union[List[AssessmentResponse], CursorPage[AssessmentResponse]])
 def read_assessments(
         db: Session = Depends(get_db),
-        skip: int = 0,
-        limit: int = 100,
+        pagination: Pagination = Depends(),
         current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
     Get all assessments.
     """
-    if current_user.role in ["admin", "instructor"]:
-        assessments = assessment_service.get_multi(db, skip=skip, limit=limit)
+    # Students only see published assessments
+    published_only = current_user.role not in ["admin", "instructor"]
+    if pagination.use_cursor:
+        return assessment_service.get_page(
+            db, cursor=pagination.cursor, limit=pagination.limit, published_only=published_only
+        )
+    if published_only:
+        assessments = assessment_service.get_published_assessments(
+            db, skip=pagination.skip, limit=pagination.limit
+        )
     else:
-        # Students only see published assessments
-        assessments = assessment_service.get_published_assessments(db, skip=skip, limit=limit)
+        assessments = assessment_service.get_multi(db, skip=pagination.skip, limit=pagination.limit)
 
     return assessments
 
@@ -44,7 +56,7 @@ def create_assessment(
     Create a new assessment. Instructor/Admin only.
     """
     # Verify course exists
-    course = course_service.get(db, id=assessment_in.course_id)
+    course = course_service.get.uncached(db, id=assessment_in.course_id)
     if not course:
         raise HTTPException(
             status_code=404,
@@ -68,12 +80,23 @@ def read_assessment(
         *,
         db: Session = Depends(get_db),
         assessment_id: int,
+        request: Request,
+        response: Response,
         current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
-    Get specific assessment.
+    Get specific assessment. Supports conditional requests (ETag / Last-Modified).
     """
-    assessment = assessment_service.get(db, assessment_id=assessment_id)
+    # Students only get validators for published assessments; anything else
+    # takes the full path below and its 403/404
+    version = assessment_service.get_version(
+        db, assessment_id, published_only=current_user.role == "student"
+    )
+    not_modified = conditional_response(request, response, version)
+    if not_modified:
+        return not_modified
+
+    assessment = assessment_service.get_with_questions(db, assessment_id=assessment_id)
     if not assessment:
         raise HTTPException(
             status_code=404,
@@ -109,7 +132,7 @@ def update_assessment(
 
     # Verify course exists if updating course_id
     if assessment_in.course_id is not None:
-        course = course_service.get(db, id=assessment_in.course_id)
+        course = course_service.get.uncached(db, id=assessment_in.course_id)
         if not course:
             raise HTTPException(
                 status_code=404,
@@ -151,16 +174,17 @@ def delete_assessment(
     return assessment
 
 @router.post("/{assessment_id}/take", response_model=UserAssessmentResponse)
-def take_assessment(
+async def take_assessment(
         *,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         assessment_id: int,
-        current_user: User = Depends(get_current_active_user),
+        current_user: User = Depends(get_current_active_user_async),
 ) -> Any:
     """
     Start an assessment.
     """
-    assessment = assessment_service.get(db, assessment_id=assessment_id)
+    # Async route: AsyncSession, *_async services and dependencies throughout
+    assessment = await assessment_service.get_async(db, assessment_id=assessment_id)
     if not assessment:
         raise HTTPException(
             status_code=404,
@@ -175,7 +199,7 @@ def take_assessment(
 
     # Check if user is enrolled in the course
     from app.services import enrollment_service
-    enrollment = enrollment_service.get_by_user_and_course(
+    enrollment = await enrollment_service.get_by_user_and_course_async(
         db, user_id=current_user.id, course_id=assessment.course_id
     )
     if not enrollment and current_user.role == "student":
@@ -184,7 +208,7 @@ def take_assessment(
             detail="You must be enrolled in this course to take the assessment",
         )
 
-    user_assessment = assessment_service.start_assessment(
+    user_assessment = await assessment_service.start_assessment_async(
         db, user_id=current_user.id, assessment_id=assessment_id
     )
     return user_assessment
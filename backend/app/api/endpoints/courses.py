@@ -1,31 +1,65 @@
 # backend/app/api/endpoints/courses.py
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, List, Union
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.api.deps import get_current_active_user, get_current_active_instructor, get_db
+from app.api.deps import (
+    CourseFilters, Pagination, Shaping, get_async_db, get_current_active_user, get_current_active_user_async,
+    get_current_active_instructor, get_db,
+)
+from app.core import rendering
+from app.core.fast_json import FastJSONResponse
+from app.core.http_cache import conditional_response, is_not_modified, not_modified_response
 from app.models.user import User
 from app.models.course import Course, Module, Lesson
 from app.schemas.course import (
-    CourseCreate, CourseUpdate, CourseResponse,
+    CourseCreate, CourseUpdate, CourseResponse, FacetedCoursePage,
     ModuleCreate, ModuleResponse,
-    LessonCreate, LessonResponse
+    LessonCreate, LessonResponse, RenderedLessonResponse,
 )
-from app.services import course_service
+from app.schemas.pagination import CursorPage
+from app.services import course_service, outline_service, render_service
 
 router = APIRouter()
 
-@router.get("/", response_model=List[CourseResponse])
+@router.get("/", response_model=Union[List[CourseResponse], CursorPage[CourseResponse], FacetedCoursePage])
 def read_courses(
+        request: Request,
         db: Session = Depends(get_db),
-        skip: int = 0,
-        limit: int = 100,
+        pagination: Pagination = Depends(),
+        shaping: Shaping = Depends(),
+        filters: CourseFilters = Depends(),
         current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
-    Retrieve all courses.
+    Retrieve all courses. Students only see published courses.
+
+    Filter by ``certification_type``, ``difficulty_level`` and
+    ``min_duration`` / ``max_duration`` (hours). ``facets=true`` returns a
+    FacetedCoursePage with the number of courses per certification type and
+    difficulty across the whole catalog.
+
+    ``expand`` (none, modules, modules.lessons) and ``fields`` (e.g.
+    ``title,modules.title``) trim the embedded tree; by default courses come
+    with their modules and lessons.
+
+    Served from the catalog cache of serialized pages (see course_service.get_catalog).
+    Supports conditional requests (ETag).
     """
-    courses = course_service.get_multi(db, skip=skip, limit=limit)
-    return courses
+    shape = course_service.get_shape(course_service.COURSE_TREE, expand=shaping.expand, fields=shaping.fields)
+    version, body = course_service.get_catalog(
+        db,
+        published_only=current_user.role == "student",
+        skip=pagination.skip,
+        limit=pagination.limit,
+        cursor=pagination.cursor,
+        use_cursor=pagination.use_cursor,
+        shape=shape,
+        filters=filters,
+    )
+    if is_not_modified(request, version):
+        return not_modified_response(version)
+    return Response(content=body, media_type="application/json", headers=version.headers())
 
 @router.post("/", response_model=CourseResponse, status_code=status.HTTP_201_CREATED)
 def create_course(
@@ -45,18 +79,32 @@ def read_course(
         *,
         db: Session = Depends(get_db),
         course_id: int,
+        request: Request,
+        shaping: Shaping = Depends(),
         current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
-    Get specific course by ID.
+    Get specific course by ID. Supports conditional requests (ETag / Last-Modified).
+
+    Body and validators come from the course outline (see outline_service),
+    a single primary key lookup. ``expand`` / ``fields`` work as on the list.
     """
-    course = course_service.get(db, id=course_id)
-    if not course:
+    shape = course_service.get_shape(course_service.COURSE_TREE, expand=shaping.expand, fields=shaping.fields)
+    outline = outline_service.get(db, course_id=course_id)
+    if not outline:
         raise HTTPException(
             status_code=404,
             detail="The course with this ID does not exist in the system",
         )
-    return course
+    version = outline_service.version(outline)
+    if shape is not None:
+        version = version.variant(shape.key)
+    if is_not_modified(request, version):
+        return not_modified_response(version)
+    if shape is not None:
+        course = course_service.get_shaped(db, course_id=course_id, shape=shape)
+        return FastJSONResponse(course, headers=version.headers())
+    return Response(content=outline_service.body(outline), media_type="application/json", headers=version.headers())
 
 @router.put("/{course_id}", response_model=CourseResponse)
 def update_course(
@@ -69,7 +117,7 @@ def update_course(
     """
     Update a course. Instructor/Admin only.
     """
-    course = course_service.get(db, id=course_id)
+    course = course_service.get.uncached(db, id=course_id)
     if not course:
         raise HTTPException(
             status_code=404,
@@ -96,7 +144,7 @@ def delete_course(
     """
     Delete a course. Instructor/Admin only.
     """
-    course = course_service.get(db, id=course_id)
+    course = course_service.get.uncached(db, id=course_id)
     if not course:
         raise HTTPException(
             status_code=404,
@@ -118,11 +166,25 @@ def read_course_modules(
         *,
         db: Session = Depends(get_db),
         course_id: int,
+        request: Request,
+        response: Response,
+        shaping: Shaping = Depends(),
         current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
-    Get all modules for a course.
+    Get all modules for a course. Supports conditional requests.
+
+    ``expand=lessons`` embeds each module's lessons; ``fields`` (e.g.
+    ``title,lessons.title``) selects the fields returned.
     """
+    shape = course_service.get_shape(course_service.MODULE_TREE, expand=shaping.expand, fields=shaping.fields)
+    version = course_service.get_course_modules_version(db, course_id=course_id)
+    if shape is not None and version is not None:
+        version = version.variant(shape.key)
+    not_modified = conditional_response(request, response, version)
+    if not_modified:
+        return not_modified
+
     course = course_service.get(db, id=course_id)
     if not course:
         raise HTTPException(
@@ -130,6 +192,9 @@ def read_course_modules(
             detail="The course with this ID does not exist in the system",
         )
 
+    if shape is not None:
+        modules = course_service.get_course_modules_shaped(db, course_id=course_id, shape=shape)
+        return FastJSONResponse(modules, headers=version.headers())
     modules = course_service.get_course_modules(db, course_id=course_id)
     return modules
 
@@ -144,7 +209,7 @@ def create_module(
     """
     Add a module to a course. Instructor/Admin only.
     """
-    course = course_service.get(db, id=course_id)
+    course = course_service.get.uncached(db, id=course_id)
     if not course:
         raise HTTPException(
             status_code=404,
@@ -164,23 +229,31 @@ def create_module(
     return module
 
 @router.get("/modules/{module_id}/lessons", response_model=List[LessonResponse])
-def read_module_lessons(
+async def read_module_lessons(
         *,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         module_id: int,
-        current_user: User = Depends(get_current_active_user),
+        request: Request,
+        response: Response,
+        current_user: User = Depends(get_current_active_user_async),
 ) -> Any:
     """
-    Get all lessons for a module.
+    Get all lessons for a module. Supports conditional requests.
     """
-    module = course_service.get_module(db, id=module_id)
+    # Async route; the sync-only version query runs through run_sync
+    version = await db.run_sync(course_service.get_module_lessons_version, module_id=module_id)
+    not_modified = conditional_response(request, response, version)
+    if not_modified:
+        return not_modified
+
+    module = await course_service.get_module_async(db, id=module_id)
     if not module:
         raise HTTPException(
             status_code=404,
             detail="The module with this ID does not exist in the system",
         )
 
-    lessons = course_service.get_module_lessons(db, module_id=module_id)
+    lessons = await course_service.get_module_lessons_async(db, module_id=module_id)
     return lessons
 
 @router.post("/modules/{module_id}/lessons", response_model=LessonResponse, status_code=status.HTTP_201_CREATED)
@@ -201,7 +274,7 @@ def create_lesson(
             detail="The module with this ID does not exist in the system",
         )
 
-    course = course_service.get(db, id=module.course_id)
+    course = course_service.get.uncached(db, id=module.course_id)
 
     # Ensure the instructor is the creator or an admin
     if course.creator_id != current_user.id and current_user.role != "admin":
@@ -213,4 +286,32 @@ def create_lesson(
     lesson = course_service.create_lesson(
         db, obj_in=lesson_in, module_id=module_id
     )
-    return lesson
\ No newline at end of file
+    return lesson
+
+@router.get("/lessons/{lesson_id}", response_model=RenderedLessonResponse)
+def read_lesson(
+        *,
+        db: Session = Depends(get_db),
+        lesson_id: int,
+        request: Request,
+        response: Response,
+        current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Get a lesson by ID, with its body rendered to sanitized HTML, a table of
+    contents and a reading time. Supports conditional requests.
+    """
+    version = course_service.get_lesson_version(db, lesson_id=lesson_id)
+    not_modified = conditional_response(
+        request, response, version.variant(f"rendered-v{rendering.RENDERER_VERSION}") if version else None
+    )
+    if not_modified:
+        return not_modified
+
+    lesson = course_service.get_lesson(db, id=lesson_id)
+    if not lesson:
+        raise HTTPException(
+            status_code=404,
+            detail="The lesson with this ID does not exist in the system",
+        )
+    return render_service.lesson_response(db, lesson)
@@ -1,35 +1,41 @@
 # backend/app/api/endpoints/enrollments.py
-from typing import Any, List
+from typing import Any, List, Union
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.api.deps import get_current_active_user, get_current_active_instructor, get_db
+from app.api.deps import (
+    Pagination, get_async_db, get_current_active_user, get_current_active_user_async,
+    get_current_active_instructor, get_db,
+)
+from app.core.fast_json import page_response, rows_response
 from app.models.user import User
 from app.models.enrollment import Enrollment
 from app.schemas.enrollment import EnrollmentCreate, EnrollmentUpdate, EnrollmentResponse
+from app.schemas.pagination import CursorPage
 from app.services import enrollment_service, course_service
 
 router = APIRouter()
 
-@router.get("/", response_model=List[EnrollmentResponse])
+@router.get("/", response_model=Union[List[EnrollmentResponse], CursorPage[EnrollmentResponse]])
 def read_enrollments(
         db: Session = Depends(get_db),
-        skip: int = 0,
-        limit: int = 100,
+        pagination: Pagination = Depends(),
         current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
     Get user enrollments.
-    """
-    # Regular users can only see their own enrollments
-    if current_user.role == "student":
-        enrollments = enrollment_service.get_user_enrollments(
-            db, user_id=current_user.id, skip=skip, limit=limit
-        )
-    # Instructors and admins can see all enrollments
-    else:
-        enrollments = enrollment_service.get_multi(db, skip=skip, limit=limit)
 
-    return enrollments
+    Served as plain rows on the fast path (see app/core/fast_json.py).
+    """
+    # Regular users can only see their own enrollments; instructors and admins see all
+    user_id = current_user.id if current_user.role == "student" else None
+    if pagination.use_cursor:
+        return page_response(enrollment_service.get_page_rows(
+            db, user_id=user_id, cursor=pagination.cursor, limit=pagination.limit
+        ))
+    return rows_response(enrollment_service.get_multi_rows(
+        db, user_id=user_id, skip=pagination.skip, limit=pagination.limit
+    ))
 
 @router.post("/", response_model=EnrollmentResponse, status_code=status.HTTP_201_CREATED)
 def create_enrollment(
@@ -42,7 +48,7 @@ def create_enrollment(
     Enroll in a course.
     """
     # Check if course exists
-    course = course_service.get(db, id=enrollment_in.course_id)
+    course = course_service.get.uncached(db, id=enrollment_in.course_id)
     if not course:
         raise HTTPException(
             status_code=404,
@@ -72,16 +78,18 @@ def create_enrollment(
     return enrollment
 
 @router.get("/{enrollment_id}", response_model=EnrollmentResponse)
-def read_enrollment(
+async def read_enrollment(
         *,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         enrollment_id: int,
-        current_user: User = Depends(get_current_active_user),
+        current_user: User = Depends(get_current_active_user_async),
 ) -> Any:
     """
     Get enrollment details.
     """
-    enrollment = enrollment_service.get(db, id=enrollment_id)
+    # Async route: AsyncSession and *_async dependencies only, so the request
+    # never takes a threadpool token (see THREADPOOL_TOKENS)
+    enrollment = await enrollment_service.get_async(db, enrollment_id=enrollment_id)
     if not enrollment:
         raise HTTPException(
             status_code=404,
@@ -1,28 +1,31 @@
 # backend/app/api/endpoints/forums.py
-from typing import Any, List
+from typing import Any, List, Union
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.api.deps import get_current_active_user, get_db
+from app.api.deps import Pagination, get_async_db, get_current_active_user, get_current_active_user_async, get_db
 from app.models.user import User
 from app.schemas.forum import (
     ForumTopicCreate, ForumTopicResponse,
     ForumReplyCreate, ForumReplyResponse
 )
+from app.schemas.pagination import CursorPage
 from app.services import forum_service
 
 router = APIRouter()
 
-@router.get("/topics", response_model=List[ForumTopicResponse])
+@router.get("/topics", response_model=Union[List[ForumTopicResponse], CursorPage[ForumTopicResponse]])
 def read_forum_topics(
         db: Session = Depends(get_db),
-        skip: int = 0,
-        limit: int = 100,
+        pagination: Pagination = Depends(),
         current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
     Get all forum topics.
     """
-    topics = forum_service.get_topics(db, skip=skip, limit=limit)
+    if pagination.use_cursor:
+        return forum_service.get_topics_page(db, cursor=pagination.cursor, limit=pagination.limit)
+    topics = forum_service.get_topics(db, skip=pagination.skip, limit=pagination.limit)
     return topics
 
 @router.post("/topics", response_model=ForumTopicResponse, status_code=status.HTTP_201_CREATED)
@@ -41,16 +44,17 @@ def create_forum_topic(
     return topic
 
 @router.get("/topics/{topic_id}", response_model=ForumTopicResponse)
-def read_forum_topic(
+async def read_forum_topic(
         *,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         topic_id: int,
-        current_user: User = Depends(get_current_active_user),
+        current_user: User = Depends(get_current_active_user_async),
 ) -> Any:
     """
     Get specific forum topic with its replies.
     """
-    topic = forum_service.get_topic(db, topic_id=topic_id)
+    # Async route: the replies are eager loaded, nothing lazy loads on the loop
+    topic = await forum_service.get_topic_async(db, topic_id=topic_id)
     if not topic:
         raise HTTPException(
             status_code=404,
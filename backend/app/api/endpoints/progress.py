@@ -1,8 +1,9 @@
 # backend/app/api/endpoints/progress.py
 from typing import Any, List
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.api.deps import get_current_active_user, get_db
+from app.api.deps import get_async_db, get_current_active_user, get_current_active_user_async, get_db
 from app.models.user import User
 from app.schemas.progress import (
     CourseProgressResponse,
@@ -15,17 +16,18 @@ from app.services import progress_service, course_service, assessment_service
 router = APIRouter()
 
 @router.get("/courses/{course_id}", response_model=CourseProgressResponse)
-def get_course_progress(
+async def get_course_progress(
         *,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         course_id: int,
-        current_user: User = Depends(get_current_active_user),
+        current_user: User = Depends(get_current_active_user_async),
 ) -> Any:
     """
     Get user progress in a course.
     """
-    # Verify course exists
-    course = course_service.get(db, id=course_id)
+    # Async route. Sync-only service helpers run through run_sync, which
+    # stays on the event loop rather than taking a threadpool token
+    course = await db.run_sync(course_service.get, course_id)
     if not course:
         raise HTTPException(
             status_code=404,
@@ -35,7 +37,7 @@ def get_course_progress(
     # Verify user is enrolled in the course or is instructor/admin
     if current_user.role == "student":
         from app.services import enrollment_service
-        enrollment = enrollment_service.get_by_user_and_course(
+        enrollment = await enrollment_service.get_by_user_and_course_async(
             db, user_id=current_user.id, course_id=course_id
         )
         if not enrollment:
@@ -44,7 +46,7 @@ def get_course_progress(
                 detail="You must be enrolled in this course to track progress",
             )
 
-    progress = progress_service.get_course_progress(
+    progress = await progress_service.get_course_progress_async(
         db, user_id=current_user.id, course_id=course_id
     )
     return progress
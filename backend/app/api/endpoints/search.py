@@ -0,0 +1,37 @@
+# backend/app/api/endpoints/search.py
+from typing import Any, List, Literal, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from app.api.deps import get_current_active_user, get_db
+from app.core.fast_json import FastJSONResponse
+from app.models.user import User
+from app.schemas.pagination import CursorPage
+from app.schemas.search import SearchHit
+from app.services import search_service
+
+router = APIRouter()
+
+@router.get("/", response_model=CursorPage[SearchHit])
+def search(
+        q: str = Query(..., min_length=1, max_length=200),
+        kind: Optional[List[Literal["course", "module", "lesson"]]] = Query(None),
+        cursor: Optional[str] = None,
+        limit: int = Query(20, ge=1, le=100),
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Ranked full-text search over course, module and lesson titles and text.
+
+    Students only find published content of published courses. Results are
+    keyset paginated: pass ``next_cursor`` back as ``cursor``.
+    """
+    page = search_service.search(
+        db,
+        query=q,
+        visible_only=current_user.role == "student",
+        kinds=kind,
+        cursor=cursor,
+        limit=limit,
+    )
+    return FastJSONResponse({"items": page.items, "next_cursor": page.next_cursor, "prev_cursor": page.prev_cursor})
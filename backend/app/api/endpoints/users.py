@@ -1,17 +1,22 @@
 # backend/app/api/endpoints/users.py
-from typing import Any, List
+from typing import Any, List, Union
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from app.api.deps import get_current_active_user, get_current_active_superuser, get_db
+from starlette.concurrency import run_in_threadpool
+from app.api.deps import (
+    Pagination, get_current_active_user, get_current_active_user_async, get_current_active_superuser, get_db,
+)
+from app.core.fast_json import page_response, rows_response
 from app.core.security import get_password_hash, verify_password
 from app.models.user import User
+from app.schemas.pagination import CursorPage
 from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserInDB
 from app.services import user_service
 
 router = APIRouter()
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register_user(
+async def register_user(
         *,
         db: Session = Depends(get_db),
         user_in: UserCreate
@@ -19,18 +24,18 @@ def register_user(
     """
     Register a new user.
     """
-    user = user_service.get_by_email(db, email=user_in.email)
+    user = await run_in_threadpool(user_service.get_by_email, db, email=user_in.email)
     if user:
         raise HTTPException(
             status_code=400,
             detail="A user with this email already exists."
         )
-    user = user_service.create(db, obj_in=user_in)
+    user = await user_service.create_async(db, obj_in=user_in)
     return user
 
 # backend/app/api/endpoints/users.py
 @router.post("/login", response_model=dict)
-def login(
+async def login(
         *,
         db: Session = Depends(get_db),
         login_data: dict  # Change this to accept a request body
@@ -47,7 +52,7 @@ def login(
             detail="Username and password are required",
         )
 
-    user = user_service.authenticate(db, email=username, password=password)
+    user = await user_service.authenticate_async(db, email=username, password=password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -59,12 +64,12 @@ def login(
             detail="Inactive user",
         )
     return {
-        "access_token": user_service.create_access_token(user.id),
+        "access_token": user_service.create_access_token(user),
         "token_type": "bearer",
     }
 @router.get("/me", response_model=UserResponse)
-def read_user_me(
-        current_user: User = Depends(get_current_active_user),
+async def read_user_me(
+        current_user: User = Depends(get_current_active_user_async),
 ) -> Any:
     """
     Get current user profile.
@@ -84,18 +89,20 @@ def update_user_me(
     user = user_service.update(db, db_obj=current_user, obj_in=user_in)
     return user
 
-@router.get("/", response_model=List[UserResponse])
+@router.get("/", response_model=Union[List[UserResponse], CursorPage[UserResponse]])
 def read_users(
         db: Session = Depends(get_db),
-        skip: int = 0,
-        limit: int = 100,
+        pagination: Pagination = Depends(),
         current_user: User = Depends(get_current_active_superuser),
 ) -> Any:
     """
     Retrieve all users. Admin only.
+
+    Served as plain rows on the fast path (see app/core/fast_json.py).
     """
-    users = user_service.get_multi(db, skip=skip, limit=limit)
-    return users
+    if pagination.use_cursor:
+        return page_response(user_service.get_page_rows(db, cursor=pagination.cursor, limit=pagination.limit))
+    return rows_response(user_service.get_multi_rows(db, skip=pagination.skip, limit=pagination.limit))
 
 @router.get("/{user_id}", response_model=UserResponse)
 def read_user_by_id(
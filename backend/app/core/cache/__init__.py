@@ -0,0 +1,19 @@
+# backend/app/core/cache/__init__.py
+from app.core.cache.backends import CacheBackend, LRUBackend, RedisBackend
+from app.core.cache.cache import Cache, CacheStats, snapshot
+from app.core.cache.single_flight import SingleFlight
+from app.core.cache.tags import CATALOG_TAG, course_tag, module_tag, user_tag
+from app.core.config import settings
+
+
+def build_backend() -> CacheBackend:
+    if settings.CACHE_BACKEND == "redis":
+        if not settings.CACHE_REDIS_URL:
+            raise RuntimeError("CACHE_BACKEND=redis requires CACHE_REDIS_URL")
+        return RedisBackend.from_url(settings.CACHE_REDIS_URL, prefix=settings.CACHE_KEY_PREFIX)
+    if settings.CACHE_BACKEND == "memory":
+        return LRUBackend(max_entries=settings.CACHE_MAX_ENTRIES)
+    raise RuntimeError(f"Unknown CACHE_BACKEND: {settings.CACHE_BACKEND}")
+
+
+cache = Cache(build_backend(), default_ttl_seconds=settings.CACHE_DEFAULT_TTL_SECONDS)
@@ -0,0 +1,187 @@
+# backend/app/core/cache/backends.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Set, Tuple
+
+
+class CacheBackend:
+    """
+    Storage behind ``Cache``: bytes values with a TTL and a set of tags.
+
+    ``generation`` increases on every invalidation so callers can refuse to
+    store values computed from reads that started before a write.
+    """
+
+    name = "base"
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl_seconds: int, tags: Iterable[str] = ()) -> None:
+        raise NotImplementedError
+
+    def delete(self, *keys: str) -> None:
+        raise NotImplementedError
+
+    def invalidate_tags(self, *tags: str) -> None:
+        raise NotImplementedError
+
+    def generation(self) -> int:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Optional[int]]:
+        """
+        Backend counters: current entries and evictions, None when unknown.
+        """
+        return {"entries": None, "evictions": None, "expirations": None}
+
+
+class LRUBackend(CacheBackend):
+    """
+    Bounded in-process store; the least recently used entry is evicted
+    once ``max_entries`` is reached. Entries are private to the worker.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self.expirations = 0
+        self._generation = 0
+        self._entries: "OrderedDict[str, Tuple[float, bytes, FrozenSet[str]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl_seconds: int, tags: Iterable[str] = ()) -> None:
+        if self.max_entries <= 0:
+            return
+        tags = frozenset(tags)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl_seconds, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._remove(key)
+
+    def invalidate_tags(self, *tags: str) -> None:
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    if key in self._entries:
+                        self._remove(key)
+
+    def generation(self) -> int:
+        return self._generation
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._tags.clear()
+
+    def stats(self) -> Dict[str, Optional[int]]:
+        return {"entries": len(self._entries), "evictions": self.evictions, "expirations": self.expirations}
+
+
+class RedisBackend(CacheBackend):
+    """
+    Store shared by all workers on any Redis-protocol server (Redis 7+ or a
+    compatible one), so an invalidation in one worker reaches the others.
+
+    Tags are sets of the keys carrying them; their TTL is only ever extended,
+    so a set outlives every key it lists.
+    """
+
+    name = "redis"
+
+    def __init__(self, client: Any, prefix: str = ""):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, prefix: str = "") -> "RedisBackend":
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+        return cls(redis.Redis.from_url(url), prefix=prefix)
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl_seconds: int, tags: Iterable[str] = ()) -> None:
+        key = self.prefix + key
+        pipe = self.client.pipeline()
+        pipe.set(key, value, ex=ttl_seconds)
+        for tag in tags:
+            tag_key = self._tag_key(tag)
+            pipe.sadd(tag_key, key)
+            pipe.expire(tag_key, ttl_seconds, nx=True)
+            pipe.expire(tag_key, ttl_seconds, gt=True)
+        pipe.execute()
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+    def invalidate_tags(self, *tags: str) -> None:
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        keys = set()
+        for tag_key in tag_keys:
+            keys.update(self.client.smembers(tag_key))
+        self.client.incr(self.prefix + "generation")
+        self.client.delete(*tag_keys, *keys)
+
+    def generation(self) -> int:
+        return int(self.client.get(self.prefix + "generation") or 0)
+
+    def clear(self) -> None:
+        self.client.incr(self.prefix + "generation")
+        keys = [key for key in self.client.scan_iter(match=self.prefix + "*")
+                if key != (self.prefix + "generation").encode()]
+        if keys:
+            self.client.delete(*keys)
+
+    def stats(self) -> Dict[str, Optional[int]]:
+        # Evictions are server-wide; Redis does not count them per prefix
+        info = self.client.info("stats")
+        return {"entries": None, "evictions": info.get("evicted_keys"), "expirations": info.get("expired_keys")}
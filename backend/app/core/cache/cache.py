@@ -0,0 +1,300 @@
+# backend/app/core/cache/cache.py
+import functools
+import hashlib
+import hmac
+import inspect
+import pickle
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import InstanceState, Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.cache.backends import CacheBackend
+from app.core.cache.single_flight import IN_FLIGHT, SingleFlight
+from app.core.config import settings
+
+Tags = Union[Iterable[str], Callable[[Any], Iterable[str]]]
+
+# HMAC-SHA256 prefix of every stored value
+_SIGNATURE_SIZE = hashlib.sha256().digest_size
+
+
+class CacheStats:
+    """
+    Process-local hit, miss and store counters.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.sets = 0
+            self.stale_sets_skipped = 0
+            self.stale_hits = 0
+            self.rejected = 0
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def record_set(self, stored: bool) -> None:
+        with self._lock:
+            if stored:
+                self.sets += 1
+            else:
+                self.stale_sets_skipped += 1
+
+    def record_stale_hit(self) -> None:
+        with self._lock:
+            self.stale_hits += 1
+
+    def record_rejected(self) -> None:
+        with self._lock:
+            self.rejected += 1
+
+
+class Cache:
+    """
+    Application cache: pickled values with a TTL and tags, on a pluggable
+    backend. Writers call ``invalidate`` with the tags of the rows they
+    changed; every entry carrying one of those tags is dropped.
+
+    Values are pickled and signed with ``secret`` (SECRET_KEY by default);
+    entries whose signature does not match, e.g. written to a shared Redis
+    by anything else, are treated as misses and never unpickled.
+    """
+
+    def __init__(self, backend: CacheBackend, default_ttl_seconds: int, secret: Optional[str] = None):
+        self.backend = backend
+        self.default_ttl_seconds = default_ttl_seconds
+        self._secret = (secret or settings.SECRET_KEY).encode()
+        self.counters = CacheStats()
+        self.flight = SingleFlight()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value, or None on a miss.
+        """
+        value = self._loads(self.backend.get(key))
+        self.counters.record(hit=value is not None)
+        return value
+
+    def _dumps(self, value: Any) -> bytes:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        return hmac.new(self._secret, data, hashlib.sha256).digest() + data
+
+    def _loads(self, raw: Optional[bytes]) -> Optional[Any]:
+        if raw is None:
+            return None
+        signature, data = raw[:_SIGNATURE_SIZE], raw[_SIGNATURE_SIZE:]
+        if not hmac.compare_digest(signature, hmac.new(self._secret, data, hashlib.sha256).digest()):
+            self.counters.record_rejected()
+            return None
+        return pickle.loads(data)
+
+    def set(
+            self, key: str, value: Any, *, tags: Iterable[str] = (), ttl: Optional[int] = None,
+            generation: Optional[int] = None,
+    ) -> None:
+        """
+        Store a value. Pass the ``generation`` read before computing it to
+        skip the store when an invalidation happened in the meantime.
+        """
+        ttl = self.default_ttl_seconds if ttl is None else ttl
+        if ttl <= 0:
+            return
+        if generation is not None and generation != self.backend.generation():
+            self.counters.record_set(stored=False)
+            return
+        self.backend.set(key, self._dumps(value), ttl, tags)
+        self.counters.record_set(stored=True)
+
+    def get_or_compute(
+            self, key: str, compute: Callable[[], Any], *, tags: Tags = (), ttl: Optional[int] = None,
+            stale_ttl: int = 0, version: Any = None,
+    ) -> Any:
+        """
+        Get ``key``, computing and storing it on a miss. Concurrent misses in
+        this process share one call to ``compute``.
+
+        An entry is fresh for ``ttl`` seconds and, when ``version`` is given,
+        only while it was stored for that version. With ``stale_ttl``, a stale
+        entry is served for up to that much longer while a single caller
+        refreshes it (stale-while-revalidate). Keys used here hold envelopes;
+        read them only through this method.
+        """
+        entry = self._load_entry(key)
+        if entry is not None and _is_fresh(entry, version):
+            self.counters.record(hit=True)
+            return entry[2]
+        self.counters.record(hit=False)
+
+        serve_stale = entry is not None and stale_ttl > 0
+        value = self.flight.do(
+            key,
+            lambda: self._refresh(key, compute, tags, ttl, stale_ttl, version),
+            wait=not serve_stale,
+        )
+        if value is IN_FLIGHT:
+            self.counters.record_stale_hit()
+            return entry[2]
+        return value
+
+    def _load_entry(self, key: str) -> Optional[Tuple[float, Any, Any]]:
+        return self._loads(self.backend.get(key))
+
+    def _refresh(
+            self, key: str, compute: Callable[[], Any], tags: Tags, ttl: Optional[int], stale_ttl: int,
+            version: Any,
+    ) -> Any:
+        # The previous leader, or another worker, may have stored it meanwhile
+        entry = self._load_entry(key)
+        if entry is not None and _is_fresh(entry, version):
+            return entry[2]
+        generation = self.generation()
+        value = compute()
+        self._store_entry(key, value, tags, ttl, stale_ttl, version, generation)
+        return value
+
+    def _store_entry(
+            self, key: str, value: Any, tags: Tags, ttl: Optional[int], stale_ttl: int, version: Any,
+            generation: int,
+    ) -> None:
+        if value is None:
+            return
+        ttl = self.default_ttl_seconds if ttl is None else ttl
+        if ttl <= 0:
+            return
+        self.set(
+            key,
+            (time.time() + ttl, version, value),
+            tags=tags(value) if callable(tags) else tags,
+            ttl=ttl + stale_ttl,
+            generation=generation,
+        )
+
+    def delete(self, *keys: str) -> None:
+        self.backend.delete(*keys)
+
+    def invalidate(self, *tags: str) -> None:
+        self.backend.invalidate_tags(*tags)
+
+    def generation(self) -> int:
+        return self.backend.generation()
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.counters.hits + self.counters.misses
+        return {
+            "backend": self.backend.name,
+            "hits": self.counters.hits,
+            "misses": self.counters.misses,
+            "hit_ratio": self.counters.hits / lookups if lookups else None,
+            "sets": self.counters.sets,
+            "stale_sets_skipped": self.counters.stale_sets_skipped,
+            "stale_hits": self.counters.stale_hits,
+            "rejected": self.counters.rejected,
+            "coalesced": self.flight.coalesced,
+            **self.backend.stats(),
+        }
+
+    def cached(
+            self,
+            namespace: str,
+            *,
+            tags: Optional[Callable[..., Iterable[str]]] = None,
+            ttl: Optional[int] = None,
+            stale_ttl: int = 0,
+            relationships: Sequence[str] = (),
+    ) -> Callable:
+        """
+        Cache a service function whose first argument is the Session.
+
+        The key is ``namespace`` plus the remaining arguments. ``tags`` is
+        called with the result and those arguments. ORM results are stored as
+        detached snapshots of their columns (and of the named, already loaded
+        ``relationships``) and merged into the caller's session on a hit, so
+        they behave like freshly loaded rows. None results are not cached.
+        Concurrent misses share one call (see ``get_or_compute``).
+        """
+        def decorator(func: Callable) -> Callable:
+            signature = inspect.signature(func)
+
+            @functools.wraps(func)
+            def wrapper(db: Session, *args: Any, **kwargs: Any) -> Any:
+                bound = signature.bind(db, *args, **kwargs)
+                bound.apply_defaults()
+                arguments = dict(list(bound.arguments.items())[1:])
+                key = f"{namespace}:{sorted(arguments.items())!r}"
+
+                value = self.get_or_compute(
+                    key,
+                    lambda: _detach(func(db, *args, **kwargs), relationships),
+                    tags=(lambda value: tags(value, **arguments)) if tags else (),
+                    ttl=ttl,
+                    stale_ttl=stale_ttl,
+                )
+                return _attach(db, value)
+
+            wrapper.uncached = func
+            return wrapper
+        return decorator
+
+
+def _is_fresh(entry: Tuple[float, Any, Any], version: Any) -> bool:
+    fresh_until, entry_version, _ = entry
+    return time.time() < fresh_until and (version is None or entry_version == version)
+
+
+def _is_mapped(value: Any) -> bool:
+    return isinstance(sa_inspect(value, raiseerr=False), InstanceState)
+
+
+def snapshot(obj: Any, relationships: Sequence[str] = ()) -> Any:
+    """
+    Copy the column attributes of a persistent object into a new detached
+    instance, with the named relationships copied the same way when loaded.
+    """
+    mapper = sa_inspect(obj).mapper
+    values = {attr.key: getattr(obj, attr.key) for attr in mapper.column_attrs}
+    copy = mapper.class_(**values)
+    make_transient_to_detached(copy)
+
+    loaded = sa_inspect(obj).dict
+    for name in relationships:
+        if name in mapper.relationships and name in loaded:
+            related = loaded[name]
+            if isinstance(related, list):
+                related = [snapshot(item, relationships) for item in related]
+            elif related is not None:
+                related = snapshot(related, relationships)
+            set_committed_value(copy, name, related)
+    return copy
+
+
+def _detach(value: Any, relationships: Sequence[str]) -> Any:
+    if isinstance(value, list):
+        return [_detach(item, relationships) for item in value]
+    if _is_mapped(value):
+        return snapshot(value, relationships)
+    return value
+
+
+def _attach(db: Session, value: Any) -> Any:
+    if isinstance(value, list):
+        return [_attach(db, item) for item in value]
+    if _is_mapped(value):
+        return db.merge(value, load=False)
+    return value
@@ -0,0 +1,80 @@
+# backend/app/core/cache/single_flight.py
+import asyncio
+import threading
+from typing import Any, Callable, Dict, Optional
+
+# Returned by ``do(..., wait=False)`` to a caller that found the key in flight
+IN_FLIGHT = object()
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls for the same key into one, across threads:
+    the first caller runs the function and the others get its result (or
+    its exception) instead of running it again.
+
+    Coalescing is per process; with several workers each runs at most one
+    computation per key at a time. Calls made on an event loop's thread
+    (async sessions' ``run_sync``) never wait: blocking there would also
+    block the loop the running call needs to finish, so they compute alone.
+    """
+
+    def __init__(self, wait_timeout_seconds: float = 30.0):
+        self.wait_timeout_seconds = wait_timeout_seconds
+        self.coalesced = 0
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._calls
+
+    def do(self, key: str, fn: Callable[[], Any], wait: bool = True) -> Any:
+        """
+        Run ``fn`` unless a call for ``key`` is already running, in which
+        case wait for it, or return ``IN_FLIGHT`` straight away if not ``wait``.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            elif wait and not _on_event_loop():
+                self.coalesced += 1
+
+        if not leader:
+            if not wait:
+                return IN_FLIGHT
+            if _on_event_loop():
+                return fn()
+            # A leader stuck past the timeout should not stall everyone else
+            if not call.done.wait(self.wait_timeout_seconds):
+                return fn()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
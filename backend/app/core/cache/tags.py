@@ -0,0 +1,17 @@
+# backend/app/core/cache/tags.py
+
+# Carried by every page of the course catalog; invalidated when the set of
+# listed courses changes (create, delete, publishing)
+CATALOG_TAG = "catalog"
+
+
+def course_tag(course_id: int) -> str:
+    return f"course:{course_id}"
+
+
+def module_tag(module_id: int) -> str:
+    return f"module:{module_id}"
+
+
+def user_tag(user_id: int) -> str:
+    return f"user:{user_id}"
@@ -0,0 +1,192 @@
+# backend/app/core/compression.py
+import gzip
+import zlib
+from typing import Any, Optional, Tuple
+
+import anyio.to_thread
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.core.cache import cache
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional; gzip is always available
+    brotli = None
+
+# Media types worth compressing; everything else (images, archives) already is
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    The encoding to use for an Accept-Encoding header: the supported one
+    with the highest q-value, brotli first on ties. None for identity.
+    """
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                continue
+        weights[name.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for encoding in supported_encodings():
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+class _StreamCompressor:
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+            self._compress, self._finish = compressor.process, compressor.finish
+        else:
+            compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._compress, self._finish = compressor.compress, compressor.flush
+
+    def __call__(self, chunk: bytes, last: bool) -> bytes:
+        data = self._compress(chunk)
+        return data + self._finish() if last else data
+
+
+def _compressible(headers: Headers, status: int) -> bool:
+    if status < 200 or status in (204, 304) or "content-encoding" in headers:
+        return False
+    if "no-transform" in headers.get("cache-control", ""):
+        return False
+    content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    return any(content_type.startswith(allowed) for allowed in COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    """
+    gzip / brotli response compression.
+
+    Bodies under COMPRESSION_MINIMUM_SIZE and media types outside
+    COMPRESSIBLE_TYPES are sent as they are. Compressible responses carry
+    ``Vary: Accept-Encoding`` whether or not this client asked for
+    compression, so shared caches keep the variants apart.
+
+    The compressed body of a GET response with a strong ETag is kept in the
+    application cache under that ETag, so repeat hits on the same version
+    (the catalog, course outlines) skip compression. Since the bytes differ
+    from the identity representation, the ETag is sent weak (W/), which
+    If-None-Match still matches (see app/core/http_cache.py).
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        responder = _Responder(send, encoding, scope)
+        await self.app(scope, receive, responder.send)
+
+
+class _Responder:
+    def __init__(self, send: Any, encoding: Optional[str], scope: dict):
+        self._send = send
+        self._encoding = encoding
+        self._scope = scope
+        self._start: Optional[dict] = None
+        self._stream: Optional[_StreamCompressor] = None
+        self._passthrough = False
+
+    async def send(self, message: dict) -> None:
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk shows the size
+            self._start = message
+            return
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+        if self._stream is not None:
+            more = message.get("more_body", False)
+            await self._send({**message, "body": self._stream(message.get("body", b""), last=not more)})
+            return
+
+        start, self._start = self._start, None
+        body = message.get("body", b"")
+        more = message.get("more_body", False)
+        headers = MutableHeaders(raw=list(start["headers"]))
+        if not _compressible(headers, start["status"]) or (not more and len(body) < settings.COMPRESSION_MINIMUM_SIZE):
+            self._passthrough = True
+            await self._send(start)
+            await self._send(message)
+            return
+
+        headers.add_vary_header("Accept-Encoding")
+        if self._encoding is None:
+            self._passthrough = True
+            await self._send({**start, "headers": headers.raw})
+            await self._send(message)
+            return
+
+        etag = headers.get("etag")
+        headers["Content-Encoding"] = self._encoding
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = "W/" + etag
+
+        if more:
+            # Streaming: compress chunk by chunk, length unknown up front
+            del headers["Content-Length"]
+            self._stream = _StreamCompressor(self._encoding)
+            await self._send({**start, "headers": headers.raw})
+            await self._send({**message, "body": self._stream(body, last=False)})
+            return
+
+        key = self._cache_key(etag, start["status"])
+        if len(body) >= settings.COMPRESSION_THREAD_MIN_SIZE or (key and settings.CACHE_BACKEND == "redis"):
+            # Compression of a large body, or a network round trip, would stall every request on the loop
+            compressed = await anyio.to_thread.run_sync(self._compressed, body, key)
+        else:
+            compressed = self._compressed(body, key)
+        headers["Content-Length"] = str(len(compressed))
+        self._passthrough = True
+        await self._send({**start, "headers": headers.raw})
+        await self._send({**message, "body": compressed})
+
+    def _cache_key(self, etag: Optional[str], status: int) -> Optional[str]:
+        cacheable = (
+            settings.COMPRESSION_CACHE_TTL_SECONDS > 0 and self._scope["method"] == "GET"
+            and status == 200 and etag and not etag.startswith("W/")
+        )
+        # A strong ETag names these exact bytes; the path keeps routes apart regardless
+        return f"compressed:{self._encoding}:{self._scope['path']}:{etag}" if cacheable else None
+
+    def _compressed(self, body: bytes, key: Optional[str]) -> bytes:
+        if key is None:
+            return compress(body, self._encoding)
+        compressed = cache.get(key)
+        if compressed is None:
+            compressed = compress(body, self._encoding)
+            cache.set(key, compressed, ttl=settings.COMPRESSION_CACHE_TTL_SECONDS)
+        return compressed
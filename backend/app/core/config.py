@@ -8,6 +8,66 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     SECRET_KEY: str = "your-secret-key-for-jwt-here"  # Change this in production!
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
+    # How often each worker re-reads changed token versions from the users table
+    TOKEN_VERSION_REFRESH_SECONDS: int = 5
+
+    # Application cache (see app/core/cache). "memory" is a per-worker LRU;
+    # "redis" is shared, so invalidations reach every worker
+    CACHE_BACKEND: str = "memory"
+    CACHE_REDIS_URL: Optional[str] = None
+    CACHE_KEY_PREFIX: str = "cybered:"
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_DEFAULT_TTL_SECONDS: int = 300
+    # Serve expired entries this much longer while one request refreshes them; 0 disables
+    CACHE_STALE_SECONDS: int = 0
+    # Serialized course catalog pages (course_service.get_catalog); 0 disables
+    CATALOG_CACHE_TTL_SECONDS: int = 60
+
+    # Response compression (see app/core/compression.py); brotli is used when
+    # the optional brotli package is installed, gzip otherwise
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # bytes
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5
+    # Compressed bodies of GET responses with a strong ETag, reused while the ETag holds; 0 disables
+    COMPRESSION_CACHE_TTL_SECONDS: int = 3600
+    # Bodies at least this large are compressed on the threadpool, off the event
+    # loop; so is every compressed-body cache lookup with the redis backend
+    COMPRESSION_THREAD_MIN_SIZE: int = 64 * 1024  # bytes
+
+    # Lesson and module bodies (see app/db/content_store.py): bodies at least
+    # this long are stored zlib-compressed; decompressed bodies are kept in a
+    # per-worker LRU of this many characters
+    CONTENT_COMPRESSION_MIN_SIZE: int = 256
+    CONTENT_COMPRESSION_LEVEL: int = 6
+    CONTENT_CACHE_MAX_CHARS: int = 64 * 1024 * 1024
+
+    # Lesson rendering on write (see app/core/rendering.py): bodies of at least
+    # RENDER_POOL_MIN_SIZE characters render on a pool of RENDER_WORKERS
+    # processes; 0 workers renders everything in the request thread
+    RENDER_WORKERS: int = 2
+    RENDER_POOL_MIN_SIZE: int = 64 * 1024
+    RENDER_WORDS_PER_MINUTE: int = 200  # for reading time estimates
+
+    # Threadpool tokens for sync routes and dependencies (anyio's default is
+    # 40). Each blocked sync request holds one, so this caps concurrent sync
+    # requests per worker; size DB_POOL_SIZE + DB_MAX_OVERFLOW to match
+    THREADPOOL_TOKENS: int = 40
+
+    # Prometheus metrics at /metrics (see app/core/metrics.py); needs prometheus_client.
+    # With several workers, point PROMETHEUS_MULTIPROC_DIR at a directory shared by
+    # them and emptied before they start
+    METRICS_ENABLED: bool = True
+    PROMETHEUS_MULTIPROC_DIR: Optional[str] = None
+
+    # On-demand request profiling for admins (see app/core/profiling.py)
+    PROFILING_ENABLED: bool = True
+    PROFILING_TOKEN_TTL_SECONDS: int = 900
+    PROFILING_INTERVAL_MS: float = 1.0  # sampling interval
+    PROFILING_RESULT_TTL_SECONDS: int = 3600  # how long profiles stay fetchable
+
+    # Password hashing pool; 0 workers runs bcrypt on the threadpool instead
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
 
     # CORS Settings
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = ["http://localhost:3000", "http://localhost:8080"]
@@ -45,6 +105,36 @@ class Settings(BaseSettings):
         connection_str = f"postgresql://{postgres_user}:{postgres_password}@{postgres_server}:{postgres_port}/{postgres_db}"
         return connection_str
 
+    # Async engine URL; derived from DATABASE_URL (asyncpg / aiosqlite) when unset
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # Optional read replica for side-effect-free requests (see app/db/replica.py)
+    DATABASE_REPLICA_URL: Optional[str] = None
+    REPLICA_HEALTH_CHECK_SECONDS: int = 10
+    REPLICA_MAX_LAG_SECONDS: int = 5
+    # Reads stay on the primary for this long after a client's last write
+    REPLICA_READ_YOUR_WRITES_SECONDS: int = 5
+
+    # Connection pool (see app/db/session.py)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 30000  # server-side statement_timeout, 0 disables
+
+    # What the API does with the schema at boot: "verify" checks the Alembic
+    # revision, "create" runs the legacy create_all (local dev only), "skip" does nothing
+    DB_STARTUP_MODE: str = "verify"
+
+    # Per-request SQL accounting (see app/db/query_stats.py)
+    DEBUG: bool = False  # adds X-DB-Statements / X-DB-Time-Ms / X-DB-Max-Repeats headers
+    SQL_LOG_STATEMENTS_THRESHOLD: int = 30
+    SQL_LOG_TIME_THRESHOLD_MS: int = 500
+    SQL_LOG_REPEAT_THRESHOLD: int = 5
+    # Raise when one statement shape repeats more often than this in a request; 0 disables
+    SQL_STRICT_REPEAT_LIMIT: int = 0
+
     model_config = {
         "env_file": ".env",
         "case_sensitive": True
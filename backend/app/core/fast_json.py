@@ -0,0 +1,56 @@
+# backend/app/core/fast_json.py
+from typing import Any, Sequence
+
+from fastapi import Response
+from pydantic_core import to_json
+
+from app.db.pagination import KeysetPage
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional, pydantic_core is the fallback
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode plain Python data (dicts, lists, scalars, datetimes) as JSON.
+    UTC datetimes end in "Z", as in pydantic's output.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+    return to_json(content)
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response for content that is already in its final shape.
+
+    Opt-in fast path for large lists: the endpoint selects the columns of
+    its response schema as plain rows (see app/db/projection.py) and returns
+    them through this class, which skips ORM instances, response_model
+    validation and the generic encoder. Keep ``response_model`` on the route
+    for the OpenAPI schema; FastAPI does not apply it to returned Responses.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def rows_response(rows: Sequence[Any]) -> FastJSONResponse:
+    """
+    A list of rows from a ``project``-ed select, as a JSON array of objects.
+    """
+    return FastJSONResponse([row._asdict() for row in rows])
+
+
+def page_response(page: KeysetPage) -> FastJSONResponse:
+    """
+    A keyset page of such rows, shaped like CursorPage.
+    """
+    return FastJSONResponse({
+        "items": [row._asdict() for row in page.items],
+        "next_cursor": page.next_cursor,
+        "prev_cursor": page.prev_cursor,
+    })
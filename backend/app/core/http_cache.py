@@ -0,0 +1,97 @@
+# backend/app/core/http_cache.py
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional, Sequence
+
+from fastapi import Request, Response
+
+# Responses are per user and must be revalidated, but may be kept and
+# answered with 304 when unchanged
+CACHE_CONTROL = "private, no-cache"
+
+
+def _http_datetime(value: datetime) -> datetime:
+    # Naive values come from SQLite, which stores UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+
+class ResourceVersion:
+    """
+    Validators for one representation, built from a cheap version query.
+
+    ``fingerprint`` holds whatever identifies the state of the rows behind
+    the response (ids, row counts, change timestamps); the strong ETag is
+    its hash and Last-Modified is the newest timestamp in it.
+    """
+
+    def __init__(self, kind: str, fingerprint: Sequence[Any]):
+        self.kind = kind
+        self.fingerprint = tuple(fingerprint)
+        digest = hashlib.sha1(repr((kind, tuple(fingerprint))).encode()).hexdigest()
+        self.etag = f'"{digest}"'
+        timestamps = [value for value in fingerprint if isinstance(value, datetime)]
+        self.last_modified = _http_datetime(max(timestamps)) if timestamps else None
+
+    def variant(self, name: str) -> "ResourceVersion":
+        """
+        Validators for another representation of the same state, such as a
+        sparse fieldset; the ETag differs, Last-Modified does not.
+        """
+        return ResourceVersion(f"{self.kind};{name}", self.fingerprint)
+
+    def headers(self) -> Dict[str, str]:
+        headers = {"ETag": self.etag, "Cache-Control": CACHE_CONTROL}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def is_not_modified(request: Request, version: ResourceVersion) -> bool:
+    """
+    Evaluate If-None-Match, or If-Modified-Since when no ETag was sent.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, version.etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since or version.last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    return version.last_modified <= _http_datetime(since)
+
+
+def not_modified_response(version: ResourceVersion) -> Response:
+    return Response(status_code=304, headers=version.headers())
+
+
+def conditional_response(
+        request: Request, response: Response, version: Optional[ResourceVersion]
+) -> Optional[Response]:
+    """
+    Attach the validators to ``response`` and return a 304 if the client's
+    copy is current. The endpoint returns that instead of loading the resource.
+
+    A missing version (the resource was not found) is left to the full path.
+    """
+    if version is None:
+        return None
+    if is_not_modified(request, version):
+        return not_modified_response(version)
+    response.headers.update(version.headers())
+    return None
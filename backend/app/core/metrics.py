@@ -0,0 +1,233 @@
+# backend/app/core/metrics.py
+import os
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
+
+from fastapi import Request
+
+from app.core.cache import cache
+from app.core.config import settings
+from app.db import async_session, session
+from app.db.query_stats import current_stats
+
+# prometheus_client picks its value store on import, so the multiprocess
+# directory has to be in the environment first
+if settings.PROMETHEUS_MULTIPROC_DIR:
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", settings.PROMETHEUS_MULTIPROC_DIR)
+
+try:
+    import prometheus_client
+    from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+except ImportError:  # pragma: no cover - optional; /metrics is not mounted without it
+    prometheus_client = None
+
+# Request latency buckets (seconds); SQL time per request uses the same
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Requests that matched no route share one label, so scanners cannot blow up cardinality
+UNMATCHED_ROUTE = "<unmatched>"
+
+METRICS_PATH = "/metrics"
+
+
+def enabled() -> bool:
+    return settings.METRICS_ENABLED and prometheus_client is not None
+
+
+def multiprocess_mode() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+if prometheus_client is not None:
+    REQUESTS = Counter(
+        "http_requests_total", "HTTP requests by route and status code",
+        ["method", "route", "status"],
+    )
+    LATENCY = Histogram(
+        "http_request_duration_seconds", "Time from request start to the last body byte",
+        ["method", "route"], buckets=LATENCY_BUCKETS,
+    )
+    IN_PROGRESS = Gauge(
+        "http_requests_in_progress", "Requests being handled",
+        ["method", "route"], multiprocess_mode="livesum",
+    )
+    SQL_STATEMENTS = Counter(
+        "db_statements_total", "SQL statements executed while handling requests",
+        ["method", "route"],
+    )
+    SQL_TIME = Histogram(
+        "db_request_time_seconds", "Total SQL time of each request",
+        ["method", "route"], buckets=LATENCY_BUCKETS,
+    )
+    POOL_CONNECTIONS = Gauge(
+        "db_pool_connections", "Pooled connections by state",
+        ["pool", "state"], multiprocess_mode="livesum",
+    )
+    POOL_CAPACITY = Gauge(
+        "db_pool_capacity", "pool_size + max_overflow",
+        ["pool"], multiprocess_mode="livesum",
+    )
+    POOL_CHECKOUTS = Counter("db_pool_checkouts_total", "Connection checkouts", ["pool"])
+    POOL_TIMEOUTS = Counter("db_pool_timeouts_total", "Checkouts that timed out waiting", ["pool"])
+    POOL_CONNECT_ERRORS = Counter("db_pool_connect_errors_total", "Failed connection attempts", ["pool"])
+    POOL_WAIT = Counter("db_pool_wait_seconds_total", "Time spent waiting for a connection", ["pool"])
+    # Hit ratio: sum(rate(app_cache_lookups_total{result!="miss"}[5m])) / sum(rate(app_cache_lookups_total[5m]))
+    CACHE_LOOKUPS = Counter(
+        "app_cache_lookups_total", "Application cache lookups by result (hit, miss, stale)",
+        ["result"],
+    )
+
+
+class _Deltas:
+    """
+    Turns process-local running totals (PoolStats, CacheStats) into counter
+    increments, so they survive multiprocess mode and worker restarts.
+    """
+
+    def __init__(self):
+        self._seen: Dict[Tuple[Any, ...], float] = {}
+
+    def inc(self, counter: Any, labels: Tuple[str, ...], total: float) -> None:
+        key = (counter, labels)
+        delta = total - self._seen.get(key, 0)
+        if delta < 0:
+            # The source was reset; everything since then is new
+            delta = total
+        if delta:
+            counter.labels(*labels).inc(delta)
+        self._seen[key] = total
+
+
+_deltas = _Deltas()
+
+
+def _pools() -> Iterator[Tuple[str, Any]]:
+    yield "primary", session.engine.pool
+    if session.replica_engine is not None:
+        yield "replica", session.replica_engine.pool
+    async_engine = async_session.started_async_engine()
+    if async_engine is not None:
+        yield "async", async_engine.pool
+
+
+def sync_runtime_metrics() -> None:
+    """
+    Copy pool occupancy and the pool and cache counters into the metrics.
+
+    Runs after every request rather than at scrape time: in multiprocess
+    mode the scrape is served by one worker, which cannot see the others'
+    pools, so each worker keeps its own values current.
+    """
+    for name, pool in _pools():
+        if hasattr(pool, "checkedout"):
+            POOL_CONNECTIONS.labels(name, "checked_out").set(pool.checkedout())
+            POOL_CONNECTIONS.labels(name, "checked_in").set(pool.checkedin())
+            POOL_CONNECTIONS.labels(name, "overflow").set(max(pool.overflow(), 0))
+            POOL_CAPACITY.labels(name).set(pool.size() + max(pool._max_overflow, 0))
+        stats = getattr(pool, "stats", None)
+        if stats is not None:
+            _deltas.inc(POOL_CHECKOUTS, (name,), stats.checkouts)
+            _deltas.inc(POOL_TIMEOUTS, (name,), stats.timeouts)
+            _deltas.inc(POOL_CONNECT_ERRORS, (name,), stats.connect_errors)
+            _deltas.inc(POOL_WAIT, (name,), stats.wait_sum_ms / 1000)
+
+    counters = cache.counters
+    _deltas.inc(CACHE_LOOKUPS, ("hit",), counters.hits)
+    _deltas.inc(CACHE_LOOKUPS, ("miss",), counters.misses)
+    _deltas.inc(CACHE_LOOKUPS, ("stale",), counters.stale_hits)
+
+
+def render() -> Tuple[bytes, str]:
+    """
+    The current metrics in Prometheus text format, and their content type.
+    """
+    sync_runtime_metrics()
+    if multiprocess_mode():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead() -> None:
+    """
+    Drop this worker's live gauges (in-flight, pool) from the shared files.
+    """
+    if multiprocess_mode():
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def route_template(scope: Dict[str, Any]) -> Optional[str]:
+    """
+    Path template of the route that handled ``scope``, e.g.
+    ``/api/v1/courses/{course_id}``; None when no route matched.
+    """
+    route = scope.get("route")
+    if route is None:
+        return None
+    path = getattr(route, "path_format", None) or route.path
+    # Included routes may report their path relative to the router; restore
+    # the include prefix from the request path, segment for segment
+    extra = scope["path"].rstrip("/").count("/") - path.rstrip("/").count("/")
+    if extra > 0:
+        path = "/".join(scope["path"].split("/")[:extra + 1]) + path
+    return path
+
+
+async def track_in_progress(request: Request) -> AsyncIterator[None]:
+    """
+    App-wide dependency counting in-flight requests per route; the
+    middleware runs before routing, so it cannot label them.
+    """
+    if not enabled() or request.scope["path"] == METRICS_PATH:
+        yield
+        return
+    gauge = IN_PROGRESS.labels(request.method, route_template(request.scope) or UNMATCHED_ROUTE)
+    gauge.inc()
+    try:
+        yield
+    finally:
+        gauge.dec()
+
+
+class MetricsMiddleware:
+    """
+    Per-route request count, latency and status metrics, plus the SQL
+    statement count and time of each request. Routes are labelled by path
+    template, not by raw path.
+
+    Must sit inside QueryStatsMiddleware (added before it) so the request's
+    QueryStats are still current when the request finishes.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] == METRICS_PATH:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            method = scope["method"]
+            route = route_template(scope) or UNMATCHED_ROUTE
+            REQUESTS.labels(method, route, str(status)).inc()
+            LATENCY.labels(method, route).observe(elapsed)
+            stats = current_stats()
+            if stats is not None:
+                SQL_STATEMENTS.labels(method, route).inc(stats.statements)
+                SQL_TIME.labels(method, route).observe(stats.total_time)
+            sync_runtime_metrics()
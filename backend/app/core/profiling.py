@@ -0,0 +1,258 @@
+# backend/app/core/profiling.py
+import asyncio
+import hashlib
+import hmac
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from types import CodeType, FrameType
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from starlette.responses import JSONResponse
+
+import app as app_package
+from app.core.cache import cache
+from app.core.config import settings
+from app.db.query_stats import current_stats
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_QUERY = "_profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+_APP_DIR = os.path.dirname(app_package.__file__)
+_STDLIB_DIR = os.path.dirname(os.__file__) + os.sep
+_SITE_MARKER = os.sep + "site-packages" + os.sep
+
+
+def create_profile_token(user_id: int) -> Tuple[str, int]:
+    """
+    A token that turns on profiling for requests carrying it, and its expiry
+    (epoch seconds). Only admins get one (see app/api/endpoints/admin.py).
+    """
+    expires = int(time.time()) + settings.PROFILING_TOKEN_TTL_SECONDS
+    payload = f"{user_id}.{expires}"
+    return f"{payload}.{_sign(payload)}", expires
+
+
+def verify_profile_token(token: str) -> Optional[int]:
+    """
+    The admin's user id for a valid, unexpired token; None otherwise.
+    """
+    payload, _, signature = token.rpartition(".")
+    user_id, _, expires = payload.partition(".")
+    if not (user_id.isdigit() and expires.isdigit()):
+        return None
+    if not hmac.compare_digest(signature, _sign(payload)) or int(expires) < time.time():
+        return None
+    return int(user_id)
+
+
+def _sign(payload: str) -> str:
+    return hmac.new(settings.SECRET_KEY.encode(), f"profile:{payload}".encode(), hashlib.sha256).hexdigest()
+
+
+def get_profile(profile_id: str) -> Optional[str]:
+    return cache.get(f"profile:{profile_id}")
+
+
+_labels: Dict[CodeType, str] = {}
+
+
+def _label(code: CodeType) -> str:
+    label = _labels.get(code)
+    if label is None:
+        filename = code.co_filename
+        if filename.startswith(_APP_DIR):
+            filename = "app" + filename[len(_APP_DIR):]
+        elif _SITE_MARKER in filename:
+            filename = filename.split(_SITE_MARKER, 1)[1]
+        elif filename.startswith(_STDLIB_DIR):
+            filename = filename[len(_STDLIB_DIR):]
+        label = _labels[code] = f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+    return label
+
+
+def _outermost_first(frame: Optional[FrameType]) -> List[FrameType]:
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    frames.reverse()
+    return frames
+
+
+def _after_last(frames: List[FrameType], name: str, path_part: str) -> List[FrameType]:
+    # Drops the event loop / worker thread machinery below the request's own frames
+    for index in range(len(frames) - 1, -1, -1):
+        code = frames[index].f_code
+        if code.co_name == name and path_part in code.co_filename:
+            return frames[index + 1:]
+    return frames
+
+
+def _await_chain(task: "asyncio.Task") -> Tuple[List[FrameType], Optional[int]]:
+    """
+    Frames of a suspended task, outermost first, and the id of the worker
+    thread it is waiting on, if any.
+    """
+    frames: List[FrameType] = []
+    awaitable = task.get_coro()
+    while awaitable is not None:
+        frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None)
+        if frame is not None:
+            frames.append(frame)
+            if frame.f_code.co_name == "run_sync_in_worker_thread":
+                # anyio's threadpool hop; the thread running our sync code is its local
+                worker = frame.f_locals.get("worker")
+                if isinstance(worker, threading.Thread):
+                    return frames, worker.ident
+        awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None)
+    return frames, None
+
+
+class RequestProfile:
+    """
+    Wall-clock sampling profile of one request, as folded stacks.
+
+    A sampler thread records, every PROFILING_INTERVAL_MS, where the
+    request's task is: running on the event loop, suspended at an await, or
+    waiting on the threadpool worker running its sync code (whose stack is
+    appended). Other requests in the worker are not sampled. Statements are
+    timed exactly through the request's QueryStats and added under a
+    separate ``SQL`` root, by calling app code and statement; they overlap
+    the sampled time. Weights are microseconds.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.samples: Counter = Counter()
+        self.sql: Counter = Counter()
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        self._loop_thread = threading.get_ident()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def __enter__(self) -> "RequestProfile":
+        stats = current_stats()
+        if stats is not None:
+            stats.listener = self._record_sql
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._stop.set()
+        self._sampler.join()
+        stats = current_stats()
+        if stats is not None:
+            stats.listener = None
+
+    def _run(self) -> None:
+        interval = settings.PROFILING_INTERVAL_MS / 1000
+        last = time.perf_counter()
+        while not self._stop.wait(interval):
+            now = time.perf_counter()
+            stack = self._sample()
+            if stack:
+                self.samples[stack] += int((now - last) * 1_000_000)
+            last = now
+
+    def _sample(self) -> Tuple[str, ...]:
+        if self._task.done():
+            return ()
+        current_frames = sys._current_frames()
+        if asyncio.current_task(self._loop) is self._task:
+            frames = _outermost_first(current_frames.get(self._loop_thread))
+            frames = _after_last(frames, "_run", os.path.join("asyncio", "events.py"))
+            leaf: Tuple[str, ...] = ()
+        else:
+            frames, worker = _await_chain(self._task)
+            if worker is not None:
+                thread_frames = _outermost_first(current_frames.get(worker))
+                frames += _after_last(thread_frames, "run", "anyio")
+                leaf = ()
+            else:
+                leaf = ("(await)",)
+        return (self.root, *(_label(frame.f_code) for frame in frames), *leaf)
+
+    def _record_sql(self, statement: str, seconds: float) -> None:
+        # Runs in the thread that executed the statement, inside the caller's
+        # stack; frame 2 skips the QueryStats hook
+        callers = [
+            _label(frame.f_code) for frame in _outermost_first(sys._getframe(2))
+            if frame.f_code.co_filename.startswith(_APP_DIR)
+        ]
+        statement = " ".join(statement.split())[:120]
+        self.sql[("SQL", self.root, *callers, statement)] += int(seconds * 1_000_000)
+
+    def folded(self) -> str:
+        """
+        ``frame;frame;frame weight`` lines, as read by flamegraph.pl,
+        speedscope and inferno.
+        """
+        lines = [
+            ";".join(part.replace(";", ",") for part in stack) + f" {weight}"
+            for stack, weight in (*self.samples.items(), *self.sql.items()) if weight
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def _profile_token(scope: Dict[str, Any]) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == b"x-profile":
+            return value.decode("latin-1")
+    query = scope.get("query_string", b"")
+    if PROFILE_QUERY.encode() in query:
+        values = parse_qs(query.decode("latin-1")).get(PROFILE_QUERY)
+        return values[0] if values else None
+    return None
+
+
+class ProfilingMiddleware:
+    """
+    Profile single requests on demand.
+
+    A request carrying a token from ``POST /admin/profiling/token`` in the
+    X-Profile header (or the ``_profile`` query parameter) is profiled; the
+    folded-stack profile is kept in the application cache for
+    PROFILING_RESULT_TTL_SECONDS and its id sent back in X-Profile-Id. Fetch
+    it with ``GET /admin/profiles/{id}``. Requests without a token only pay
+    for the header scan. Sits inside QueryStatsMiddleware (added before it)
+    to time the request's SQL.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _profile_token(scope)
+        if token is None:
+            await self.app(scope, receive, send)
+            return
+        if verify_profile_token(token) is None:
+            response = JSONResponse({"detail": "Invalid or expired profiling token"}, status_code=403)
+            await response(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                headers = [*message.get("headers", []), (PROFILE_ID_HEADER.lower().encode(), profile_id.encode())]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        profile = RequestProfile(f"{scope['method']} {scope['path']}")
+        try:
+            with profile:
+                await self.app(scope, receive, send_with_id)
+        finally:
+            cache.set(f"profile:{profile_id}", profile.folded(), ttl=settings.PROFILING_RESULT_TTL_SECONDS)
+
@@ -0,0 +1,374 @@
+# backend/app/core/rendering.py
+import asyncio
+import html
+import math
+import re
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+# Lesson rendering: markdown (with inline HTML) to sanitized HTML, a table of
+# contents and a reading time. Runs when lessons are written, not when they
+# are read (see app/services/render_service.py). Every render is keyed by the
+# content hash and RENDERER_VERSION; bump the version whenever the output of
+# render() changes, so stored renders are redone on their next read.
+
+RENDERER_VERSION = 3
+
+# Headings listed in the table of contents
+TOC_LEVELS = (1, 2, 3)
+
+ALLOWED_TAGS = {
+    "a", "abbr", "b", "blockquote", "br", "code", "dd", "del", "div", "dl", "dt", "em",
+    "h1", "h2", "h3", "h4", "h5", "h6", "hr", "i", "img", "kbd", "li", "mark", "ol", "p",
+    "pre", "s", "span", "strong", "sub", "sup", "table", "tbody", "td", "tfoot", "th",
+    "thead", "tr", "u", "ul",
+}
+ALLOWED_ATTRIBUTES = {
+    "a": {"href", "title"},
+    "abbr": {"title"},
+    "code": {"class"},
+    "img": {"src", "alt", "title", "width", "height"},
+    "ol": {"start"},
+    "td": {"colspan", "rowspan", "align"},
+    "th": {"colspan", "rowspan", "align"},
+}
+VOID_TAGS = {"br", "hr", "img"}
+# Dropped along with everything inside them
+DROPPED_TAGS = {"script", "style", "iframe", "object", "embed", "template", "noscript", "textarea", "svg", "math"}
+URL_SCHEMES = {"http", "https", "mailto"}
+URL_ATTRIBUTES = {"href", "src"}
+
+_CONTROL_CHARS = re.compile(r"[\x00-\x20\x7f]+")
+_SCHEME = re.compile(r"^([a-zA-Z][a-zA-Z0-9+.-]*):")
+_CODE_CLASS = re.compile(r"^language-[\w+#-]+$")
+_WORD = re.compile(r"\w+")
+
+
+def _safe_url(url: str) -> bool:
+    # Browsers ignore control characters and spaces inside schemes ("java\tscript:")
+    scheme = _SCHEME.match(_CONTROL_CHARS.sub("", url))
+    return scheme is None or scheme.group(1).lower() in URL_SCHEMES
+
+
+def _slug(text: str) -> str:
+    return "-".join(_WORD.findall(text.lower())) or "section"
+
+
+class _Sanitizer(HTMLParser):
+    """
+    Rebuilds HTML from allowed tags and attributes only, with text escaped
+    and tags balanced; collects headings and counts words on the way.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.out: List[str] = []
+        self.open: List[str] = []
+        self.dropping: List[str] = []
+        self.toc: List[Dict[str, Any]] = []
+        self.words = 0
+        self._slugs: Dict[str, int] = {}
+        self._heading: Optional[Tuple[str, int, List[str]]] = None  # tag, output index, text
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if self.dropping or tag in DROPPED_TAGS:
+            if tag not in VOID_TAGS:
+                self.dropping.append(tag)
+            return
+        if tag not in ALLOWED_TAGS:
+            return
+        allowed = ALLOWED_ATTRIBUTES.get(tag, ())
+        kept = []
+        for name, value in attrs:
+            if name not in allowed or value is None:
+                continue
+            if name in URL_ATTRIBUTES and not _safe_url(value):
+                continue
+            if tag == "code" and name == "class" and not _CODE_CLASS.match(value):
+                continue
+            kept.append(f' {name}="{html.escape(value, quote=True)}"')
+        if tag == "a" and any(part.startswith(" href=") for part in kept):
+            kept.append(' rel="nofollow noopener"')
+        if tag in VOID_TAGS:
+            self.out.append(f"<{tag}{''.join(kept)}>")
+            return
+        if tag[0] == "h" and tag[1:].isdigit() and self._heading is None:
+            # The id is only known once the heading's text is
+            self._heading = (tag, len(self.out), [])
+        self.out.append(f"<{tag}{''.join(kept)}>")
+        self.open.append(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if self.dropping:
+            if tag == self.dropping[-1]:
+                self.dropping.pop()
+            return
+        if tag not in self.open:
+            return
+        while self.open:
+            current = self.open.pop()
+            self.out.append(f"</{current}>")
+            if self._heading is not None and self._heading[0] == current:
+                self._close_heading()
+            if current == tag:
+                break
+
+    def handle_data(self, data: str) -> None:
+        if self.dropping:
+            return
+        self.out.append(html.escape(data, quote=False))
+        self.words += len(_WORD.findall(data))
+        if self._heading is not None:
+            self._heading[2].append(data)
+
+    def _close_heading(self) -> None:
+        tag, index, parts = self._heading
+        self._heading = None
+        title = " ".join("".join(parts).split())
+        slug = _slug(title)
+        seen = self._slugs.get(slug, 0)
+        self._slugs[slug] = seen + 1
+        if seen:
+            slug = f"{slug}-{seen}"
+        self.out[index] = f'<{tag} id="{slug}"' + self.out[index][len(tag) + 1:]
+        level = int(tag[1:])
+        if level in TOC_LEVELS:
+            self.toc.append({"level": level, "id": slug, "title": title})
+
+    def close(self) -> None:
+        super().close()
+        while self.open:
+            self.handle_endtag(self.open[-1])
+
+
+def sanitize(markup: str) -> Dict[str, Any]:
+    """
+    Sanitized ``html`` of untrusted markup, with its ``toc`` and ``word_count``.
+    """
+    sanitizer = _Sanitizer()
+    sanitizer.feed(markup)
+    sanitizer.close()
+    return {"html": "".join(sanitizer.out), "toc": sanitizer.toc, "word_count": sanitizer.words}
+
+
+# Markdown: ATX headings, paragraphs, fenced and indented code, block quotes,
+# flat lists, rules, emphasis, code spans, links and images. HTML is passed
+# through to the sanitizer, so anything markdown does not cover can be
+# written as (allowed) HTML.
+
+_FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})\s*([\w+#-]*)")
+_HEADING = re.compile(r"^ {0,3}(#{1,6})(?:\s+(.*?))?(?:\s+#+)?\s*$")
+_RULE = re.compile(r"^ {0,3}(?:(?:\*\s*){3,}|(?:-\s*){3,}|(?:_\s*){3,})$")
+_QUOTE = re.compile(r"^ {0,3}> ?")
+_BULLET = re.compile(r"^ {0,3}[-*+]\s+")
+_ORDERED = re.compile(r"^ {0,3}(\d{1,9})[.)]\s+")
+_HTML_BLOCK = re.compile(r"^ {0,3}</?[a-zA-Z][\w-]*[\s/>]|^ {0,3}<!--")
+_INDENTED = re.compile(r"^(?: {4}|\t)")
+
+_CODE_SPAN = re.compile(r"(`+)(.+?)\1", re.S)
+# Link and image destinations may contain balanced parentheses, one level
+# deep: [w](https://en.wikipedia.org/wiki/Foo_(bar))
+_DESTINATION = r"((?:[^\s()>]|\([^\s()>]*\))*)"
+_IMAGE = re.compile(r'!\[([^\]]*)\]\(\s*<?' + _DESTINATION + r'>?(?:\s+"([^"]*)")?\s*\)')
+_LINK = re.compile(r'\[([^\]]+)\]\(\s*<?' + _DESTINATION + r'>?(?:\s+"([^"]*)")?\s*\)')
+_AUTOLINK = re.compile(r"<((?:https?|mailto):[^\s<>]+)>")
+_STRONG = re.compile(r"(\*\*|__)(?=\S)(.+?)(?<=\S)\1", re.S)
+_EMPHASIS = re.compile(r"(?<![\w*])([*_])(?=\S)(.+?)(?<=\S)\1(?![\w*])", re.S)
+
+
+def _attr(value: str) -> str:
+    return html.escape(value, quote=True)
+
+
+def _inline(text: str) -> str:
+    # Code spans, then the markup of links and images, are set aside first so
+    # nothing inside them is markdown; link text stays, so emphasis applies
+    spans: List[str] = []
+
+    def aside(markup: str) -> str:
+        spans.append(markup)
+        return f"\x00{len(spans) - 1}\x00"
+
+    def image(match: "re.Match[str]") -> str:
+        title = f' title="{_attr(match.group(3))}"' if match.group(3) else ""
+        return aside(f'<img src="{_attr(match.group(2))}" alt="{_attr(match.group(1))}"{title}>')
+
+    def link(match: "re.Match[str]") -> str:
+        title = f' title="{_attr(match.group(3))}"' if match.group(3) else ""
+        return aside(f'<a href="{_attr(match.group(2))}"{title}>') + match.group(1) + aside("</a>")
+
+    text = _CODE_SPAN.sub(lambda m: aside(f"<code>{html.escape(m.group(2).strip())}</code>"), text)
+    text = _IMAGE.sub(image, text)
+    text = _LINK.sub(link, text)
+    text = _AUTOLINK.sub(lambda m: aside(f'<a href="{_attr(m.group(1))}">{html.escape(m.group(1))}</a>'), text)
+    text = _STRONG.sub(r"<strong>\2</strong>", text)
+    text = _EMPHASIS.sub(r"<em>\2</em>", text)
+    text = re.sub(r" {2,}\n|\\\n", "<br>\n", text)
+    return re.sub(r"\x00(\d+)\x00", lambda m: spans[int(m.group(1))], text)
+
+
+def _list_item(line: str) -> Optional[Tuple[str, Optional[str], str]]:
+    bullet = _BULLET.match(line)
+    if bullet:
+        return "ul", None, line[bullet.end():]
+    ordered = _ORDERED.match(line)
+    if ordered:
+        return "ol", ordered.group(1), line[ordered.end():]
+    return None
+
+
+def markdown_to_html(source: str) -> str:
+    # NUL marks the spans _inline sets aside; as in CommonMark, the source's own become U+FFFD
+    source = source.replace("\x00", "\ufffd")
+    lines = source.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    out: List[str] = []
+    paragraph: List[str] = []
+
+    def end_paragraph() -> None:
+        if paragraph:
+            out.append(f"<p>{_inline(chr(10).join(paragraph).strip())}</p>")
+            paragraph.clear()
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        fence = _FENCE.match(line)
+        if fence:
+            end_paragraph()
+            marker, language = fence.group(1), fence.group(2)
+            code: List[str] = []
+            i += 1
+            while i < len(lines) and not lines[i].strip().startswith(marker):
+                code.append(lines[i])
+                i += 1
+            css = f' class="language-{language}"' if language else ""
+            out.append(f"<pre><code{css}>{html.escape(chr(10).join(code))}</code></pre>")
+            i += 1
+            continue
+        if not line.strip():
+            end_paragraph()
+            i += 1
+            continue
+        if _INDENTED.match(line) and not paragraph:
+            code = []
+            while i < len(lines) and (_INDENTED.match(lines[i]) or not lines[i].strip()):
+                code.append(re.sub(r"^(?: {4}|\t)", "", lines[i]))
+                i += 1
+            out.append(f"<pre><code>{html.escape(chr(10).join(code).rstrip(chr(10)))}</code></pre>")
+            continue
+        heading = _HEADING.match(line)
+        if heading:
+            end_paragraph()
+            level = len(heading.group(1))
+            out.append(f"<h{level}>{_inline(heading.group(2) or '')}</h{level}>")
+            i += 1
+            continue
+        if _RULE.match(line):
+            end_paragraph()
+            out.append("<hr>")
+            i += 1
+            continue
+        if _QUOTE.match(line):
+            end_paragraph()
+            quoted = []
+            while i < len(lines) and lines[i].strip() and (_QUOTE.match(lines[i]) or quoted):
+                quoted.append(_QUOTE.sub("", lines[i], count=1))
+                i += 1
+            out.append(f"<blockquote>{markdown_to_html(chr(10).join(quoted))}</blockquote>")
+            continue
+        item = _list_item(line)
+        if item:
+            end_paragraph()
+            kind, start = item[0], item[1]
+            items: List[List[str]] = []
+            while i < len(lines):
+                item = _list_item(lines[i])
+                if item and item[0] == kind:
+                    items.append([item[2]])
+                elif lines[i].strip() and lines[i][:1] in (" ", "\t"):
+                    items[-1].append(lines[i].strip())  # continuation line
+                else:
+                    break
+                i += 1
+            attrs = f' start="{start}"' if kind == "ol" and start not in (None, "1") else ""
+            body = "".join(f"<li>{_inline(chr(10).join(text))}</li>" for text in items)
+            out.append(f"<{kind}{attrs}>{body}</{kind}>")
+            continue
+        if _HTML_BLOCK.match(line) and not paragraph:
+            block = []
+            while i < len(lines) and lines[i].strip():
+                block.append(lines[i])
+                i += 1
+            out.append("\n".join(block))
+            continue
+        paragraph.append(line)
+        i += 1
+    end_paragraph()
+    return "\n".join(out)
+
+
+def reading_time_minutes(word_count: int) -> int:
+    if not word_count:
+        return 0
+    return max(1, math.ceil(word_count / settings.RENDER_WORDS_PER_MINUTE))
+
+
+def render(source: str) -> Dict[str, Any]:
+    """
+    ``html``, ``toc`` (level, id, title of each heading), ``word_count``
+    and ``reading_time_minutes`` of a lesson body. Runs in the render pool
+    for large bodies, so it must stay a plain function of its input.
+    """
+    rendered = sanitize(markdown_to_html(source))
+    rendered["reading_time_minutes"] = reading_time_minutes(rendered["word_count"])
+    return rendered
+
+
+# Render pool
+
+_render_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _get_render_executor() -> ProcessPoolExecutor:
+    # Created lazily so every uvicorn worker owns its own pool after fork
+    global _render_executor
+    if _render_executor is None:
+        _render_executor = ProcessPoolExecutor(max_workers=settings.RENDER_WORKERS)
+    return _render_executor
+
+
+def _use_pool(source: str) -> bool:
+    return settings.RENDER_WORKERS > 0 and len(source) >= settings.RENDER_POOL_MIN_SIZE
+
+
+def render_document(source: str) -> Dict[str, Any]:
+    """
+    render() in the calling thread, or on the render pool for large bodies
+    so a long chapter does not hold the GIL other requests need.
+    """
+    if _use_pool(source):
+        return _get_render_executor().submit(render, source).result()
+    return render(source)
+
+
+async def render_document_async(source: str) -> Dict[str, Any]:
+    """
+    render_document() without blocking the event loop.
+    """
+    if _use_pool(source):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_render_executor(), render, source)
+    return render(source)
+
+
+def shutdown_render_pool() -> None:
+    """
+    Stop the render pool worker processes.
+    """
+    global _render_executor
+    if _render_executor is not None:
+        _render_executor.shutdown(wait=False, cancel_futures=True)
+        _render_executor = None
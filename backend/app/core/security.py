@@ -1,8 +1,23 @@
 # backend/app/core/security.py
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
 from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+class PasswordHashingBusy(RuntimeError):
+    """
+    Raised when the hashing pool already has too many queued jobs.
+    """
+
+_hash_executor: Optional[ProcessPoolExecutor] = None
+_pending_hash_jobs = 0
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against a hash.
@@ -13,4 +28,46 @@ def get_password_hash(password: str) -> str:
     """
     Get password hash.
     """
-    return pwd_context.hash(password)
\ No newline at end of file
+    return pwd_context.hash(password)
+
+def _get_hash_executor() -> ProcessPoolExecutor:
+    # Created lazily so every uvicorn worker owns its own pool after fork
+    global _hash_executor
+    if _hash_executor is None:
+        _hash_executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+    return _hash_executor
+
+async def _run_hash_job(func: Callable[..., Any], *args: Any) -> Any:
+    global _pending_hash_jobs
+    if _pending_hash_jobs >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise PasswordHashingBusy("Password hashing queue is full")
+
+    _pending_hash_jobs += 1
+    try:
+        if settings.PASSWORD_HASH_WORKERS <= 0:
+            return await run_in_threadpool(func, *args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_hash_executor(), func, *args)
+    finally:
+        _pending_hash_jobs -= 1
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password on the hashing pool without blocking the event loop.
+    """
+    return await _run_hash_job(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Get password hash from the hashing pool without blocking the event loop.
+    """
+    return await _run_hash_job(get_password_hash, password)
+
+def shutdown_hash_pool() -> None:
+    """
+    Stop the hashing pool worker processes.
+    """
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=False, cancel_futures=True)
+        _hash_executor = None
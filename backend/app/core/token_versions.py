@@ -0,0 +1,99 @@
+# backend/app/core/token_versions.py
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.core.config import settings
+
+REVOKED = -1
+
+
+class TokenVersionMap:
+    """
+    In-memory map of user id -> current token version.
+
+    Users changed within the lifetime of an access token are loaded by the
+    incremental refresh from ``users.updated_at``, at most once per
+    ``refresh_seconds``. Any other user is unknown until their version is
+    looked up and ``fill``-ed in: a missing entry never means version 0,
+    since the last change may predate the refresh window (e.g. after a
+    restart).
+    """
+
+    def __init__(self, refresh_seconds: int, token_lifetime: timedelta):
+        self.refresh_seconds = refresh_seconds
+        self.token_lifetime = token_lifetime
+        self._versions: Dict[int, int] = {}
+        self._watermark: Optional[datetime] = None
+        self._last_refresh = float("-inf")
+        self._lock = threading.Lock()
+
+    def needs_refresh(self) -> bool:
+        return time.monotonic() - self._last_refresh >= self.refresh_seconds
+
+    def begin_refresh(self) -> Optional[datetime]:
+        """
+        Claim the next refresh and return the updated_at lower bound to scan from.
+
+        Returns None when another thread is already refreshing. The bound
+        overlaps the previous scan so that rows committed late by long
+        transactions are not missed.
+        """
+        if not self._lock.acquire(blocking=False):
+            return None
+        if self._watermark is None:
+            return datetime.now(timezone.utc) - self.token_lifetime
+        return self._watermark - timedelta(seconds=self.refresh_seconds * 2)
+
+    def finish_refresh(self, rows: Iterable[Tuple[int, int, Optional[datetime]]]) -> None:
+        """
+        Apply ``(user_id, token_version, updated_at)`` rows and release the refresh.
+        """
+        try:
+            for user_id, token_version, updated_at in rows:
+                if self._versions.get(user_id) != REVOKED:
+                    self._versions[user_id] = token_version
+                if updated_at is not None:
+                    if updated_at.tzinfo is None:
+                        updated_at = updated_at.replace(tzinfo=timezone.utc)
+                    if self._watermark is None or updated_at > self._watermark:
+                        self._watermark = updated_at
+            if self._watermark is None:
+                self._watermark = datetime.now(timezone.utc) - self.token_lifetime
+            self._last_refresh = time.monotonic()
+        finally:
+            self._lock.release()
+
+    def record(self, user_id: int, token_version: int) -> None:
+        """
+        Apply a local write immediately instead of waiting for the next refresh.
+        """
+        self._versions[user_id] = token_version
+
+    def fill(self, user_id: int, token_version: Optional[int]) -> None:
+        """
+        Record a version read from the database for an unknown user, unless a
+        refresh or local write got there first; None (no such user) revokes.
+        """
+        self._versions.setdefault(user_id, REVOKED if token_version is None else token_version)
+
+    def revoke(self, user_id: int) -> None:
+        self._versions[user_id] = REVOKED
+
+    def get(self, user_id: int) -> Optional[int]:
+        """
+        The user's current version, or None when it must be looked up.
+        """
+        return self._versions.get(user_id)
+
+    def clear(self) -> None:
+        self._versions.clear()
+        self._watermark = None
+        self._last_refresh = float("-inf")
+
+
+token_versions = TokenVersionMap(
+    refresh_seconds=settings.TOKEN_VERSION_REFRESH_SECONDS,
+    token_lifetime=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+)
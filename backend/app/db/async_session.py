@@ -0,0 +1,95 @@
+# backend/app/db/async_session.py
+from typing import Any, AsyncGenerator, Dict, Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import settings
+from app.db.pool import InstrumentedQueuePool
+
+# Async driver used for each sync backend name
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """
+    Instrumented pool for async engines.
+    """
+
+
+def async_database_url(url: Optional[str] = None) -> str:
+    """
+    Async URL for the configured database, swapping in the async driver.
+    """
+    if url is None and settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    sa_url = make_url(url or str(settings.DATABASE_URL))
+    backend = sa_url.get_backend_name()
+    if backend in ASYNC_DRIVERS and sa_url.get_driver_name() != ASYNC_DRIVERS[backend]:
+        sa_url = sa_url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+    return sa_url.render_as_string(hide_password=False)
+
+
+def async_engine_options(url: str) -> Dict[str, Any]:
+    """
+    Pool and connection options for an async engine built from settings.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+
+    options: Dict[str, Any] = {
+        "poolclass": InstrumentedAsyncQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        options["connect_args"] = {
+            "server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+        }
+    return options
+
+
+# Objects stay usable after commit so responses can be serialized without a reload
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False, class_=AsyncSession)
+
+_async_engine: Optional[AsyncEngine] = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Create the async engine on first use so the async driver stays optional.
+    """
+    global _async_engine
+    if _async_engine is None:
+        url = async_database_url()
+        _async_engine = create_async_engine(url, **async_engine_options(url))
+        AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+
+def started_async_engine() -> Optional[AsyncEngine]:
+    """
+    The async engine if something has created it; never creates one.
+    """
+    return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+
+
+# Dependency to get an async DB session
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -6,6 +6,9 @@ from app.db.base_class import Base  # noqa
 # Import all the models here that should be included in the Base metadata
 # This is to ensure Alembic sees all models during migration
 from app.models.user import User  # noqa
-from app.models.course import Course, Module, Lesson  # noqa
+from app.models.content import ContentBlob  # noqa
+from app.models.course import Course, Module, Lesson, CourseOutline, CourseFacetCount, SearchDocument, RenderedContent  # noqa
 from app.models.assessment import Assessment, Question, Answer, UserAssessment, UserAnswer  # noqa
-from app.models.enrollment import Enrollment  # noqa
\ No newline at end of file
+from app.models.enrollment import Enrollment  # noqa
+from app.models.forum import ForumTopic, ForumReply  # noqa
+from app.models.progress import LessonCompletion, AssessmentAttempt  # noqa
\ No newline at end of file
@@ -7,7 +7,12 @@ from sqlalchemy.ext.declarative import as_declarative, declared_attr
 class Base:
     id: Any
     __name__: str
+    # Read server-generated values (ids, created_at, onupdate timestamps) back
+    # with INSERT/UPDATE ... RETURNING instead of a SELECT after the write.
+    # updated_at columns use default=null() so inserts don't post-fetch them.
+    __mapper_args__ = {"eager_defaults": True}
+
     # Generate __tablename__ automatically
     @declared_attr
     def __tablename__(cls) -> str:
-        return cls.__name__.lower()
\ No newline at end of file
+        return cls.__name__.lower()
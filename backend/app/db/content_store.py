@@ -0,0 +1,274 @@
+# backend/app/db/content_store.py
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, event, select
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.exc import DetachedInstanceError
+
+from app.core.config import settings
+from app.db.dml import upsert_insert
+from app.models.content import ContentBlob
+
+# Content-addressed bodies: lessons and modules keep the hash of their body
+# and the text lives once in content_blobs, compressed. Rows that carry no
+# body column stay small for every query that touches them (listings,
+# permission checks), identical bodies (e.g. copied courses) share one blob,
+# and since a hash always names the same text, cached bodies never go stale.
+
+# Most hashes missing from the cache loaded in one query
+LOAD_BATCH_SIZE = 500
+
+
+def digest(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def encode(text: str) -> Tuple[str, bytes]:
+    """
+    The stored encoding and bytes of a body: zlib unless it is short or
+    does not shrink.
+    """
+    raw = text.encode()
+    if len(raw) >= settings.CONTENT_COMPRESSION_MIN_SIZE:
+        compressed = zlib.compress(raw, settings.CONTENT_COMPRESSION_LEVEL)
+        if len(compressed) < len(raw):
+            return "zlib", compressed
+    return "identity", raw
+
+
+def decode(encoding: str, data: bytes) -> str:
+    if encoding == "zlib":
+        data = zlib.decompress(data)
+    return data.decode()
+
+
+class ContentCache:
+    """
+    LRU of decompressed bodies by hash, bounded by total length.
+    """
+
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self.chars = 0
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, content_hash: str) -> Optional[str]:
+        with self._lock:
+            text = self._entries.get(content_hash)
+            if text is None:
+                return None
+            self._entries.move_to_end(content_hash)
+            return text
+
+    def __contains__(self, content_hash: str) -> bool:
+        return content_hash in self._entries
+
+    def set(self, content_hash: str, text: str) -> None:
+        if len(text) > self.max_chars:
+            return
+        with self._lock:
+            if content_hash in self._entries:
+                self._entries.move_to_end(content_hash)
+                return
+            self._entries[content_hash] = text
+            self.chars += len(text)
+            while self.chars > self.max_chars:
+                _, evicted = self._entries.popitem(last=False)
+                self.chars -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.chars = 0
+
+
+content_cache = ContentCache(settings.CONTENT_CACHE_MAX_CHARS)
+
+
+def put(db: Session, text: str) -> str:
+    """
+    Store a body unless it is already stored, and return its hash.
+    """
+    content_hash = digest(text)
+    encoding, data = encode(text)
+    stmt = upsert_insert(db, ContentBlob).values(
+        hash=content_hash, encoding=encoding, size=len(text.encode()), data=data,
+    )
+    # The connection, not the session: this also runs inside before_flush
+    db.connection().execute(stmt.on_conflict_do_nothing(index_elements=["hash"]))
+    content_cache.set(content_hash, text)
+    return content_hash
+
+
+def get_many(db: Session, hashes: Iterable[str]) -> Dict[str, str]:
+    """
+    Bodies by hash, from the cache or else one query for the rest.
+    """
+    texts: Dict[str, str] = {}
+    missing: List[str] = []
+    for content_hash in set(hashes):
+        text = content_cache.get(content_hash)
+        if text is None:
+            missing.append(content_hash)
+        else:
+            texts[content_hash] = text
+    if missing:
+        rows = db.connection().execute(
+            select(ContentBlob.hash, ContentBlob.encoding, ContentBlob.data).where(ContentBlob.hash.in_(missing))
+        )
+        for content_hash, encoding, data in rows:
+            texts[content_hash] = decode(encoding, data)
+            content_cache.set(content_hash, texts[content_hash])
+    return texts
+
+
+class ContentAttribute:
+    """
+    ``Lesson.content`` and friends: the body behind a hash column, read and
+    written as plain text.
+
+    Reading loads the body on first access. A cache miss also loads the
+    missing bodies of every other instance of the class in the session, so
+    serializing a list costs one query, like a selectinload. Assigning
+    stores the hash at once and the blob just before the next flush. Async
+    code must ``preload`` first: the load cannot run outside ``run_sync``,
+    so preloaded bodies are kept on the instance rather than only in the
+    bounded cache, which may evict them before they are read.
+    """
+
+    def __init__(self, hash_attr: str):
+        self.hash_attr = hash_attr
+
+    def __set_name__(self, owner: Any, name: str) -> None:
+        self.owner = owner
+        self.pending_attr = f"_pending_{name}"
+        self.loaded_attr = f"_loaded_{name}"
+        _attributes.append(self)
+
+    @property
+    def column(self) -> Any:
+        """
+        The hash column, for load_only and the like.
+        """
+        return getattr(self.owner, self.hash_attr)
+
+    def __get__(self, obj: Any, owner: Any = None) -> Any:
+        if obj is None:
+            return self
+        pending = obj.__dict__.get(self.pending_attr)
+        if pending is not None:
+            return pending
+        content_hash = getattr(obj, self.hash_attr)
+        if content_hash is None:
+            return None
+        loaded = obj.__dict__.get(self.loaded_attr)
+        if loaded is not None and loaded[0] == content_hash:
+            return loaded[1]
+        text = content_cache.get(content_hash)
+        if text is not None:
+            return text
+        db = object_session(obj)
+        if db is None:
+            raise DetachedInstanceError(f"Cannot load {self.hash_attr} body of a detached {type(obj).__name__}")
+        return get_many(db, self._batch(db, content_hash))[content_hash]
+
+    def __set__(self, obj: Any, text: Optional[str]) -> None:
+        if text is None:
+            setattr(obj, self.hash_attr, None)
+            obj.__dict__.pop(self.pending_attr, None)
+            return
+        setattr(obj, self.hash_attr, digest(text))
+        obj.__dict__[self.pending_attr] = text
+
+    def _batch(self, db: Session, content_hash: str) -> List[str]:
+        hashes = [content_hash]
+        for other in db.identity_map.values():
+            if len(hashes) >= LOAD_BATCH_SIZE:
+                break
+            if isinstance(other, self.owner):
+                other_hash = other.__dict__.get(self.hash_attr)  # loaded values only
+                if other_hash is not None and other_hash not in content_cache:
+                    hashes.append(other_hash)
+        return hashes
+
+    def flush_pending(self, db: Session, obj: Any) -> None:
+        text = obj.__dict__.pop(self.pending_attr, None)
+        if text is not None:
+            put(db, text)
+
+
+_attributes: List[ContentAttribute] = []
+# Hash columns of rows derived from a body (e.g. its render), removed with it
+_derived: List[Any] = []
+
+
+def derived_from(column: Any) -> None:
+    """
+    Mark ``column`` as the body hash of rows derived from that body, so
+    collect_garbage deletes them once no row holds the body itself.
+    """
+    _derived.append(column)
+
+
+def _bodies(obj: Any) -> Iterable[Tuple[Any, ContentAttribute, str]]:
+    for attribute in _attributes:
+        if isinstance(obj, attribute.owner):
+            content_hash = obj.__dict__.get(attribute.hash_attr)
+            if content_hash is not None:
+                yield obj, attribute, content_hash
+    # Loaded collections (a course's modules, a module's lessons)
+    for value in list(obj.__dict__.values()):
+        if isinstance(value, list):
+            for item in value:
+                yield from _bodies(item)
+
+
+def preload(db: Session, objects: Iterable[Any]) -> None:
+    """
+    Load the bodies of ``objects`` and of their loaded collections onto the
+    instances; for async sessions, as ``await db.run_sync(preload, objects)``.
+    """
+    bodies = [body for obj in objects for body in _bodies(obj)]
+    if not bodies:
+        return
+    texts = get_many(db, [content_hash for _, _, content_hash in bodies])
+    for obj, attribute, content_hash in bodies:
+        obj.__dict__[attribute.loaded_attr] = (content_hash, texts[content_hash])
+
+
+def collect_garbage(db: Session) -> int:
+    """
+    Delete blobs no longer referenced, e.g. after edits, and the rows derived
+    from them; returns how many blobs. Run from maintenance jobs, not requests.
+    """
+    derived_tables = {column.table for column in _derived}
+    for column in _derived:
+        stmt = delete(column.table)
+        for attribute in _attributes:
+            if attribute.column.table not in derived_tables:
+                stmt = stmt.where(column.not_in(
+                    select(attribute.column).where(attribute.column.is_not(None))
+                ))
+        db.execute(stmt)
+    stmt = delete(ContentBlob)
+    for attribute in _attributes:
+        stmt = stmt.where(ContentBlob.hash.not_in(
+            select(attribute.column).where(attribute.column.is_not(None))
+        ))
+    deleted = db.execute(stmt).rowcount
+    db.commit()
+    return deleted
+
+
+@event.listens_for(Session, "before_flush")
+def _store_pending_bodies(db: Session, flush_context: Any, instances: Any) -> None:
+    # Blobs go first, so the rows referencing them never point at nothing
+    for obj in (*db.new, *db.dirty):
+        for attribute in _attributes:
+            if isinstance(obj, attribute.owner):
+                attribute.flush_pending(db, obj)
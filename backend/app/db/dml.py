@@ -0,0 +1,16 @@
+# backend/app/db/dml.py
+from typing import Any, Union
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+def upsert_insert(db: Union[Session, AsyncSession], model: Any) -> Any:
+    """
+    INSERT construct with ON CONFLICT support for the session's backend
+    (PostgreSQL or SQLite), for single-statement upserts.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
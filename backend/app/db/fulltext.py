@@ -0,0 +1,82 @@
+# backend/app/db/fulltext.py
+from typing import Any, List
+
+from sqlalchemy import text
+
+# Full-text index over search_documents, one per backend. Both are kept in
+# step with the table by the database on every write:
+#
+# - PostgreSQL: a generated tsvector column (title weighted above body)
+#   with a GIN index.
+# - SQLite: an external-content FTS5 table updated by triggers; its rowid
+#   is the document id.
+#
+# Alembic revision 0006 creates the same objects for migrated databases;
+# the listeners below cover create_all (tests, local development).
+
+LANGUAGE = "english"
+FTS_TABLE = "search_documents_fts"
+
+POSTGRESQL_DDL: List[str] = [
+    f"""
+    ALTER TABLE search_documents ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('{LANGUAGE}', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{LANGUAGE}', coalesce(body, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX ix_search_documents_search_vector ON search_documents USING gin (search_vector)",
+]
+
+SQLITE_DDL: List[str] = [
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        title, body, content='search_documents', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    f"""
+    CREATE TRIGGER search_documents_ai AFTER INSERT ON search_documents BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    f"""
+    CREATE TRIGGER search_documents_ad AFTER DELETE ON search_documents BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    f"""
+    CREATE TRIGGER search_documents_au AFTER UPDATE OF title, body ON search_documents BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+]
+
+
+def include_name(name: str, type_: str, parent_names: Any) -> bool:
+    """
+    Alembic autogenerate filter: the objects above are not in the models.
+    """
+    if type_ == "table":
+        return not name.startswith(FTS_TABLE)  # FTS5 adds shadow tables with this prefix
+    if type_ == "column":
+        return name != "search_vector"
+    if type_ == "index":
+        return name != "ix_search_documents_search_vector"
+    return True
+
+
+def create_index(target: Any, connection: Any, **kw: Any) -> None:
+    """
+    ``after_create`` listener of the search_documents table.
+    """
+    statements = {"postgresql": POSTGRESQL_DDL, "sqlite": SQLITE_DDL}.get(connection.dialect.name, [])
+    for statement in statements:
+        connection.execute(text(statement))
+
+
+def drop_index(target: Any, connection: Any, **kw: Any) -> None:
+    """
+    ``before_drop`` listener; the column and triggers go with the table.
+    """
+    if connection.dialect.name == "sqlite":
+        connection.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
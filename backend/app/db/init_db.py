@@ -1,27 +1,43 @@
 # backend/app/db/init_db.py
 import logging
 from sqlalchemy.orm import Session
-from app.db.session import engine, Base, SessionLocal
+from app.db.session import engine, SessionLocal
+from app.db.base import Base
 from app.core.config import settings
 from app.schemas.user import UserCreate
-from app.services import user_service
+from app.services import outline_service, user_service
 
 # Create a logger for this module
 logger = logging.getLogger(__name__)
 
 def init_db() -> None:
     """
-    Initialize the database with required tables and initial data.
+    Create tables directly from the models and seed initial data.
+
+    Only for throwaway local databases; everything else is managed by
+    Alembic (``alembic upgrade head``) and seeded with ``python -m app.db.init_db``.
     """
     # Create tables
     Base.metadata.create_all(bind=engine)
+    seed_db()
 
-    # Create initial admin user if doesn't exist
+def seed_db() -> None:
+    """
+    Insert the initial data. Safe to run repeatedly.
+    """
     db = SessionLocal()
     try:
         create_initial_users(db)
     except Exception as e:
         logger.error(f"Error creating initial users: {e}")
+        db.rollback()
+    try:
+        # Courses created before outlines existed, or by writes outside the services
+        built = outline_service.rebuild_missing(db)
+        if built:
+            logger.info(f"Built {built} course outlines")
+    except Exception as e:
+        logger.error(f"Error building course outlines: {e}")
     finally:
         db.close()
 
@@ -44,4 +60,10 @@ def create_initial_users(db: Session) -> None:
             is_active=True
         )
         user_service.create(db, obj_in=admin_user)
-        logger.info("Admin user created")
\ No newline at end of file
+        logger.info("Admin user created")
+
+
+if __name__ == "__main__":
+    # One-shot seeding, run after migrations: python -m app.db.init_db
+    logging.basicConfig(level=logging.INFO)
+    seed_db()
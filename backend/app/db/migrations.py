@@ -0,0 +1,55 @@
+# backend/app/db/migrations.py
+import logging
+from pathlib import Path
+from typing import Optional
+
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+class SchemaOutOfDate(RuntimeError):
+    """
+    The database is not at the head Alembic revision.
+    """
+
+
+def alembic_config(url: Optional[str] = None) -> Config:
+    """
+    Alembic config for backend/alembic.ini, usable from any working directory.
+    """
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    if url is not None:
+        config.set_main_option("sqlalchemy.url", url.replace("%", "%%"))
+    return config
+
+
+def head_revision() -> Optional[str]:
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def current_revision(engine: Engine) -> Optional[str]:
+    with engine.connect() as connection:
+        return MigrationContext.configure(connection).get_current_revision()
+
+
+def verify_schema_revision(engine: Engine) -> str:
+    """
+    Check that the database has been migrated to the head revision.
+
+    Only reads alembic_version; never changes the schema.
+    """
+    head = head_revision()
+    current = current_revision(engine)
+    if current != head:
+        raise SchemaOutOfDate(
+            f"Database schema is at revision {current or 'none'}, expected {head}. "
+            "Run 'alembic upgrade head' before starting the API."
+        )
+    return current
@@ -0,0 +1,175 @@
+# backend/app/db/pagination.py
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import DateTime, Select, bindparam, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.functions import FunctionElement
+
+NEXT = "n"
+PREV = "p"
+
+
+class _comparable_datetime(FunctionElement):
+    """
+    A datetime expression that compares consistently on every backend.
+
+    SQLite keeps datetimes as text: CURRENT_TIMESTAMP defaults store
+    "YYYY-MM-DD HH:MM:SS" while bound parameters carry microseconds, so equal
+    instants compare unequal. There both sides are normalised with strftime;
+    other backends use the column unchanged (and its index).
+    """
+    inherit_cache = True
+
+
+@compiles(_comparable_datetime)
+def _compile_comparable_datetime(element, compiler, **kw):
+    return compiler.process(element.clauses, **kw)
+
+
+@compiles(_comparable_datetime, "sqlite")
+def _compile_comparable_datetime_sqlite(element, compiler, **kw):
+    return "strftime('%%Y-%%m-%%d %%H:%%M:%%f', %s)" % compiler.process(element.clauses, **kw)
+
+
+def _key(column: Any, value: Any = None, bound: bool = False) -> Any:
+    if not isinstance(column.type, DateTime):
+        return value if bound else column
+    if bound:
+        return _comparable_datetime(bindparam(None, value, type_=column.type))
+    return _comparable_datetime(column)
+
+
+class Keyset:
+    """
+    Ordering for cursor pagination: indexed columns, the last one unique
+    (usually the primary key), all sorted in the same direction.
+    """
+
+    def __init__(self, name: str, *columns: Any, descending: bool = False):
+        self.name = name
+        self.columns = columns
+        self.descending = descending
+
+    def order_by(self, backwards: bool = False) -> List[Any]:
+        descending = self.descending != backwards
+        keys = [_key(column) for column in self.columns]
+        return [key.desc() if descending else key.asc() for key in keys]
+
+    def seek(self, values: Sequence[Any], backwards: bool = False) -> Any:
+        """
+        WHERE clause for the rows after ``values`` in the walk direction.
+        """
+        keys = [_key(column) for column in self.columns]
+        bounds = [_key(column, value, bound=True) for column, value in zip(self.columns, values)]
+        if len(keys) == 1:
+            key, bound = keys[0], bounds[0]
+        else:
+            key, bound = tuple_(*keys), tuple_(*bounds)
+        return key < bound if self.descending != backwards else key > bound
+
+    def values(self, obj: Any) -> List[Any]:
+        return [getattr(obj, column.key) for column in self.columns]
+
+
+class KeysetPage:
+    """
+    One page of rows with opaque cursors to the neighbouring pages.
+    """
+
+    def __init__(self, items: List[Any], next_cursor: Optional[str], prev_cursor: Optional[str]):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+
+def encode_cursor(keyset: Keyset, values: Sequence[Any], direction: str) -> str:
+    payload = {
+        "k": keyset.name,
+        "d": direction,
+        "v": [v.isoformat() if isinstance(v, (datetime, date)) else v for v in values],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(keyset: Keyset, cursor: str) -> Tuple[str, List[Any]]:
+    """
+    Return the direction and key values of a cursor, or raise a 400.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if payload["k"] != keyset.name or payload["d"] not in (NEXT, PREV):
+            raise ValueError("cursor belongs to another listing")
+        values = payload["v"]
+        if len(values) != len(keyset.columns):
+            raise ValueError("wrong number of key values")
+        values = [
+            datetime.fromisoformat(value)
+            if value is not None and column.type.python_type is datetime else value
+            for column, value in zip(keyset.columns, values)
+        ]
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    return payload["d"], values
+
+
+def _page_query(stmt: Select, keyset: Keyset, cursor: Optional[str], limit: int) -> Tuple[Select, bool]:
+    backwards = False
+    if cursor:
+        direction, values = decode_cursor(keyset, cursor)
+        backwards = direction == PREV
+        stmt = stmt.where(keyset.seek(values, backwards))
+    # One extra row tells us whether another page exists in the walk direction
+    return stmt.order_by(*keyset.order_by(backwards)).limit(limit + 1), backwards
+
+
+def _build_page(rows: List[Any], keyset: Keyset, cursor: Optional[str], limit: int, backwards: bool) -> KeysetPage:
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backwards:
+        rows.reverse()
+
+    has_next = has_more if not backwards else True
+    has_prev = bool(cursor) if not backwards else has_more
+    next_cursor = prev_cursor = None
+    if rows and has_next:
+        next_cursor = encode_cursor(keyset, keyset.values(rows[-1]), NEXT)
+    if rows and has_prev:
+        prev_cursor = encode_cursor(keyset, keyset.values(rows[0]), PREV)
+    return KeysetPage(rows, next_cursor=next_cursor, prev_cursor=prev_cursor)
+
+
+def paginate(
+        db: Session, stmt: Select, keyset: Keyset, *, cursor: Optional[str], limit: int, as_rows: bool = False
+) -> KeysetPage:
+    """
+    Fetch the page of ``stmt`` after (or before) ``cursor`` in keyset order.
+
+    Seeks on the keyset columns instead of skipping rows, so every page
+    costs one index range scan regardless of depth. Items are the first
+    entity of each row, or the whole rows with ``as_rows`` (column selects,
+    which must include the keyset columns under their own names).
+    """
+    limit = max(limit, 1)
+    query, backwards = _page_query(stmt, keyset, cursor, limit)
+    result = db.execute(query)
+    rows = list(result.all() if as_rows else result.scalars().all())
+    return _build_page(rows, keyset, cursor, limit, backwards)
+
+
+async def paginate_async(
+        db: AsyncSession, stmt: Select, keyset: Keyset, *, cursor: Optional[str], limit: int, as_rows: bool = False
+) -> KeysetPage:
+    limit = max(limit, 1)
+    query, backwards = _page_query(stmt, keyset, cursor, limit)
+    result = await db.execute(query)
+    rows = list(result.all() if as_rows else result.scalars().all())
+    return _build_page(rows, keyset, cursor, limit, backwards)
@@ -0,0 +1,122 @@
+# backend/app/db/pool.py
+import threading
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+# Upper bounds (milliseconds) of the checkout wait time histogram buckets
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class PoolStats:
+    """
+    Process-local counters for connection checkouts, waits and connect errors.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.connect_errors = 0
+            self.wait_count = 0
+            self.wait_sum_ms = 0.0
+            self.wait_max_ms = 0.0
+            self.wait_buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def observe_wait(self, wait_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_count += 1
+            self.wait_sum_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            for index, bound in enumerate(WAIT_BUCKETS_MS):
+                if wait_ms <= bound:
+                    self.wait_buckets[index] += 1
+                    break
+            else:
+                self.wait_buckets[-1] += 1
+
+    def observe_connect_error(self) -> None:
+        with self._lock:
+            self.connect_errors += 1
+
+    def histogram(self) -> List[Dict[str, Any]]:
+        """
+        Cumulative wait time histogram, Prometheus style.
+        """
+        buckets = []
+        total = 0
+        labels = [str(bound) for bound in WAIT_BUCKETS_MS] + ["+Inf"]
+        for label, count in zip(labels, self.wait_buckets):
+            total += count
+            buckets.append({"le_ms": label, "count": total})
+        return buckets
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that records how long each checkout waited and failed connects.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.observe_wait((time.perf_counter() - start) * 1000, timed_out=True)
+            raise
+        self.stats.observe_wait((time.perf_counter() - start) * 1000)
+        return connection
+
+    def _create_connection(self):
+        try:
+            return super()._create_connection()
+        except Exception:
+            self.stats.observe_connect_error()
+            raise
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+def pool_status(pool: Any) -> Dict[str, Any]:
+    """
+    Snapshot of a pool's occupancy and, for instrumented pools, its counters.
+    """
+    status: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "max_overflow": pool._max_overflow,
+            "timeout_seconds": pool.timeout(),
+        })
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update({
+            "checkouts": stats.checkouts,
+            "timeouts": stats.timeouts,
+            "connect_errors": stats.connect_errors,
+            "wait_count": stats.wait_count,
+            "wait_sum_ms": round(stats.wait_sum_ms, 3),
+            "wait_max_ms": round(stats.wait_max_ms, 3),
+            "wait_histogram": stats.histogram(),
+        })
+    return status
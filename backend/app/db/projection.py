@@ -0,0 +1,19 @@
+# backend/app/db/projection.py
+from typing import Any, List, Type
+
+from pydantic import BaseModel
+
+
+def project(schema: Type[BaseModel], model: Any, **sources: str) -> List[Any]:
+    """
+    The columns of ``model`` behind each field of a response schema, labelled
+    with the field names and in field order, for selecting plain rows instead
+    of ORM instances. ``sources`` maps fields to differently named attributes.
+
+    Only the schema's fields are selected, so columns it leaves out (password
+    hashes and the like) never reach the row.
+    """
+    return [
+        getattr(model, sources.get(name, name)).label(name)
+        for name in schema.model_fields
+    ]
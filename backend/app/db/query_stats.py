@@ -0,0 +1,163 @@
+# backend/app/db/query_stats.py
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+STATEMENTS_HEADER = "X-DB-Statements"
+TIME_HEADER = "X-DB-Time-Ms"
+REPEATS_HEADER = "X-DB-Max-Repeats"
+
+
+class RepeatedStatementError(RuntimeError):
+    """
+    The same parameterized statement ran more often than the strict limit
+    allows in one unit of work; almost always an N+1 query.
+    """
+
+
+class QueryStats:
+    """
+    Statement count, total database time and per-statement repeat counts
+    for one request (or any block wrapped in ``track_queries``).
+
+    Statements are grouped by their parameterized SQL, so the same query
+    issued for different ids counts as one shape. ``listener``, when set, is
+    called with each statement and its duration in seconds, in the thread
+    that ran it (see app/core/profiling.py).
+    """
+
+    def __init__(self, strict_limit: int = 0):
+        self.strict_limit = strict_limit
+        self.statements = 0
+        self.total_time = 0.0
+        self.shapes: Counter = Counter()
+        self.listener: Optional[Callable[[str, float], None]] = None
+
+    def record(self, statement: str) -> None:
+        self.statements += 1
+        self.shapes[statement] += 1
+        count = self.shapes[statement]
+        if self.strict_limit and count > self.strict_limit:
+            raise RepeatedStatementError(
+                f"Statement ran {count} times (limit {self.strict_limit}): {_shorten(statement)}"
+            )
+
+    @property
+    def total_time_ms(self) -> float:
+        return self.total_time * 1000
+
+    def most_repeated(self) -> Tuple[int, Optional[str]]:
+        if not self.shapes:
+            return 0, None
+        statement, count = self.shapes.most_common(1)[0]
+        return count, statement
+
+    def over_thresholds(self) -> bool:
+        return (
+            self.statements > settings.SQL_LOG_STATEMENTS_THRESHOLD
+            or self.total_time_ms > settings.SQL_LOG_TIME_THRESHOLD_MS
+            or self.most_repeated()[0] > settings.SQL_LOG_REPEAT_THRESHOLD
+        )
+
+    def headers(self) -> Iterator[Tuple[str, str]]:
+        yield STATEMENTS_HEADER, str(self.statements)
+        yield TIME_HEADER, f"{self.total_time_ms:.1f}"
+        yield REPEATS_HEADER, str(self.most_repeated()[0])
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+@contextmanager
+def track_queries(strict_limit: Optional[int] = None) -> Iterator[QueryStats]:
+    """
+    Count the statements executed inside the block, on any engine.
+
+    The stats travel with the context, so work handed to the threadpool
+    (sync endpoints and dependencies) is counted too.
+    """
+    if strict_limit is None:
+        strict_limit = settings.SQL_STRICT_REPEAT_LIMIT
+    stats = QueryStats(strict_limit=strict_limit)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def _shorten(statement: str, length: int = 200) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= length else statement[:length] + "..."
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is not None:
+        context._query_stats_started = time.perf_counter()
+        stats.record(statement)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = getattr(context, "_query_stats_started", None)
+    if stats is not None and started is not None:
+        elapsed = time.perf_counter() - started
+        stats.total_time += elapsed
+        if stats.listener is not None:
+            stats.listener(statement, elapsed)
+
+
+class QueryStatsMiddleware:
+    """
+    Track SQL per request. Adds X-DB-* headers when DEBUG is on and logs
+    requests that exceed the SQL_LOG_* thresholds.
+
+    Statements run after the response has started (e.g. in dependency
+    teardown) are logged but cannot appear in the headers.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_with_headers(message):
+                if message["type"] == "http.response.start" and settings.DEBUG:
+                    headers = list(message.get("headers", []))
+                    headers.extend(
+                        (name.lower().encode("latin-1"), value.encode("latin-1"))
+                        for name, value in stats.headers()
+                    )
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_headers)
+
+        if stats.over_thresholds():
+            repeats, statement = stats.most_repeated()
+            logger.warning(
+                "%s %s ran %d SQL statements in %.1f ms; most repeated (%dx): %s",
+                scope["method"], scope["path"], stats.statements, stats.total_time_ms,
+                repeats, _shorten(statement or ""),
+            )
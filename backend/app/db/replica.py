@@ -0,0 +1,107 @@
+# backend/app/db/replica.py
+import logging
+import threading
+import time
+from typing import Any, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+logger = logging.getLogger(__name__)
+
+# Cookie set on write requests; while present, reads go to the primary
+READ_PRIMARY_COOKIE = "db_read_primary"
+
+# Methods whose handlers must not have side effects
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReplicaHealth:
+    """
+    Cached health of the replica, re-checked at most every ``check_seconds``.
+
+    A replica is unhealthy when it cannot be reached or, on PostgreSQL, when
+    its replay lag exceeds ``max_lag_seconds``.
+    """
+
+    def __init__(self, engine: Engine, check_seconds: int, max_lag_seconds: int):
+        self.engine = engine
+        self.check_seconds = check_seconds
+        self.max_lag_seconds = max_lag_seconds
+        self.healthy = True
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+        event.listen(engine, "handle_error", self._on_error)
+
+    def is_healthy(self) -> bool:
+        if time.monotonic() - self._checked_at >= self.check_seconds:
+            # Only one request pays for the check; the rest use the last result
+            if self._lock.acquire(blocking=False):
+                try:
+                    self.healthy = self._check()
+                    self._checked_at = time.monotonic()
+                finally:
+                    self._lock.release()
+        return self.healthy
+
+    def mark_unhealthy(self) -> None:
+        self.healthy = False
+        self._checked_at = time.monotonic()
+
+    def _on_error(self, context: Any) -> None:
+        # Lost or refused connections take the replica out until the next check
+        if context.is_disconnect or context.connection is None:
+            self.mark_unhealthy()
+
+    def _check(self) -> bool:
+        try:
+            with self.engine.connect() as connection:
+                if self.engine.dialect.name != "postgresql":
+                    connection.execute(text("SELECT 1"))
+                    return True
+                lag = connection.execute(text(
+                    "SELECT EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+                )).scalar()
+        except Exception as e:
+            logger.warning(f"Read replica unavailable: {e}")
+            return False
+        return lag is None or lag <= self.max_lag_seconds
+
+
+class RoutingSession(Session):
+    """
+    Session that sends SELECTs to the replica while ``info["use_replica"]`` is set.
+
+    Flushes, locking reads (FOR UPDATE) and any non-SELECT statement go to
+    the primary, and once the session has flushed all of its later reads go
+    to the primary as well.
+    """
+
+    replica_engine: Optional[Engine] = None
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kw: Any):
+        if (
+                self.replica_engine is not None
+                and self.info.get("use_replica")
+                and not self.info.get("wrote")
+                and not self._flushing
+                and isinstance(clause, Select)
+                and clause._for_update_arg is None
+        ):
+            return self.replica_engine
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_written(session: Session, flush_context: Any) -> None:
+    session.info["wrote"] = True
+
+
+def use_primary(session: Session) -> None:
+    """
+    Send the session's remaining reads to the primary, for a read path that
+    is about to write what it reads (a row built on first use).
+    """
+    session.info["use_replica"] = False
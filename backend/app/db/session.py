@@ -1,19 +1,89 @@
 # backend/app/db/session.py
+import time
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.db.pool import InstrumentedQueuePool
+from app.db.replica import READ_PRIMARY_COOKIE, SAFE_METHODS, ReplicaHealth, RoutingSession
+
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """
+    Pool and connection options for an engine built from settings.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        return {"connect_args": {"check_same_thread": False}}
+
+    options: Dict[str, Any] = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if settings.DB_STATEMENT_TIMEOUT_MS > 0:
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+        }
+    return options
+
 
-engine = create_engine(str(settings.DATABASE_URL))
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_engine(str(settings.DATABASE_URL), **engine_options(str(settings.DATABASE_URL)))
+
+replica_engine = None
+replica_health: Optional[ReplicaHealth] = None
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_engine(
+        settings.DATABASE_REPLICA_URL, **engine_options(settings.DATABASE_REPLICA_URL)
+    )
+    replica_health = ReplicaHealth(
+        replica_engine,
+        check_seconds=settings.REPLICA_HEALTH_CHECK_SECONDS,
+        max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS,
+    )
+RoutingSession.replica_engine = replica_engine
+
+# Objects keep their state across commit: writes read server values back
+# with RETURNING (see base_class.py), so no refresh SELECT is needed
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine, class_=RoutingSession
+)
 
 Base = declarative_base()
 
-# Dependency to get DB session
-def get_db():
+
+def use_replica(request: Request) -> bool:
+    """
+    Whether this request's reads may be served by the replica.
+    """
+    if replica_health is None or request.method not in SAFE_METHODS:
+        return False
+    sticky_until = request.cookies.get(READ_PRIMARY_COOKIE)
+    if sticky_until and sticky_until.isdigit() and int(sticky_until) > time.time():
+        return False
+    return replica_health.is_healthy()
+
+
+# Dependency to get DB session. Side-effect-free requests read from the
+# replica when one is configured and healthy; everything else uses the primary.
+def get_db(request: Request, response: Response):
     db = SessionLocal()
+    db.info["use_replica"] = use_replica(request)
+    if replica_health is not None and request.method not in SAFE_METHODS:
+        # Keep this client's next reads on the primary so it sees its own write
+        sticky_until = int(time.time()) + settings.REPLICA_READ_YOUR_WRITES_SECONDS
+        response.set_cookie(
+            READ_PRIMARY_COOKIE, str(sticky_until),
+            max_age=settings.REPLICA_READ_YOUR_WRITES_SECONDS, httponly=True, samesite="lax",
+        )
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
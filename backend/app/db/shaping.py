@@ -0,0 +1,133 @@
+# backend/app/db/shaping.py
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel
+from sqlalchemy.orm import load_only, selectinload
+
+
+class ShapeError(ValueError):
+    """
+    An ``expand`` or ``fields`` value that does not fit the response tree.
+    """
+
+
+class ShapeLevel:
+    """
+    One level of a nested response: the scalar fields of its schema, the
+    model attributes behind them, and the child level embedded under the
+    relationship of the same name.
+
+    ``sources`` maps fields to differently named attributes (as in
+    ``project``); ``order_by`` names the attributes children are listed by,
+    which are always loaded.
+    """
+
+    def __init__(
+            self, schema: Type[BaseModel], model: Any, *, sources: Optional[Dict[str, str]] = None,
+            order_by: Sequence[str] = ("id",), relationship: Optional[str] = None,
+            child: Optional["ShapeLevel"] = None,
+    ):
+        self.model = model
+        self.relationship = relationship
+        self.child = child
+        self.order_by = tuple(order_by)
+        sources = sources or {}
+        self.fields = {
+            name: sources.get(name, name) for name in schema.model_fields if name != relationship
+        }
+
+    def paths(self) -> List[str]:
+        """
+        Valid ``expand`` values below this level, shallowest first.
+        """
+        if self.child is None:
+            return []
+        return [self.relationship, *(f"{self.relationship}.{path}" for path in self.child.paths())]
+
+
+class Shape:
+    """
+    Which levels of a response tree to embed and which fields to keep at
+    each, as loader options and a serializer.
+
+    Each expanded level costs one ``selectinload`` query whatever the page
+    size, and only the selected columns (plus keys and sort columns) are read.
+    """
+
+    def __init__(self, levels: List[Tuple[ShapeLevel, List[str]]]):
+        self.levels = levels
+        self.key = "|".join(",".join(names) for _, names in levels)
+
+    def options(self) -> List[Any]:
+        options: List[Any] = []
+        loader = None
+        parent = None
+        for level, names in self.levels:
+            # Attributes backed by another column (content_store.ContentAttribute) load that one
+            attributes = [getattr(level.model, level.fields[name]) for name in names]
+            columns = [getattr(attribute, "column", attribute) for attribute in attributes]
+            columns += [getattr(level.model, name) for name in level.order_by]
+            if parent is not None:
+                # The foreign key back to the parent, which selectinload matches on
+                relationship = getattr(parent.model, parent.relationship)
+                columns += [getattr(level.model, column.key) for column in relationship.property.remote_side]
+                loader = (loader.selectinload if loader is not None else selectinload)(relationship)
+                loader = loader.load_only(*columns)
+            else:
+                options.append(load_only(*columns))
+            parent = level
+        if loader is not None:
+            options.append(loader)
+        return options
+
+    def dump(self, obj: Any, depth: int = 0) -> Dict[str, Any]:
+        level, names = self.levels[depth]
+        data = {name: getattr(obj, level.fields[name]) for name in names}
+        if depth + 1 < len(self.levels):
+            child = self.levels[depth + 1][0]
+            children = sorted(
+                getattr(obj, level.relationship),
+                key=lambda item: tuple(getattr(item, name) or 0 for name in child.order_by),
+            )
+            data[level.relationship] = [self.dump(item, depth + 1) for item in children]
+        return data
+
+
+def parse_shape(root: ShapeLevel, expand: Optional[str], fields: Optional[str]) -> Optional[Shape]:
+    """
+    The shape asked for by ``expand`` (``none`` or a dotted relationship
+    path) and ``fields`` (comma separated, dotted below the root, e.g.
+    ``title,modules.title``). Fields below the root imply their expansion;
+    levels without listed fields keep all of them, and ``id`` is always
+    kept. None when neither is given, i.e. the full default representation.
+    """
+    if expand is None and fields is None:
+        return None
+
+    levels = [root]
+    while levels[-1].child is not None:
+        levels.append(levels[-1].child)
+    prefixes = [""] + [path + "." for path in root.paths()]
+
+    depth = 0
+    if expand not in (None, "", "none"):
+        if expand not in root.paths():
+            raise ShapeError(f"expand must be one of: none, {', '.join(root.paths())}")
+        depth = root.paths().index(expand) + 1
+
+    requested: List[List[str]] = [[] for _ in levels]
+    for path in filter(None, (part.strip() for part in (fields or "").split(","))):
+        # The longest matching prefix names the level
+        index = max(i for i, prefix in enumerate(prefixes) if path.startswith(prefix))
+        name = path[len(prefixes[index]):]
+        if name not in levels[index].fields:
+            raise ShapeError(f"Unknown field: {path}")
+        if name not in requested[index]:
+            requested[index].append(name)
+        depth = max(depth, index)
+
+    shape_levels = []
+    for level, names in zip(levels[:depth + 1], requested):
+        names = ["id", *(name for name in names if name != "id")] if names else list(level.fields)
+        shape_levels.append((level, names))
+    return Shape(shape_levels)
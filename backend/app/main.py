@@ -1,18 +1,27 @@
 # backend/app/main.py
-from fastapi import FastAPI, Depends
+import anyio.to_thread
+from fastapi import FastAPI, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.api import api_router
+from app.core import metrics
+from app.core.compression import CompressionMiddleware
+from app.core.profiling import ProfilingMiddleware
 from app.core.config import settings
+from app.core.rendering import shutdown_render_pool
+from app.core.security import shutdown_hash_pool
 from app.db.session import engine
-from app.db.base import Base
+from app.db.async_session import dispose_async_engine
 from app.db.init_db import init_db
+from app.db.migrations import verify_schema_revision
+from app.db.query_stats import QueryStatsMiddleware
 
 # Create FastAPI app
 app = FastAPI(
     title="CyberEd Pro",
     description="Cybersecurity Learning Management System",
     version="0.1.0",
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    dependencies=[Depends(metrics.track_in_progress)],
 )
 
 # Configure CORS
@@ -24,29 +33,91 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip / brotli for large JSON bodies, precompressed per ETag
+app.add_middleware(CompressionMiddleware)
+
+# Per-route Prometheus metrics; inside QueryStatsMiddleware to read its SQL counts
+if metrics.enabled():
+    app.add_middleware(metrics.MetricsMiddleware)
+
+# Admin-triggered per-request profiles; inside QueryStatsMiddleware to time their SQL
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# Count SQL statements per request (headers in DEBUG, logs over thresholds)
+app.add_middleware(QueryStatsMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 # Basic health check endpoint
 @app.get("/")
-def read_root():
+async def read_root():
     return {"status": "healthy", "message": "Welcome to CyberEd Pro API"}
 
 # Create a simple ping endpoint for testing
 @app.get("/ping")
-def ping():
+async def ping():
     return {"ping": "pong"}
 
+if metrics.enabled():
+    @app.get(metrics.METRICS_PATH, include_in_schema=False)
+    def read_metrics():
+        # Sync: in multiprocess mode this reads every worker's metric files
+        body, content_type = metrics.render()
+        return Response(body, media_type=content_type)
+
 @app.on_event("startup")
 def startup_db_client():
     """
-    Initialize the database with initial data if needed
+    Check the database schema according to DB_STARTUP_MODE
+    """
+    if settings.DB_STARTUP_MODE == "create":
+        try:
+            # Create tables and initial data (local development only)
+            init_db()
+        except Exception as e:
+            print(f"Database initialization error: {e}")
+    elif settings.DB_STARTUP_MODE == "verify":
+        # Migrations and seeding are one-shot deploy steps, not per-worker boot work
+        verify_schema_revision(engine)
+
+@app.on_event("startup")
+async def configure_threadpool():
+    """
+    Size the threadpool that runs sync routes and dependencies
+    """
+    # Must run on the event loop: the limiter is per loop
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_TOKENS
+
+@app.on_event("shutdown")
+def shutdown_password_hashing():
+    """
+    Stop the password hashing worker processes
+    """
+    shutdown_hash_pool()
+
+@app.on_event("shutdown")
+def shutdown_lesson_rendering():
+    """
+    Stop the lesson render worker processes
+    """
+    shutdown_render_pool()
+
+@app.on_event("shutdown")
+def shutdown_metrics():
+    """
+    Remove this worker's live gauges from the shared metrics files
+    """
+    if metrics.enabled():
+        metrics.mark_worker_dead()
+
+@app.on_event("shutdown")
+async def shutdown_async_engine():
+    """
+    Close the async engine's connections
     """
-    try:
-        # Create tables and initial data
-        init_db()
-    except Exception as e:
-        print(f"Database initialization error: {e}")
+    await dispose_async_engine()
 
 # API endpoints based on the project requirements
 # These endpoints are organized in the api_router which is included above,
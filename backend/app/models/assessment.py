@@ -1,6 +1,6 @@
 # backend/app/models/assessment.py
-from sqlalchemy import Boolean, Column, Integer, String, Text, DateTime, ForeignKey, Float
-from sqlalchemy.sql import func
+from sqlalchemy import Boolean, Column, Integer, String, Text, DateTime, ForeignKey, Float, Index
+from sqlalchemy.sql import func, null
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base  # Changed from app.db.base import Base
@@ -9,15 +9,15 @@ class Assessment(Base):
     __tablename__ = "assessments"
 
     id = Column(Integer, primary_key=True, index=True)
-    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
-    module_id = Column(Integer, ForeignKey("modules.id"), nullable=True)
+    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False, index=True)
+    module_id = Column(Integer, ForeignKey("modules.id"), nullable=True, index=True)
     title = Column(String, nullable=False)
     description = Column(Text, nullable=True)
     time_limit_minutes = Column(Integer, nullable=True)
     passing_score = Column(Float, nullable=False, default=70.0)
     is_published = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), default=null(), onupdate=func.now())
 
     # Relationships
     course = relationship("Course", backref="assessments")
@@ -28,12 +28,12 @@ class Question(Base):
     __tablename__ = "questions"
 
     id = Column(Integer, primary_key=True, index=True)
-    assessment_id = Column(Integer, ForeignKey("assessments.id"), nullable=False)
+    assessment_id = Column(Integer, ForeignKey("assessments.id"), nullable=False, index=True)
     question_text = Column(Text, nullable=False)
     question_type = Column(String, nullable=False)  # mcq, true_false, short_answer
     points = Column(Float, nullable=False, default=1.0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), default=null(), onupdate=func.now())
 
     # Relationships
     assessment = relationship("Assessment", back_populates="questions")
@@ -43,12 +43,12 @@ class Answer(Base):
     __tablename__ = "answers"
 
     id = Column(Integer, primary_key=True, index=True)
-    question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
+    question_id = Column(Integer, ForeignKey("questions.id"), nullable=False, index=True)
     answer_text = Column(Text, nullable=False)
     is_correct = Column(Boolean, nullable=False, default=False)
     explanation = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), default=null(), onupdate=func.now())
 
     # Relationships
     question = relationship("Question", back_populates="answers")
@@ -58,7 +58,7 @@ class UserAssessment(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    assessment_id = Column(Integer, ForeignKey("assessments.id"), nullable=False)
+    assessment_id = Column(Integer, ForeignKey("assessments.id"), nullable=False, index=True)
     score = Column(Float, nullable=True)
     start_time = Column(DateTime(timezone=True), server_default=func.now())
     end_time = Column(DateTime(timezone=True), nullable=True)
@@ -69,12 +69,17 @@ class UserAssessment(Base):
     assessment = relationship("Assessment", backref="user_assessments")
     answers = relationship("UserAnswer", back_populates="user_assessment", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # start_assessment looks up a user's in-progress attempt
+        Index("ix_user_assessments_user_id_assessment_id_status", "user_id", "assessment_id", "status"),
+    )
+
 class UserAnswer(Base):
     __tablename__ = "user_answers"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_assessment_id = Column(Integer, ForeignKey("user_assessments.id"), nullable=False)
-    question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
+    user_assessment_id = Column(Integer, ForeignKey("user_assessments.id"), nullable=False, index=True)
+    question_id = Column(Integer, ForeignKey("questions.id"), nullable=False, index=True)
     answer_id = Column(Integer, ForeignKey("answers.id"), nullable=True)
     text_answer = Column(Text, nullable=True)
     is_correct = Column(Boolean, nullable=True)
@@ -0,0 +1,22 @@
+# backend/app/models/content.py
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary
+from sqlalchemy.sql import func
+
+from app.db.base_class import Base
+
+
+class ContentBlob(Base):
+    """
+    A lesson or module body, stored once per distinct text and addressed by
+    its hash (see app/db/content_store.py). Rows are immutable.
+    """
+    __tablename__ = "content_blobs"
+
+    hash = Column(String(64), primary_key=True)  # SHA-256 of the UTF-8 text, hex
+    encoding = Column(String(16), nullable=False)  # "zlib" or "identity"
+    size = Column(Integer, nullable=False)  # uncompressed bytes
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<ContentBlob(hash='{self.hash[:12]}', size={self.size})>"
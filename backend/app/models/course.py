@@ -1,8 +1,9 @@
 # backend/app/models/course.py (updated)
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Index, JSON, event
+from sqlalchemy.sql import func, null
 from sqlalchemy.orm import relationship
 
+from app.db import content_store, fulltext
 from app.db.base_class import Base
 
 
@@ -13,12 +14,12 @@ class Course(Base):
     title = Column(String, nullable=False)
     description = Column(Text, nullable=True)
     creator_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    certification_type = Column(String, nullable=True)  # Security+, CEH, CISSP, etc.
-    difficulty_level = Column(String, nullable=False, default='beginner')
+    certification_type = Column(String, nullable=True, index=True)  # Security+, CEH, CISSP, etc.
+    difficulty_level = Column(String, nullable=False, default='beginner', index=True)
     estimated_duration = Column(Integer, nullable=True)  # in hours
     is_published = Column(Boolean, default=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), default=null(), onupdate=func.now())
 
     # Relationships
     instructor = relationship("User", backref="courses", foreign_keys=[creator_id])
@@ -37,16 +38,23 @@ class Module(Base):
     description = Column(Text, nullable=True)
     course_id = Column(Integer, ForeignKey("courses.id"), nullable=False, index=True)
     order_index = Column(Integer, nullable=False, default=0)  # For ordering modules within a course
-    content = Column(Text, nullable=True)  # Module content/materials
+    # Module content/materials, stored by hash (see app/db/content_store.py)
+    content_hash = Column(String(64), ForeignKey("content_blobs.hash"), nullable=True)
+    content = content_store.ContentAttribute("content_hash")
     estimated_duration = Column(Integer, nullable=True)  # in minutes
     is_published = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), default=null(), onupdate=func.now())
 
     # Relationships
     course = relationship("Course", back_populates="modules")
     lessons = relationship("Lesson", back_populates="module", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Modules are always listed per course in order
+        Index("ix_modules_course_id_order_index", "course_id", "order_index"),
+    )
+
     def __repr__(self):
         return f"<Module(id={self.id}, title='{self.title}', course_id={self.course_id})>"
 
@@ -56,16 +64,131 @@ class Lesson(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
-    content = Column(Text, nullable=False)
+    # The body, stored by hash (see app/db/content_store.py)
+    content_hash = Column(String(64), ForeignKey("content_blobs.hash"), nullable=False)
+    content = content_store.ContentAttribute("content_hash")
     module_id = Column(Integer, ForeignKey("modules.id"), nullable=False, index=True)
     order = Column(Integer, nullable=False, default=0)  # For ordering lessons within a module
     estimated_time_minutes = Column(Integer, nullable=True)
     is_published = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), default=null(), onupdate=func.now())
 
     # Relationships
     module = relationship("Module", back_populates="lessons")
 
+    __table_args__ = (
+        # Lessons are always listed per module in order
+        Index("ix_lessons_module_id_order", "module_id", "order"),
+    )
+
     def __repr__(self):
         return f"<Lesson(id={self.id}, title='{self.title}', module_id={self.module_id})>"
+
+
+class RenderedContent(Base):
+    """
+    The rendered form of a lesson body (see app/services/render_service.py),
+    keyed by the body's hash: lessons with the same body share one render.
+    """
+    __tablename__ = "rendered_contents"
+
+    content_hash = Column(String(64), ForeignKey("content_blobs.hash", ondelete="CASCADE"), primary_key=True)
+    renderer_version = Column(Integer, nullable=False)  # app.core.rendering.RENDERER_VERSION
+    # The sanitized HTML is itself a blob, so it is compressed and cached like bodies
+    html_hash = Column(String(64), ForeignKey("content_blobs.hash"), nullable=False)
+    html = content_store.ContentAttribute("html_hash")
+    toc = Column(JSON, nullable=False)  # [{"level", "id", "title"}] of the headings
+    word_count = Column(Integer, nullable=False)
+    reading_time_minutes = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<RenderedContent(content_hash='{self.content_hash[:12]}', version={self.renderer_version})>"
+
+
+content_store.derived_from(RenderedContent.content_hash)
+
+
+class CourseOutline(Base):
+    """
+    Denormalized, pre-serialized course tree (see app/services/outline_service.py).
+
+    ``header`` is the course as JSON without its modules and ``modules`` the
+    ordered modules with their lessons, so a write patches only its part.
+    ``version`` is bumped by every patch and identifies the representation.
+    """
+    __tablename__ = "course_outlines"
+
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    is_published = Column(Boolean, nullable=False, default=False)  # copy of the course's, for listings
+    # Copies of the course's filterable columns, so filtered listings stay on this table
+    certification_type = Column(String, nullable=True)
+    difficulty_level = Column(String, nullable=True)
+    estimated_duration = Column(Integer, nullable=True)
+    version = Column(Integer, nullable=False, default=1)
+    header = Column(Text, nullable=False)
+    modules = Column(Text, nullable=False, default="[]")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # The catalog lists published outlines in course id order
+        Index("ix_course_outlines_is_published_course_id", "is_published", "course_id"),
+        # ... optionally filtered by certification (and difficulty), or by difficulty alone
+        Index(
+            "ix_course_outlines_certification", "is_published", "certification_type", "difficulty_level", "course_id"
+        ),
+        Index("ix_course_outlines_difficulty", "is_published", "difficulty_level", "course_id"),
+    )
+
+    def __repr__(self):
+        return f"<CourseOutline(course_id={self.course_id}, version={self.version})>"
+
+
+class CourseFacetCount(Base):
+    """
+    Number of courses per value of a catalog facet (see app/services/facet_service.py),
+    maintained by the course writers rather than counted per request.
+    """
+    __tablename__ = "course_facet_counts"
+
+    facet = Column(String(32), primary_key=True)  # certification_type or difficulty_level
+    value = Column(String, primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    published = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<CourseFacetCount(facet='{self.facet}', value='{self.value}', total={self.total})>"
+
+
+class SearchDocument(Base):
+    """
+    Searchable text of one course, module or lesson (see app/services/search_service.py).
+
+    Kept current by the same writers as the outlines. The full-text index
+    over ``title`` and ``body`` is backend specific and maintained by the
+    database itself (see app/db/fulltext.py), so it is not mapped here.
+    """
+    __tablename__ = "search_documents"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(16), nullable=False)  # course, module or lesson
+    object_id = Column(Integer, nullable=False)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False, index=True)
+    module_id = Column(Integer, nullable=True, index=True)  # modules and lessons
+    title = Column(String, nullable=False)
+    body = Column(Text, nullable=False, default="")
+    is_published = Column(Boolean, nullable=False, default=False)
+    course_published = Column(Boolean, nullable=False, default=False)  # copy of the course's, for students
+    module_published = Column(Boolean, nullable=False, default=True)  # copy of the module's; true for courses
+
+    __table_args__ = (
+        Index("ix_search_documents_kind_object_id", "kind", "object_id", unique=True),
+    )
+
+    def __repr__(self):
+        return f"<SearchDocument(kind='{self.kind}', object_id={self.object_id})>"
+
+
+event.listen(SearchDocument.__table__, "after_create", fulltext.create_index)
+event.listen(SearchDocument.__table__, "before_drop", fulltext.drop_index)
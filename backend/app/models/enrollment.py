@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Float, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -9,12 +9,17 @@ class Enrollment(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
-    status = Column(String, nullable=False, default="active")  # active, completed, withdrawn
+    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False, index=True)
+    status = Column(String, nullable=False, default="active", index=True)  # active, completed, withdrawn
     progress = Column(Float, nullable=False, default=0.0)  # 0 to 100 percent
     enrolled_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
 
     # Relationships
     user = relationship("User", backref="enrollments")
-    course = relationship("Course", backref="enrollments")
\ No newline at end of file
+    course = relationship("Course", backref="enrollments")
+
+    __table_args__ = (
+        # A user can only be enrolled once in a course; also serves user_id lookups
+        UniqueConstraint("user_id", "course_id", name="uq_enrollments_user_id_course_id"),
+    )
\ No newline at end of file
@@ -1,5 +1,5 @@
 # backend/app/models/progress.py
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, Boolean, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 
@@ -10,7 +10,7 @@ class LessonCompletion(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    lesson_id = Column(Integer, ForeignKey("lessons.id"), nullable=False)
+    lesson_id = Column(Integer, ForeignKey("lessons.id"), nullable=False, index=True)
     notes = Column(Text, nullable=True)
     completion_percentage = Column(Integer, default=100, nullable=False)
     completed_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -21,6 +21,7 @@ class LessonCompletion(Base):
 
     __table_args__ = (
         # Ensure a user can only have one completion record per lesson
+        UniqueConstraint("user_id", "lesson_id", name="uq_lesson_completions_user_id_lesson_id"),
         {"sqlite_autoincrement": True},
     )
 
@@ -38,4 +39,8 @@ class AssessmentAttempt(Base):
 
     # Relationships
     user = relationship("User", backref="assessment_attempts")
-    assessment = relationship("Assessment", backref="attempts")
\ No newline at end of file
+    assessment = relationship("Assessment", backref="attempts")
+
+    __table_args__ = (
+        Index("ix_assessment_attempts_user_id_assessment_id", "user_id", "assessment_id"),
+    )
\ No newline at end of file
@@ -1,6 +1,6 @@
 # backend/app/models/user.py
 from sqlalchemy import Boolean, Column, Integer, String, DateTime
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, null
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
@@ -15,8 +15,10 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     role = Column(String, nullable=False, default="student")  # student, instructor, admin
     is_active = Column(Boolean, default=True)
+    # Bumped whenever role, active flag or password change; invalidates issued tokens
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    updated_at = Column(DateTime(timezone=True), default=null(), onupdate=func.now())
 
     # Relationships
     forum_topics = relationship("ForumTopic", back_populates="user")
@@ -0,0 +1,42 @@
+# backend/app/schemas/admin.py
+from typing import List, Optional
+from pydantic import BaseModel
+
+class PoolWaitBucket(BaseModel):
+    le_ms: str
+    count: int
+
+class PoolStatsResponse(BaseModel):
+    pool_class: str
+    size: Optional[int] = None
+    checked_in: Optional[int] = None
+    checked_out: Optional[int] = None
+    overflow: Optional[int] = None
+    max_overflow: Optional[int] = None
+    timeout_seconds: Optional[float] = None
+    checkouts: Optional[int] = None
+    timeouts: Optional[int] = None
+    connect_errors: Optional[int] = None
+    wait_count: Optional[int] = None
+    wait_sum_ms: Optional[float] = None
+    wait_max_ms: Optional[float] = None
+    wait_histogram: List[PoolWaitBucket] = []
+
+class CacheStatsResponse(BaseModel):
+    backend: str
+    hits: int
+    misses: int
+    hit_ratio: Optional[float] = None
+    sets: int
+    stale_sets_skipped: int
+    stale_hits: int  # stale entries served while another request refreshed them
+    coalesced: int  # misses that waited for another request's computation
+    rejected: int = 0  # entries whose signature did not match, served as misses
+    entries: Optional[int] = None  # unknown for the redis backend
+    evictions: Optional[int] = None  # server-wide for the redis backend
+    expirations: Optional[int] = None
+
+
+class ProfileTokenResponse(BaseModel):
+    token: str  # send as the X-Profile header or the _profile query parameter
+    expires_at: int  # epoch seconds
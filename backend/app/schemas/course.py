@@ -1,14 +1,14 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, Field
 
 
 # Lesson schemas
 class LessonBase(BaseModel):
     title: str
-    content_type: str
     content: str
-    order_index: int
+    order: Optional[int] = None
+    estimated_time_minutes: Optional[int] = None
 
 
 class LessonCreate(LessonBase):
@@ -17,14 +17,14 @@ class LessonCreate(LessonBase):
 
 class LessonUpdate(LessonBase):
     title: Optional[str] = None
-    content_type: Optional[str] = None
     content: Optional[str] = None
-    order_index: Optional[int] = None
+    is_published: Optional[bool] = None
 
 
 class LessonResponse(LessonBase):
     id: int
     module_id: int
+    is_published: bool = False
     created_at: datetime
     updated_at: Optional[datetime] = None
 
@@ -32,6 +32,44 @@ class LessonResponse(LessonBase):
         from_attributes = True  # Previously from_attributes
 
 
+# A lesson as listed in a course (the outline): everything but the body,
+# which is served by GET /courses/lessons/{id}
+class LessonSummary(BaseModel):
+    id: int
+    module_id: int
+    title: str
+    order: Optional[int] = None
+    estimated_time_minutes: Optional[int] = None
+    is_published: bool = False
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class TocEntry(BaseModel):
+    level: int
+    id: str  # anchor of the heading in html
+    title: str
+
+
+# GET /courses/lessons/{id}: the body pre-rendered (see app/services/render_service.py)
+class RenderedLessonResponse(BaseModel):
+    id: int
+    module_id: int
+    title: str
+    order: Optional[int] = None
+    estimated_time_minutes: Optional[int] = None
+    is_published: bool = False
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    html: str  # sanitized
+    toc: List[TocEntry] = []
+    word_count: int
+    reading_time_minutes: int
+
+
 # Module schemas
 class ModuleBase(BaseModel):
     title: str
@@ -40,7 +78,8 @@ class ModuleBase(BaseModel):
 
 
 class ModuleCreate(ModuleBase):
-    pass
+    content: Optional[str] = None
+    estimated_duration: Optional[int] = None
 
 
 class ModuleUpdate(ModuleBase):
@@ -51,6 +90,9 @@ class ModuleUpdate(ModuleBase):
 class ModuleResponse(ModuleBase):
     id: int
     course_id: int
+    content: Optional[str] = None
+    estimated_duration: Optional[int] = None
+    is_published: bool = False
     created_at: datetime
     updated_at: Optional[datetime] = None
     lessons: List[LessonResponse] = []
@@ -59,6 +101,20 @@ class ModuleResponse(ModuleBase):
         from_attributes = True  # Previously from_attributes
 
 
+# A module as listed in a course: its lessons summarized, no body
+class ModuleSummary(ModuleBase):
+    id: int
+    course_id: int
+    estimated_duration: Optional[int] = None
+    is_published: bool = False
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    lessons: List[LessonSummary] = []
+
+    class Config:
+        from_attributes = True
+
+
 # Course schemas
 class CourseBase(BaseModel):
     title: str
@@ -81,15 +137,30 @@ class CourseUpdate(CourseBase):
 
 class CourseResponse(CourseBase):
     id: int
-    instructor_id: int
+    # Stored as Course.creator_id; exposed under the name clients already use
+    instructor_id: int = Field(validation_alias=AliasChoices("instructor_id", "creator_id"))
     created_at: datetime
     updated_at: Optional[datetime] = None
-    modules: List[ModuleResponse] = []
+    modules: List[ModuleSummary] = []
 
     class Config:
         from_attributes = True  # Previously from_attributes
 
 
+class CourseFacets(BaseModel):
+    # value -> number of courses (published ones for students)
+    certification_type: Dict[str, int] = {}
+    difficulty_level: Dict[str, int] = {}
+
+
+# GET /courses/?facets=true
+class FacetedCoursePage(BaseModel):
+    items: List[CourseResponse]
+    next_cursor: Optional[str] = None  # with cursor paging
+    prev_cursor: Optional[str] = None
+    facets: CourseFacets
+
+
 # Full course details schema for nested display
 class CourseDetailResponse(CourseResponse):
     modules: List[ModuleResponse] = []
@@ -0,0 +1,13 @@
+# backend/app/schemas/pagination.py
+from typing import Generic, List, Optional, TypeVar
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+class CursorPage(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None  # pass as ?cursor= to get the following page
+    prev_cursor: Optional[str] = None
+
+    class Config:
+        from_attributes = True
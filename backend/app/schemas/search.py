@@ -0,0 +1,12 @@
+# backend/app/schemas/search.py
+from typing import Literal, Optional
+from pydantic import BaseModel
+
+class SearchHit(BaseModel):
+    kind: Literal["course", "module", "lesson"]
+    id: int
+    course_id: int
+    module_id: Optional[int] = None  # modules and lessons
+    title: str  # HTML-escaped, matched words wrapped in <mark>
+    snippet: str  # the best-matching passages of the body, marked up the same way
+    rank: float
@@ -7,4 +7,8 @@ class Token(BaseModel):
     token_type: str
 
 class TokenPayload(BaseModel):
-    sub: Optional[int] = None
\ No newline at end of file
+    sub: Optional[int] = None
+    # Authorization claims; absent on tokens issued before they were embedded
+    role: Optional[str] = None
+    is_active: Optional[bool] = None
+    token_version: Optional[int] = None
\ No newline at end of file
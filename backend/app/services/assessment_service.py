@@ -1,24 +1,88 @@
 # backend/app/services/assessment_service.py
 from typing import List, Optional, Dict, Any, Union
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy import distinct, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from fastapi import HTTPException
 
+from app.core.http_cache import ResourceVersion
+from app.db.pagination import Keyset, KeysetPage, paginate, paginate_async
 from app.models.assessment import Assessment, Question, Answer, UserAssessment, UserAnswer
 from app.schemas.assessment import AssessmentCreate, AssessmentUpdate
 
+ASSESSMENT_KEYSET = Keyset("assessments", Assessment.id)
+
+def _with_questions():
+    return selectinload(Assessment.questions).selectinload(Question.answers)
+
 def get(db: Session, assessment_id: int) -> Optional[Assessment]:
     return db.query(Assessment).filter(Assessment.id == assessment_id).first()
 
+def get_with_questions(db: Session, assessment_id: int) -> Optional[Assessment]:
+    return db.query(Assessment).options(_with_questions()).filter(Assessment.id == assessment_id).first()
+
+def _changed_at(model: Any) -> Any:
+    return func.coalesce(model.updated_at, model.created_at)
+
+def get_version(
+        db: Session, assessment_id: int, *, published_only: bool = False
+) -> Optional[ResourceVersion]:
+    """
+    Version of an assessment with its questions and answers, from one
+    aggregate query (see course_service.get_course_version).
+    """
+    query = (
+        select(
+            _changed_at(Assessment),
+            func.count(distinct(Question.id)), func.max(Question.id), func.max(_changed_at(Question)),
+            func.count(Answer.id), func.max(Answer.id), func.max(_changed_at(Answer)),
+        )
+        .select_from(Assessment)
+        .outerjoin(Question, Question.assessment_id == Assessment.id)
+        .outerjoin(Answer, Answer.question_id == Question.id)
+        .where(Assessment.id == assessment_id)
+        .group_by(Assessment.id)
+    )
+    if published_only:
+        query = query.where(Assessment.is_published == True)
+    row = db.execute(query).first()
+    return ResourceVersion("assessment", (assessment_id, *row)) if row else None
+
+def get_multi(
+        db: Session, *, skip: int = 0, limit: int = 100, published_only: bool = False
+) -> List[Assessment]:
+    query = db.query(Assessment).options(_with_questions())
+    if published_only:
+        query = query.filter(Assessment.is_published == True)
+    return query.order_by(Assessment.id).offset(skip).limit(limit).all()
+
+def get_published_assessments(db: Session, *, skip: int = 0, limit: int = 100) -> List[Assessment]:
+    return get_multi(db, skip=skip, limit=limit, published_only=True)
+
 def get_multi_by_course(
         db: Session, *, course_id: int, skip: int = 0, limit: int = 100
 ) -> List[Assessment]:
-    return db.query(Assessment).filter(
+    return db.query(Assessment).options(_with_questions()).filter(
         Assessment.course_id == course_id
-    ).offset(skip).limit(limit).all()
+    ).order_by(Assessment.id).offset(skip).limit(limit).all()
 
-def create(db: Session, *, obj_in: AssessmentCreate) -> Assessment:
-    db_obj = Assessment(
+def get_page(
+        db: Session, *, cursor: Optional[str] = None, limit: int = 100, published_only: bool = False
+) -> KeysetPage:
+    query = select(Assessment).options(_with_questions())
+    if published_only:
+        query = query.where(Assessment.is_published == True)
+    return paginate(db, query, ASSESSMENT_KEYSET, cursor=cursor, limit=limit)
+
+def get_page_by_course(
+        db: Session, *, course_id: int, cursor: Optional[str] = None, limit: int = 100
+) -> KeysetPage:
+    query = select(Assessment).options(_with_questions()).where(Assessment.course_id == course_id)
+    return paginate(db, query, ASSESSMENT_KEYSET, cursor=cursor, limit=limit)
+
+def _build_assessment(obj_in: AssessmentCreate) -> Assessment:
+    return Assessment(
         course_id=obj_in.course_id,
         module_id=obj_in.module_id,
         title=obj_in.title,
@@ -27,14 +91,10 @@ def create(db: Session, *, obj_in: AssessmentCreate) -> Assessment:
         passing_score=obj_in.passing_score,
         is_published=obj_in.is_published,
     )
-    db.add(db_obj)
-    db.commit()
-    db.refresh(db_obj)
-    return db_obj
 
-def update(
-        db: Session, *, db_obj: Assessment, obj_in: Union[AssessmentUpdate, Dict[str, Any]]
-) -> Assessment:
+def _apply_update(
+        db_obj: Assessment, obj_in: Union[AssessmentUpdate, Dict[str, Any]]
+) -> None:
     if isinstance(obj_in, dict):
         update_data = obj_in
     else:
@@ -43,6 +103,18 @@ def update(
     for field in update_data:
         setattr(db_obj, field, update_data[field])
 
+def create(db: Session, *, obj_in: AssessmentCreate) -> Assessment:
+    db_obj = _build_assessment(obj_in)
+    db.add(db_obj)
+    db.commit()
+    db.refresh(db_obj)
+    return db_obj
+
+def update(
+        db: Session, *, db_obj: Assessment, obj_in: Union[AssessmentUpdate, Dict[str, Any]]
+) -> Assessment:
+    _apply_update(db_obj, obj_in)
+
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
@@ -90,16 +162,35 @@ def submit_assessment(
     if user_assessment.status == "completed":
         raise HTTPException(status_code=400, detail="Assessment already submitted")
 
-    # Get the assessment and its questions
-    assessment = db.query(Assessment).get(user_assessment.assessment_id)
-    questions = db.query(Question).filter(Question.assessment_id == assessment.id).all()
+    # Get the questions and every selected answer option in one query each
+    questions = db.query(Question).filter(Question.assessment_id == user_assessment.assessment_id).all()
+    answer_ids = {a.get("answer_id") for a in answers if a.get("answer_id")}
+    answers_by_id = {}
+    if answer_ids:
+        answers_by_id = {
+            answer.id: answer for answer in db.query(Answer).filter(Answer.id.in_(answer_ids)).all()
+        }
 
-    # Create a dictionary of questions by ID for easy lookup
-    questions_dict = {q.id: q for q in questions}
+    db.add_all(_grade_answers(user_assessment, questions, answers_by_id, answers))
+
+    db.commit()
+    db.refresh(user_assessment)
+    return user_assessment
 
-    # Process user answers
+def _grade_answers(
+        user_assessment: UserAssessment,
+        questions: List[Question],
+        answers_by_id: Dict[int, Answer],
+        answers: List[Dict],
+) -> List[UserAnswer]:
+    """
+    Grade submitted answers against preloaded questions and answer options,
+    updating the user assessment in place.
+    """
+    questions_dict = {q.id: q for q in questions}
     total_points = 0
     earned_points = 0
+    user_answers = []
 
     for answer_data in answers:
         question_id = answer_data.get("question_id")
@@ -112,7 +203,6 @@ def submit_assessment(
         question = questions_dict[question_id]
         total_points += question.points
 
-        # Create user answer record
         user_answer = UserAnswer(
             user_assessment_id=user_assessment.id,
             question_id=question_id,
@@ -122,24 +212,124 @@ def submit_assessment(
 
         # Grade MCQ and true/false questions automatically
         if question.question_type in ["mcq", "true_false"] and answer_id:
-            # Get the selected answer
-            answer = db.query(Answer).get(answer_id)
+            answer = answers_by_id.get(answer_id)
             if answer and answer.question_id == question_id:
                 user_answer.is_correct = answer.is_correct
                 if answer.is_correct:
                     user_answer.points_earned = question.points
                     earned_points += question.points
 
-        db.add(user_answer)
-
-    # Calculate score as percentage
-    score = (earned_points / total_points * 100) if total_points > 0 else 0
+        user_answers.append(user_answer)
 
-    # Update user assessment
-    user_assessment.score = score
+    user_assessment.score = (earned_points / total_points * 100) if total_points > 0 else 0
     user_assessment.end_time = datetime.now()
     user_assessment.status = "completed"
+    return user_answers
 
-    db.commit()
-    db.refresh(user_assessment)
-    return user_assessment
\ No newline at end of file
+
+# Async equivalents for handlers running on AsyncSession (app/db/async_session.py).
+# Nested collections serialized by the response schemas are eager loaded.
+
+async def get_async(db: AsyncSession, assessment_id: int) -> Optional[Assessment]:
+    result = await db.execute(
+        select(Assessment)
+        .options(selectinload(Assessment.questions).selectinload(Question.answers))
+        .where(Assessment.id == assessment_id)
+    )
+    return result.scalars().first()
+
+async def get_multi_by_course_async(
+        db: AsyncSession, *, course_id: int, skip: int = 0, limit: int = 100
+) -> List[Assessment]:
+    result = await db.execute(
+        select(Assessment)
+        .options(selectinload(Assessment.questions).selectinload(Question.answers))
+        .where(Assessment.course_id == course_id).order_by(Assessment.id).offset(skip).limit(limit)
+    )
+    return list(result.scalars().all())
+
+async def get_page_by_course_async(
+        db: AsyncSession, *, course_id: int, cursor: Optional[str] = None, limit: int = 100
+) -> KeysetPage:
+    query = select(Assessment).options(_with_questions()).where(Assessment.course_id == course_id)
+    return await paginate_async(db, query, ASSESSMENT_KEYSET, cursor=cursor, limit=limit)
+
+async def create_async(db: AsyncSession, *, obj_in: AssessmentCreate) -> Assessment:
+    db_obj = _build_assessment(obj_in)
+    db.add(db_obj)
+    await db.commit()
+    return await get_async(db, assessment_id=db_obj.id)
+
+async def update_async(
+        db: AsyncSession, *, db_obj: Assessment, obj_in: Union[AssessmentUpdate, Dict[str, Any]]
+) -> Assessment:
+    _apply_update(db_obj, obj_in)
+    db.add(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
+    return await get_async(db, assessment_id=db_obj.id)
+
+async def delete_async(db: AsyncSession, *, assessment_id: int) -> Assessment:
+    obj = await get_async(db, assessment_id=assessment_id)
+    if not obj:
+        raise HTTPException(status_code=404, detail="Assessment not found")
+    await db.delete(obj)
+    await db.commit()
+    return obj
+
+async def _get_user_assessment_async(db: AsyncSession, user_assessment_id: int) -> Optional[UserAssessment]:
+    result = await db.execute(
+        select(UserAssessment).options(selectinload(UserAssessment.answers))
+        .where(UserAssessment.id == user_assessment_id)
+    )
+    return result.scalars().first()
+
+async def start_assessment_async(db: AsyncSession, *, user_id: int, assessment_id: int) -> UserAssessment:
+    result = await db.execute(
+        select(UserAssessment).options(selectinload(UserAssessment.answers)).where(
+            UserAssessment.user_id == user_id,
+            UserAssessment.assessment_id == assessment_id,
+            UserAssessment.status == "in_progress"
+        )
+    )
+    existing = result.scalars().first()
+    if existing:
+        return existing
+
+    user_assessment = UserAssessment(
+        user_id=user_id,
+        assessment_id=assessment_id,
+        status="in_progress"
+    )
+    db.add(user_assessment)
+    await db.commit()
+    return await _get_user_assessment_async(db, user_assessment.id)
+
+async def submit_assessment_async(
+        db: AsyncSession, *, user_assessment_id: int, answers: List[Dict]
+) -> UserAssessment:
+    user_assessment = await _get_user_assessment_async(db, user_assessment_id)
+    if not user_assessment:
+        raise HTTPException(status_code=404, detail="Assessment submission not found")
+
+    if user_assessment.status == "completed":
+        raise HTTPException(status_code=400, detail="Assessment already submitted")
+
+    questions = (await db.execute(
+        select(Question).where(Question.assessment_id == user_assessment.assessment_id)
+    )).scalars().all()
+
+    # Load every selected answer option in one query
+    answer_ids = {a.get("answer_id") for a in answers if a.get("answer_id")}
+    answers_by_id = {}
+    if answer_ids:
+        answers_by_id = {
+            answer.id: answer for answer in (await db.execute(
+                select(Answer).where(Answer.id.in_(answer_ids))
+            )).scalars().all()
+        }
+
+    db.add_all(_grade_answers(user_assessment, questions, answers_by_id, answers))
+    await db.commit()
+    db.expire(user_assessment, ["answers"])
+    return await _get_user_assessment_async(db, user_assessment.id)
\ No newline at end of file
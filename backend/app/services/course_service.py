@@ -1,25 +1,208 @@
 # backend/app/services/course_service.py
-from typing import List, Optional, Dict, Any, Union
-from sqlalchemy.orm import Session
+import hashlib
+import json
+from typing import List, Optional, Dict, Any, Tuple, Union
+from sqlalchemy import distinct, func, inspect as sa_inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from fastapi import HTTPException
+from pydantic import BaseModel
 
+from app.core import rendering
+from app.core.cache import CATALOG_TAG, cache, course_tag, module_tag
+from app.core.config import settings
+from app.core.fast_json import dumps
+from app.core.http_cache import ResourceVersion
+from app.db import content_store
+from app.db.pagination import Keyset, KeysetPage, paginate, paginate_async
+from app.db.shaping import Shape, ShapeError, ShapeLevel, parse_shape
 from app.models.course import Course, Module, Lesson
-from app.schemas.course import CourseCreate, CourseUpdate
+from app.schemas.course import CourseCreate, CourseUpdate, CourseResponse, ModuleResponse, LessonResponse
 from app.schemas.course import ModuleCreate, LessonCreate
+from app.services import facet_service, outline_service, render_service, search_service
 
+COURSE_KEYSET = Keyset("courses", Course.id)
+
+# Response trees for expand= / fields= (see app/db/shaping.py); children are
+# listed in the same order as in the outlines
+MODULE_TREE = ShapeLevel(
+    ModuleResponse, Module, order_by=("order_index", "id"), relationship="lessons",
+    child=ShapeLevel(LessonResponse, Lesson, order_by=("order", "id")),
+)
+COURSE_TREE = ShapeLevel(
+    CourseResponse, Course, sources={"instructor_id": "creator_id"}, relationship="modules", child=MODULE_TREE,
+)
+
+def get_shape(tree: ShapeLevel, *, expand: Optional[str], fields: Optional[str]) -> Optional[Shape]:
+    """
+    The requested shape of a course or module response; None for the
+    default, fully embedded one.
+    """
+    try:
+        return parse_shape(tree, expand, fields)
+    except ShapeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# Read paths only: the base of a write or a permission check is loaded
+# with get.uncached, since a cached snapshot may lag the row
+@cache.cached("course", tags=lambda course, id: [course_tag(id)])
 def get(db: Session, id: int) -> Optional[Course]:
     return db.query(Course).filter(Course.id == id).first()
 
+def get_tree(db: Session, id: int) -> Optional[Course]:
+    """
+    Get a course with its modules and their lessons loaded for serialization.
+    """
+    return db.query(Course).options(*_course_tree_options()).filter(Course.id == id).first()
+
 def get_multi(
-        db: Session, *, skip: int = 0, limit: int = 100, instructor_id: Optional[int] = None
+        db: Session, *, skip: int = 0, limit: int = 100, instructor_id: Optional[int] = None,
+        published_only: bool = False,
 ) -> List[Course]:
-    query = db.query(Course)
+    query = db.query(Course).options(*_course_tree_options())
     if instructor_id:
-        query = query.filter(Course.instructor_id == instructor_id)
-    return query.offset(skip).limit(limit).all()
+        query = query.filter(Course.creator_id == instructor_id)
+    if published_only:
+        query = query.filter(Course.is_published == True)
+    return query.order_by(Course.id).offset(skip).limit(limit).all()
 
-def create(db: Session, *, obj_in: CourseCreate, creator_id: int) -> Course:
-    db_obj = Course(
+def get_page(
+        db: Session, *, cursor: Optional[str] = None, limit: int = 100, instructor_id: Optional[int] = None,
+        published_only: bool = False,
+) -> KeysetPage:
+    query = select(Course).options(*_course_tree_options())
+    if instructor_id:
+        query = query.where(Course.creator_id == instructor_id)
+    if published_only:
+        query = query.where(Course.is_published == True)
+    return paginate(db, query, COURSE_KEYSET, cursor=cursor, limit=limit)
+
+def get_catalog(
+        db: Session, *, published_only: bool, skip: int = 0, limit: int = 100,
+        cursor: Optional[str] = None, use_cursor: bool = False, shape: Optional[Shape] = None,
+        filters: Optional[Any] = None,
+) -> Tuple[ResourceVersion, bytes]:
+    """
+    The serialized catalog listing and its validators (a digest of the
+    body), from the catalog cache when present.
+
+    Full pages are assembled from the course outlines (see outline_service)
+    with one indexed query; shaped pages are loaded with one query per
+    expanded level. ``filters`` (deps.CourseFilters) narrows the listing and
+    may ask for the facet counts, which wraps offset pages in an object.
+    Writes below keep the cache current, so steady-state reads never reach
+    the database, and concurrent misses share one rebuild.
+    """
+    visibility = "published" if published_only else "all"
+    if use_cursor:
+        key = f"catalog:{visibility}:cursor:{cursor}:{limit}"
+    else:
+        key = f"catalog:{visibility}:offset:{skip}:{limit}"
+    if shape is not None:
+        key += f":{shape.key}"
+    filter_key = facet_service.key(filters) if filters is not None else ""
+    if filter_key:
+        key += f":filter:{filter_key}"
+    page_tags: List[str] = []
+
+    def build() -> Tuple[ResourceVersion, bytes]:
+        if shape is not None:
+            query = select(Course).options(*shape.options())
+            if published_only:
+                query = query.where(Course.is_published == True)
+            if filters is not None:
+                query = query.where(*facet_service.clauses(filters, Course))
+            if use_cursor:
+                page = paginate(db, query, COURSE_KEYSET, cursor=cursor, limit=limit)
+                courses = page.items
+            else:
+                courses = db.scalars(query.order_by(Course.id).offset(skip).limit(limit)).all()
+            items = dumps([shape.dump(course) for course in courses])
+            course_ids = [course.id for course in courses]
+        else:
+            if use_cursor:
+                page = outline_service.get_page(
+                    db, published_only=published_only, cursor=cursor, limit=limit, filters=filters
+                )
+                outlines = page.items
+            else:
+                outlines = outline_service.get_multi(
+                    db, published_only=published_only, skip=skip, limit=limit, filters=filters
+                )
+            items = b"[" + b",".join(outline_service.body(outline) for outline in outlines) + b"]"
+            course_ids = [outline.course_id for outline in outlines]
+        extra: Dict[str, Any] = {}
+        if use_cursor:
+            extra.update(next_cursor=page.next_cursor, prev_cursor=page.prev_cursor)
+        if filters is not None and filters.facets:
+            extra["facets"] = facet_service.get_counts(db, published_only=published_only)
+        if extra:
+            body = b'{"items":' + items + b"," + json.dumps(extra, separators=(",", ":"))[1:].encode()
+        else:
+            body = items
+        page_tags.append(CATALOG_TAG)
+        page_tags.extend(course_tag(course_id) for course_id in course_ids)
+        return ResourceVersion("catalog", (hashlib.sha1(body).hexdigest(),)), body
+
+    return cache.get_or_compute(
+        key, build, tags=lambda body: page_tags,
+        ttl=settings.CATALOG_CACHE_TTL_SECONDS, stale_ttl=settings.CACHE_STALE_SECONDS,
+    )
+
+def get_shaped(db: Session, *, course_id: int, shape: Shape) -> Optional[Dict[str, Any]]:
+    """
+    A course in the requested shape, loaded with one query per level.
+    """
+    course = db.scalars(select(Course).options(*shape.options()).where(Course.id == course_id)).first()
+    return shape.dump(course) if course else None
+
+def _invalidate_course(db_obj: Course, previous: Dict[str, Any]) -> None:
+    # Publishing or unpublishing changes which courses the published listings
+    # contain; changing a filtered column, the filtered ones and the facet counts
+    if facet_service.values(db_obj) != previous:
+        cache.invalidate(CATALOG_TAG, course_tag(db_obj.id))
+    else:
+        cache.invalidate(course_tag(db_obj.id))
+
+def _lock(db: Session, course: Course) -> None:
+    # Reload the row under FOR UPDATE before reading it: the caller's copy may
+    # predate other writers, and the facet counts move from the values read
+    # here while the outline and search document are built from them, so no
+    # one may change the row before this transaction commits.
+    # Columns only: refreshing relationships would drop the loaded trees
+    columns = [attr.key for attr in sa_inspect(course).mapper.column_attrs]
+    db.refresh(course, attribute_names=columns, with_for_update=True)
+
+# Derived state kept in the writer's transaction. Shared by the sync writers
+# and the async ones (through run_sync), so both paths maintain the same rows.
+
+def _course_created(db: Session, course: Course) -> None:
+    outline_service.course_created(db, course)
+    search_service.course_created(db, course)
+    facet_service.apply(db, None, facet_service.values(course))
+
+def _course_changed(db: Session, course: Course, previous: Dict[str, Any]) -> None:
+    outline_service.course_changed(db, course)
+    search_service.course_changed(db, course, previous["is_published"])
+    facet_service.apply(db, previous, facet_service.values(course))
+
+def _course_removed(db: Session, course: Course) -> None:
+    outline_service.course_removed(db, course.id)
+    search_service.course_removed(db, course.id)
+    facet_service.apply(db, facet_service.values(course), None)
+
+def _module_created(db: Session, module: Module) -> None:
+    outline_service.module_changed(db, module)
+    search_service.module_changed(db, module)
+
+def _lesson_created(db: Session, lesson: Lesson, rendered: Optional[Dict[str, Any]]) -> List[int]:
+    course_ids = outline_service.lesson_changed(db, lesson)
+    search_service.lesson_changed(db, lesson)
+    render_service.lesson_changed(db, lesson, rendered)
+    return course_ids
+
+def _build_course(obj_in: CourseCreate, creator_id: int) -> Course:
+    return Course(
         title=obj_in.title,
         description=obj_in.description,
         creator_id=creator_id,
@@ -27,15 +210,10 @@ def create(db: Session, *, obj_in: CourseCreate, creator_id: int) -> Course:
         difficulty_level=obj_in.difficulty_level,
         estimated_duration=obj_in.estimated_duration,
         is_published=False,
+        modules=[],
     )
-    db.add(db_obj)
-    db.commit()
-    db.refresh(db_obj)
-    return db_obj
 
-def update(
-        db: Session, *, db_obj: Course, obj_in: Union[CourseUpdate, Dict[str, Any]]
-) -> Course:
+def _apply_update(db_obj: Any, obj_in: Union[BaseModel, Dict[str, Any]]) -> None:
     if isinstance(obj_in, dict):
         update_data = obj_in
     else:
@@ -44,28 +222,62 @@ def update(
     for field in update_data:
         setattr(db_obj, field, update_data[field])
 
+def create(db: Session, *, obj_in: CourseCreate, creator_id: int) -> Course:
+    db_obj = _build_course(obj_in, creator_id)
+    db.add(db_obj)
+    db.flush()
+    _course_created(db, db_obj)
+    db.commit()
+    cache.invalidate(CATALOG_TAG)
+    return db_obj
+
+def update(
+        db: Session, *, db_obj: Course, obj_in: Union[CourseUpdate, Dict[str, Any]]
+) -> Course:
+    _lock(db, db_obj)
+    previous = facet_service.values(db_obj)
+    _apply_update(db_obj, obj_in)
+
     db.add(db_obj)
+    db.flush()
+    _course_changed(db, db_obj, previous)
     db.commit()
-    db.refresh(db_obj)
+    _invalidate_course(db_obj, previous)
     return db_obj
 
 def delete(db: Session, *, id: int) -> Course:
-    obj = db.query(Course).get(id)
+    obj = db.get(Course, id, populate_existing=True, with_for_update=True)
     if not obj:
         raise HTTPException(status_code=404, detail="Course not found")
+    _course_removed(db, obj)
     db.delete(obj)
     db.commit()
+    cache.invalidate(CATALOG_TAG, course_tag(id))
     return obj
 
 # Module related functions
 def get_module(db: Session, id: int) -> Optional[Module]:
     return db.query(Module).filter(Module.id == id).first()
 
+@cache.cached(
+    "course_modules",
+    tags=lambda modules, course_id: [course_tag(course_id), *(module_tag(m.id) for m in modules)],
+    relationships=("lessons",),
+)
 def get_course_modules(db: Session, course_id: int) -> List[Module]:
-    return db.query(Module).filter(Module.course_id == course_id).order_by(Module.order_index).all()
+    return db.query(Module).options(selectinload(Module.lessons)).filter(
+        Module.course_id == course_id
+    ).order_by(Module.order_index).all()
 
-def create_module(db: Session, *, obj_in: ModuleCreate, course_id: int) -> Module:
-    db_obj = Module(
+def get_course_modules_shaped(db: Session, *, course_id: int, shape: Shape) -> List[Dict[str, Any]]:
+    modules = db.scalars(
+        select(Module).options(*shape.options())
+        .where(Module.course_id == course_id).order_by(Module.order_index, Module.id)
+    ).all()
+    return [shape.dump(module) for module in modules]
+
+def _build_module(obj_in: ModuleCreate, course_id: int) -> Module:
+    return Module(
         title=obj_in.title,
         description=obj_in.description,
         course_id=course_id,
@@ -73,18 +285,24 @@ def create_module(db: Session, *, obj_in: ModuleCreate, course_id: int) -> Modul
         content=obj_in.content,
         estimated_duration=obj_in.estimated_duration,
         is_published=False,
+        lessons=[],
     )
+
+def create_module(db: Session, *, obj_in: ModuleCreate, course_id: int) -> Module:
+    db_obj = _build_module(obj_in, course_id)
     db.add(db_obj)
+    db.flush()
+    _module_created(db, db_obj)
     db.commit()
-    db.refresh(db_obj)
+    cache.invalidate(course_tag(course_id))
     return db_obj
 
 # Lesson related functions
 def get_module_lessons(db: Session, module_id: int) -> List[Lesson]:
     return db.query(Lesson).filter(Lesson.module_id == module_id).order_by(Lesson.order).all()
 
-def create_lesson(db: Session, *, obj_in: LessonCreate, module_id: int) -> Lesson:
-    db_obj = Lesson(
+def _build_lesson(obj_in: LessonCreate, module_id: int) -> Lesson:
+    return Lesson(
         title=obj_in.title,
         content=obj_in.content,
         module_id=module_id,
@@ -92,7 +310,187 @@ def create_lesson(db: Session, *, obj_in: LessonCreate, module_id: int) -> Lesso
         estimated_time_minutes=obj_in.estimated_time_minutes,
         is_published=False,
     )
+
+def create_lesson(db: Session, *, obj_in: LessonCreate, module_id: int) -> Lesson:
+    rendered = render_service.prepare(db, obj_in.content)
+    db_obj = _build_lesson(obj_in, module_id)
     db.add(db_obj)
+    db.flush()
+    course_ids = _lesson_created(db, db_obj, rendered)
     db.commit()
-    db.refresh(db_obj)
+    cache.invalidate(module_tag(module_id), *map(course_tag, course_ids))
+    return db_obj
+
+def get_lesson(db: Session, id: int) -> Optional[Lesson]:
+    return db.query(Lesson).filter(Lesson.id == id).first()
+
+
+# Version queries for conditional GETs. Each is one aggregate over the rows a
+# response is built from: a row's change time, plus the count, highest id and
+# latest change of each nested collection, so edits, additions and deletions
+# all change the fingerprint. Returns None when the resource does not exist.
+
+def _changed_at(model: Any) -> Any:
+    return func.coalesce(model.updated_at, model.created_at)
+
+def _children_version(model: Any) -> tuple:
+    return func.count(distinct(model.id)), func.max(model.id), func.max(_changed_at(model))
+
+def get_course_version(db: Session, course_id: int) -> Optional[ResourceVersion]:
+    """
+    Version of a course together with its modules and lessons.
+    """
+    row = db.execute(
+        select(_changed_at(Course), *_children_version(Module), *_children_version(Lesson))
+        .select_from(Course)
+        .outerjoin(Module, Module.course_id == Course.id)
+        .outerjoin(Lesson, Lesson.module_id == Module.id)
+        .where(Course.id == course_id)
+        .group_by(Course.id)
+    ).first()
+    return ResourceVersion("course", (course_id, *row)) if row else None
+
+def get_course_modules_version(db: Session, course_id: int) -> Optional[ResourceVersion]:
+    """
+    Version of a course's module list, lessons included.
+    """
+    row = db.execute(
+        select(Course.id, *_children_version(Module), *_children_version(Lesson))
+        .select_from(Course)
+        .outerjoin(Module, Module.course_id == Course.id)
+        .outerjoin(Lesson, Lesson.module_id == Module.id)
+        .where(Course.id == course_id)
+        .group_by(Course.id)
+    ).first()
+    return ResourceVersion("course-modules", tuple(row)) if row else None
+
+def get_module_lessons_version(db: Session, module_id: int) -> Optional[ResourceVersion]:
+    row = db.execute(
+        select(Module.id, *_children_version(Lesson))
+        .select_from(Module)
+        .outerjoin(Lesson, Lesson.module_id == Module.id)
+        .where(Module.id == module_id)
+        .group_by(Module.id)
+    ).first()
+    return ResourceVersion("module-lessons", tuple(row)) if row else None
+
+def get_lesson_version(db: Session, lesson_id: int) -> Optional[ResourceVersion]:
+    changed_at = db.execute(
+        select(_changed_at(Lesson)).where(Lesson.id == lesson_id)
+    ).first()
+    return ResourceVersion("lesson", (lesson_id, *changed_at)) if changed_at else None
+
+
+# Async equivalents for handlers running on AsyncSession (app/db/async_session.py).
+# Relationships serialized by the response schemas are eager loaded, and bodies
+# preloaded (see app/db/content_store.py), since lazy loading is not available
+# on an AsyncSession.
+
+def _course_tree_options():
+    return (selectinload(Course.modules).selectinload(Module.lessons),)
+
+async def get_async(db: AsyncSession, id: int) -> Optional[Course]:
+    result = await db.execute(
+        select(Course).options(*_course_tree_options()).where(Course.id == id)
+    )
+    course = result.scalars().first()
+    await db.run_sync(content_store.preload, [course] if course else [])
+    return course
+
+async def get_multi_async(
+        db: AsyncSession, *, skip: int = 0, limit: int = 100, instructor_id: Optional[int] = None
+) -> List[Course]:
+    query = select(Course).options(*_course_tree_options())
+    if instructor_id:
+        query = query.where(Course.creator_id == instructor_id)
+    result = await db.execute(query.order_by(Course.id).offset(skip).limit(limit))
+    courses = list(result.scalars().all())
+    await db.run_sync(content_store.preload, courses)
+    return courses
+
+async def get_page_async(
+        db: AsyncSession, *, cursor: Optional[str] = None, limit: int = 100, instructor_id: Optional[int] = None
+) -> KeysetPage:
+    query = select(Course).options(*_course_tree_options())
+    if instructor_id:
+        query = query.where(Course.creator_id == instructor_id)
+    page = await paginate_async(db, query, COURSE_KEYSET, cursor=cursor, limit=limit)
+    await db.run_sync(content_store.preload, page.items)
+    return page
+
+async def create_async(db: AsyncSession, *, obj_in: CourseCreate, creator_id: int) -> Course:
+    db_obj = _build_course(obj_in, creator_id)
+    db.add(db_obj)
+    await db.flush()
+    await db.run_sync(_course_created, db_obj)
+    await db.commit()
+    cache.invalidate(CATALOG_TAG)
+    return db_obj
+
+async def update_async(
+        db: AsyncSession, *, db_obj: Course, obj_in: Union[CourseUpdate, Dict[str, Any]]
+) -> Course:
+    # db_obj comes from get_async, so its modules and lessons are already loaded
+    await db.run_sync(_lock, db_obj)
+    previous = facet_service.values(db_obj)
+    _apply_update(db_obj, obj_in)
+    db.add(db_obj)
+    await db.flush()
+    await db.run_sync(_course_changed, db_obj, previous)
+    await db.commit()
+    _invalidate_course(db_obj, previous)
+    return db_obj
+
+async def delete_async(db: AsyncSession, *, id: int) -> Course:
+    obj = await get_async(db, id=id)
+    if not obj:
+        raise HTTPException(status_code=404, detail="Course not found")
+    await db.run_sync(_lock, obj)
+    await db.run_sync(_course_removed, obj)
+    await db.delete(obj)
+    await db.commit()
+    cache.invalidate(CATALOG_TAG, course_tag(id))
+    return obj
+
+async def get_module_async(db: AsyncSession, id: int) -> Optional[Module]:
+    result = await db.execute(
+        select(Module).options(selectinload(Module.lessons)).where(Module.id == id)
+    )
+    return result.scalars().first()
+
+async def get_course_modules_async(db: AsyncSession, course_id: int) -> List[Module]:
+    result = await db.execute(
+        select(Module).options(selectinload(Module.lessons))
+        .where(Module.course_id == course_id).order_by(Module.order_index)
+    )
+    modules = list(result.scalars().all())
+    await db.run_sync(content_store.preload, modules)
+    return modules
+
+async def create_module_async(db: AsyncSession, *, obj_in: ModuleCreate, course_id: int) -> Module:
+    db_obj = _build_module(obj_in, course_id)
+    db.add(db_obj)
+    await db.flush()
+    await db.run_sync(_module_created, db_obj)
+    await db.commit()
+    cache.invalidate(course_tag(course_id))
+    return db_obj
+
+async def get_module_lessons_async(db: AsyncSession, module_id: int) -> List[Lesson]:
+    result = await db.execute(
+        select(Lesson).where(Lesson.module_id == module_id).order_by(Lesson.order)
+    )
+    lessons = list(result.scalars().all())
+    await db.run_sync(content_store.preload, lessons)
+    return lessons
+
+async def create_lesson_async(db: AsyncSession, *, obj_in: LessonCreate, module_id: int) -> Lesson:
+    # Rendered before the session is used, so a large body never blocks the loop
+    rendered = await rendering.render_document_async(obj_in.content)
+    db_obj = _build_lesson(obj_in, module_id)
+    db.add(db_obj)
+    await db.flush()
+    course_ids = await db.run_sync(_lesson_created, db_obj, rendered)
+    await db.commit()
+    cache.invalidate(module_tag(module_id), *map(course_tag, course_ids))
     return db_obj
@@ -1,11 +1,20 @@
 # backend/app/services/enrollment_service.py
 from typing import List, Optional, Dict, Any, Union
 from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
+from app.db.dml import upsert_insert
+from app.db.pagination import Keyset, KeysetPage, paginate
+from app.db.projection import project
 from app.models.enrollment import Enrollment
-from app.schemas.enrollment import EnrollmentCreate, EnrollmentUpdate
+from app.schemas.enrollment import EnrollmentCreate, EnrollmentResponse, EnrollmentUpdate
+
+ENROLLMENT_KEYSET = Keyset("enrollments", Enrollment.id)
+# EnrollmentResponse as plain rows, for the fast list path (app/core/fast_json.py)
+ENROLLMENT_COLUMNS = project(EnrollmentResponse, Enrollment)
 
 def get(db: Session, enrollment_id: int) -> Optional[Enrollment]:
     return db.query(Enrollment).filter(Enrollment.id == enrollment_id).first()
@@ -18,54 +27,71 @@ def get_by_user_and_course(
         Enrollment.course_id == course_id
     ).first()
 
-def get_multi_by_user(
-        db: Session, *, user_id: int, skip: int = 0, limit: int = 100
-) -> List[Enrollment]:
-    return db.query(Enrollment).filter(
-        Enrollment.user_id == user_id
-    ).offset(skip).limit(limit).all()
+def get_multi(db: Session, *, skip: int = 0, limit: int = 100) -> List[Enrollment]:
+    return db.query(Enrollment).order_by(Enrollment.id).offset(skip).limit(limit).all()
 
 def get_multi_by_course(
         db: Session, *, course_id: int, skip: int = 0, limit: int = 100
 ) -> List[Enrollment]:
     return db.query(Enrollment).filter(
         Enrollment.course_id == course_id
-    ).offset(skip).limit(limit).all()
+    ).order_by(Enrollment.id).offset(skip).limit(limit).all()
 
-def create(db: Session, *, obj_in: EnrollmentCreate) -> Enrollment:
-    # Check if enrollment already exists
-    existing = get_by_user_and_course(
-        db=db, user_id=obj_in.user_id, course_id=obj_in.course_id
-    )
-    if existing:
-        if existing.status == "withdrawn":
-            # Reactivate withdrawn enrollment
-            existing.status = "active"
-            existing.progress = 0.0
-            db.add(existing)
-            db.commit()
-            db.refresh(existing)
-            return existing
-        else:
-            raise HTTPException(
-                status_code=400,
-                detail="User is already enrolled in this course"
-            )
-
-    db_obj = Enrollment(
+def _rows_query(user_id: Optional[int]):
+    query = select(*ENROLLMENT_COLUMNS)
+    if user_id is not None:
+        query = query.where(Enrollment.user_id == user_id)
+    return query
+
+def get_multi_rows(
+        db: Session, *, user_id: Optional[int] = None, skip: int = 0, limit: int = 100
+) -> List[Any]:
+    query = _rows_query(user_id).order_by(Enrollment.id).offset(skip).limit(limit)
+    return db.execute(query).all()
+
+def get_page_rows(
+        db: Session, *, user_id: Optional[int] = None, cursor: Optional[str] = None, limit: int = 100
+) -> KeysetPage:
+    return paginate(db, _rows_query(user_id), ENROLLMENT_KEYSET, cursor=cursor, limit=limit, as_rows=True)
+
+def _insert_enrollment(db, obj_in: EnrollmentCreate):
+    """
+    INSERT ... ON CONFLICT DO NOTHING RETURNING; no row back means the user
+    is already enrolled (uq_enrollments_user_id_course_id).
+    """
+    return upsert_insert(db, Enrollment).values(
         user_id=obj_in.user_id,
         course_id=obj_in.course_id,
         status=obj_in.status,
         progress=obj_in.progress,
-    )
-    db.add(db_obj)
+    ).on_conflict_do_nothing(
+        index_elements=[Enrollment.user_id, Enrollment.course_id]
+    ).returning(Enrollment)
+
+def _reactivate(existing: Enrollment) -> None:
+    if existing.status != "withdrawn":
+        raise HTTPException(
+            status_code=400,
+            detail="User is already enrolled in this course"
+        )
+    # Reactivate withdrawn enrollment
+    existing.status = "active"
+    existing.progress = 0.0
+
+def create(db: Session, *, obj_in: EnrollmentCreate) -> Enrollment:
+    db_obj = db.scalars(_insert_enrollment(db, obj_in)).first()
+    if db_obj is None:
+        # Already enrolled: only a withdrawn enrollment can be reactivated
+        db_obj = get_by_user_and_course(
+            db=db, user_id=obj_in.user_id, course_id=obj_in.course_id
+        )
+        _reactivate(db_obj)
     db.commit()
-    db.refresh(db_obj)
     return db_obj
 
-def update(
-        db: Session, *, db_obj: Enrollment, obj_in: Union[EnrollmentUpdate, Dict[str, Any]]
-) -> Enrollment:
+def _apply_update(
+        db_obj: Enrollment, obj_in: Union[EnrollmentUpdate, Dict[str, Any]]
+) -> None:
     if isinstance(obj_in, dict):
         update_data = obj_in
     else:
@@ -78,9 +104,13 @@ def update(
     for field in update_data:
         setattr(db_obj, field, update_data[field])
 
+def update(
+        db: Session, *, db_obj: Enrollment, obj_in: Union[EnrollmentUpdate, Dict[str, Any]]
+) -> Enrollment:
+    _apply_update(db_obj, obj_in)
+
     db.add(db_obj)
     db.commit()
-    db.refresh(db_obj)
     return db_obj
 
 def delete(db: Session, *, enrollment_id: int) -> Enrollment:
@@ -89,4 +119,56 @@ def delete(db: Session, *, enrollment_id: int) -> Enrollment:
         raise HTTPException(status_code=404, detail="Enrollment not found")
     db.delete(obj)
     db.commit()
-    return obj
\ No newline at end of file
+    return obj
+
+
+# Async equivalents for handlers running on AsyncSession (app/db/async_session.py)
+
+async def get_async(db: AsyncSession, enrollment_id: int) -> Optional[Enrollment]:
+    return await db.get(Enrollment, enrollment_id)
+
+async def get_by_user_and_course_async(
+        db: AsyncSession, *, user_id: int, course_id: int
+) -> Optional[Enrollment]:
+    result = await db.execute(
+        select(Enrollment).where(
+            Enrollment.user_id == user_id,
+            Enrollment.course_id == course_id
+        )
+    )
+    return result.scalars().first()
+
+async def get_multi_by_course_async(
+        db: AsyncSession, *, course_id: int, skip: int = 0, limit: int = 100
+) -> List[Enrollment]:
+    result = await db.execute(
+        select(Enrollment).where(Enrollment.course_id == course_id)
+        .order_by(Enrollment.id).offset(skip).limit(limit)
+    )
+    return list(result.scalars().all())
+
+async def create_async(db: AsyncSession, *, obj_in: EnrollmentCreate) -> Enrollment:
+    db_obj = (await db.scalars(_insert_enrollment(db, obj_in))).first()
+    if db_obj is None:
+        db_obj = await get_by_user_and_course_async(
+            db=db, user_id=obj_in.user_id, course_id=obj_in.course_id
+        )
+        _reactivate(db_obj)
+    await db.commit()
+    return db_obj
+
+async def update_async(
+        db: AsyncSession, *, db_obj: Enrollment, obj_in: Union[EnrollmentUpdate, Dict[str, Any]]
+) -> Enrollment:
+    _apply_update(db_obj, obj_in)
+    db.add(db_obj)
+    await db.commit()
+    return db_obj
+
+async def delete_async(db: AsyncSession, *, enrollment_id: int) -> Enrollment:
+    obj = await db.get(Enrollment, enrollment_id)
+    if not obj:
+        raise HTTPException(status_code=404, detail="Enrollment not found")
+    await db.delete(obj)
+    await db.commit()
+    return obj
@@ -0,0 +1,123 @@
+# backend/app/services/facet_service.py
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.dml import upsert_insert
+from app.models.course import Course, CourseFacetCount
+
+FACETS = ("certification_type", "difficulty_level")
+
+# Catalog facets: course counts per certification type and difficulty, for
+# all courses and for published ones, kept in course_facet_counts. The
+# course writers pass the course's facet values before and after each write
+# and only the difference is applied, in one upsert, so counting never
+# scans the courses. Courses without a value are not counted.
+
+def values(course: Course) -> Dict[str, Any]:
+    """
+    What a course contributes to the facets and filters; taken before a
+    write and passed back afterwards.
+    """
+    return {
+        "is_published": bool(course.is_published),
+        "certification_type": course.certification_type,
+        "difficulty_level": course.difficulty_level,
+        "estimated_duration": course.estimated_duration,
+    }
+
+def _counts(course_values: Optional[Dict[str, Any]], sign: int) -> Counter:
+    counts: Counter = Counter()
+    if course_values is None:
+        return counts
+    for facet in FACETS:
+        value = course_values[facet]
+        if value is not None:
+            counts[(facet, value, "total")] += sign
+            if course_values["is_published"]:
+                counts[(facet, value, "published")] += sign
+    return counts
+
+def _write(db: Session, counts: Counter) -> None:
+    rows: Dict[Tuple[str, str], Dict[str, int]] = {}
+    for (facet, value, column), delta in counts.items():
+        if delta:
+            rows.setdefault((facet, value), {"total": 0, "published": 0})[column] = delta
+    if not rows:
+        return
+    stmt = upsert_insert(db, CourseFacetCount).values([
+        {"facet": facet, "value": value, **row} for (facet, value), row in rows.items()
+    ])
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=["facet", "value"],
+        set_={
+            "total": CourseFacetCount.total + stmt.excluded.total,
+            "published": CourseFacetCount.published + stmt.excluded.published,
+        },
+    ))
+
+def apply(db: Session, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> None:
+    """
+    Move a course's contribution from ``before`` to ``after`` (None for a
+    course being created or deleted). Nothing is written when the facets
+    did not change.
+    """
+    counts = _counts(after, 1)
+    counts.update(_counts(before, -1))
+    _write(db, counts)
+
+def get_counts(db: Session, *, published_only: bool) -> Dict[str, Dict[str, int]]:
+    """
+    ``{facet: {value: courses}}``, over published courses for students.
+    """
+    column = CourseFacetCount.published if published_only else CourseFacetCount.total
+    counts: Dict[str, Dict[str, int]] = {facet: {} for facet in FACETS}
+    for facet, value, count in db.execute(
+        select(CourseFacetCount.facet, CourseFacetCount.value, column)
+        .where(column > 0).order_by(CourseFacetCount.facet, CourseFacetCount.value)
+    ):
+        counts.setdefault(facet, {})[value] = count
+    return counts
+
+def rebuild(db: Session) -> None:
+    """
+    Recount every facet from the courses, e.g. after writes that bypassed the services.
+    """
+    counts: Counter = Counter()
+    for course_values in db.execute(
+        select(Course.is_published, Course.certification_type, Course.difficulty_level, Course.estimated_duration)
+    ).mappings():
+        counts.update(_counts(dict(course_values), 1))
+    db.query(CourseFacetCount).delete(synchronize_session=False)
+    _write(db, counts)
+    db.commit()
+
+
+# Filters
+
+def clauses(filters: Any, model: Any) -> List[Any]:
+    """
+    WHERE clauses for a deps.CourseFilters against Course or CourseOutline,
+    which carry the same column names.
+    """
+    conditions = []
+    if filters.certification_type is not None:
+        conditions.append(model.certification_type == filters.certification_type)
+    if filters.difficulty_level is not None:
+        conditions.append(model.difficulty_level == filters.difficulty_level)
+    if filters.min_duration is not None:
+        conditions.append(model.estimated_duration >= filters.min_duration)
+    if filters.max_duration is not None:
+        conditions.append(model.estimated_duration <= filters.max_duration)
+    return conditions
+
+def key(filters: Any) -> str:
+    """
+    Cache key part for a deps.CourseFilters; empty when nothing is asked for.
+    """
+    parts = (filters.certification_type, filters.difficulty_level, filters.min_duration, filters.max_duration)
+    if all(part is None for part in parts) and not filters.facets:
+        return ""
+    return "|".join("" if part is None else str(part) for part in parts) + ("|facets" if filters.facets else "")
@@ -1,16 +1,30 @@
 # backend/app/services/forum_service.py
 from typing import List, Optional
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
+from app.db.pagination import Keyset, KeysetPage, paginate, paginate_async
 from app.models.forum import ForumTopic, ForumReply
 from app.schemas.forum import ForumTopicCreate, ForumReplyCreate
 
+# Newest first; backed by ix_forum_topics_created_at_id
+TOPIC_KEYSET = Keyset("forum_topics", ForumTopic.created_at, ForumTopic.id, descending=True)
+
 def get_topics(db: Session, skip: int = 0, limit: int = 100) -> List[ForumTopic]:
     """
     Get all forum topics.
     """
-    return db.query(ForumTopic).order_by(ForumTopic.created_at.desc()).offset(skip).limit(limit).all()
+    return db.query(ForumTopic).options(selectinload(ForumTopic.replies)). \
+        order_by(*TOPIC_KEYSET.order_by()).offset(skip).limit(limit).all()
+
+def get_topics_page(db: Session, cursor: Optional[str] = None, limit: int = 100) -> KeysetPage:
+    """
+    Get a page of forum topics after or before a cursor.
+    """
+    query = select(ForumTopic).options(selectinload(ForumTopic.replies))
+    return paginate(db, query, TOPIC_KEYSET, cursor=cursor, limit=limit)
 
 def get_topic(db: Session, topic_id: int) -> Optional[ForumTopic]:
     """
@@ -23,10 +37,9 @@ def create_topic(db: Session, obj_in: ForumTopicCreate, user_id: int) -> ForumTo
     Create a new forum topic.
     """
     obj_in_data = jsonable_encoder(obj_in)
-    db_obj = ForumTopic(**obj_in_data, user_id=user_id)
+    db_obj = ForumTopic(**obj_in_data, user_id=user_id, replies=[])
     db.add(db_obj)
     db.commit()
-    db.refresh(db_obj)
     return db_obj
 
 def create_reply(db: Session, obj_in: ForumReplyCreate, topic_id: int, user_id: int) -> ForumReply:
@@ -37,5 +50,56 @@ def create_reply(db: Session, obj_in: ForumReplyCreate, topic_id: int, user_id:
     db_obj = ForumReply(**obj_in_data, topic_id=topic_id, user_id=user_id)
     db.add(db_obj)
     db.commit()
-    db.refresh(db_obj)
-    return db_obj
\ No newline at end of file
+    return db_obj
+
+
+# Async equivalents for handlers running on AsyncSession (app/db/async_session.py)
+
+async def get_topics_async(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[ForumTopic]:
+    """
+    Get all forum topics.
+    """
+    result = await db.execute(
+        select(ForumTopic).options(selectinload(ForumTopic.replies))
+        .order_by(*TOPIC_KEYSET.order_by()).offset(skip).limit(limit)
+    )
+    return list(result.scalars().all())
+
+async def get_topics_page_async(db: AsyncSession, cursor: Optional[str] = None, limit: int = 100) -> KeysetPage:
+    """
+    Get a page of forum topics after or before a cursor.
+    """
+    query = select(ForumTopic).options(selectinload(ForumTopic.replies))
+    return await paginate_async(db, query, TOPIC_KEYSET, cursor=cursor, limit=limit)
+
+async def get_topic_async(db: AsyncSession, topic_id: int) -> Optional[ForumTopic]:
+    """
+    Get a forum topic by ID.
+    """
+    result = await db.execute(
+        select(ForumTopic).options(selectinload(ForumTopic.replies))
+        .where(ForumTopic.id == topic_id)
+    )
+    return result.scalars().first()
+
+async def create_topic_async(db: AsyncSession, obj_in: ForumTopicCreate, user_id: int) -> ForumTopic:
+    """
+    Create a new forum topic.
+    """
+    obj_in_data = jsonable_encoder(obj_in)
+    db_obj = ForumTopic(**obj_in_data, user_id=user_id, replies=[])
+    db.add(db_obj)
+    await db.commit()
+    return db_obj
+
+async def create_reply_async(
+        db: AsyncSession, obj_in: ForumReplyCreate, topic_id: int, user_id: int
+) -> ForumReply:
+    """
+    Create a new forum reply.
+    """
+    obj_in_data = jsonable_encoder(obj_in)
+    db_obj = ForumReply(**obj_in_data, topic_id=topic_id, user_id=user_id)
+    db.add(db_obj)
+    await db.commit()
+    return db_obj
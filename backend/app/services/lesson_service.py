@@ -1,10 +1,14 @@
 # backend/app/services/lesson_service.py
 from typing import List, Optional, Dict, Any, Union
+from sqlalchemy import func, insert, select
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
+from app.core.cache import cache, course_tag, module_tag
+from app.db import content_store
 from app.models.course import Lesson
 from app.schemas.lesson import LessonCreate, LessonUpdate
+from app.services import outline_service, render_service, search_service
 
 def get(db: Session, lesson_id: int) -> Optional[Lesson]:
     return db.query(Lesson).filter(Lesson.id == lesson_id).first()
@@ -14,28 +18,28 @@ def get_multi_by_module(
 ) -> List[Lesson]:
     return db.query(Lesson).filter(
         Lesson.module_id == module_id
-    ).order_by(Lesson.order_index).offset(skip).limit(limit).all()
+    ).order_by(Lesson.order).offset(skip).limit(limit).all()
 
 def create(db: Session, *, obj_in: LessonCreate) -> Lesson:
-    # Find the highest order_index for this module and add 1
-    highest_index = db.query(Lesson).filter(
-        Lesson.module_id == obj_in.module_id
-    ).order_by(Lesson.order_index.desc()).first()
+    # Append after the highest order for this module, computed in the INSERT
+    next_order = select(func.coalesce(func.max(Lesson.order), 0) + 1). \
+        where(Lesson.module_id == obj_in.module_id).scalar_subquery()
+    rendered = render_service.prepare(db, obj_in.content)
 
-    new_index = 1
-    if highest_index:
-        new_index = highest_index.order_index + 1
-
-    db_obj = Lesson(
+    stmt = insert(Lesson).values(
         module_id=obj_in.module_id,
         title=obj_in.title,
-        content_type=obj_in.content_type,
-        content=obj_in.content,
-        order_index=new_index,
-    )
-    db.add(db_obj)
+        content_hash=content_store.put(db, obj_in.content),
+        order=next_order,
+        estimated_time_minutes=obj_in.estimated_time_minutes,
+        is_published=False,
+    ).returning(Lesson)
+    db_obj = db.scalars(stmt).one()
+    course_ids = outline_service.lesson_changed(db, db_obj)
+    search_service.lesson_changed(db, db_obj)
+    render_service.lesson_changed(db, db_obj, rendered)
     db.commit()
-    db.refresh(db_obj)
+    cache.invalidate(module_tag(db_obj.module_id), *map(course_tag, course_ids))
     return db_obj
 
 def update(
@@ -46,12 +50,18 @@ def update(
     else:
         update_data = obj_in.dict(exclude_unset=True)
 
+    previous_module_id = db_obj.module_id
+    rendered = render_service.prepare(db, update_data["content"]) if "content" in update_data else None
     for field in update_data:
         setattr(db_obj, field, update_data[field])
 
     db.add(db_obj)
+    db.flush()
+    course_ids = outline_service.lesson_changed(db, db_obj, previous_module_id=previous_module_id)
+    search_service.lesson_changed(db, db_obj)
+    render_service.lesson_changed(db, db_obj, rendered)
     db.commit()
-    db.refresh(db_obj)
+    cache.invalidate(module_tag(previous_module_id), module_tag(db_obj.module_id), *map(course_tag, course_ids))
     return db_obj
 
 def delete(db: Session, *, lesson_id: int) -> Lesson:
@@ -59,5 +69,9 @@ def delete(db: Session, *, lesson_id: int) -> Lesson:
     if not obj:
         raise HTTPException(status_code=404, detail="Lesson not found")
     db.delete(obj)
+    db.flush()
+    course_ids = outline_service.lesson_removed(db, obj.module_id, lesson_id)
+    search_service.lesson_removed(db, lesson_id)
     db.commit()
+    cache.invalidate(module_tag(obj.module_id), *map(course_tag, course_ids))
     return obj
\ No newline at end of file
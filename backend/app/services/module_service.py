@@ -1,10 +1,13 @@
 # backend/app/services/module_service.py
 from typing import List, Optional, Dict, Any, Union
+from sqlalchemy import func, insert, select
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
+from app.core.cache import cache, course_tag
 from app.models.course import Module
 from app.schemas.module import ModuleCreate, ModuleUpdate
+from app.services import outline_service, search_service
 
 def get(db: Session, module_id: int) -> Optional[Module]:
     return db.query(Module).filter(Module.id == module_id).first()
@@ -17,24 +20,22 @@ def get_multi_by_course(
     ).order_by(Module.order_index).offset(skip).limit(limit).all()
 
 def create(db: Session, *, obj_in: ModuleCreate) -> Module:
-    # Find the highest order_index for this course and add 1
-    highest_index = db.query(Module).filter(
-        Module.course_id == obj_in.course_id
-    ).order_by(Module.order_index.desc()).first()
+    # Append after the highest order_index for this course, computed in the INSERT
+    next_index = select(func.coalesce(func.max(Module.order_index), 0) + 1). \
+        where(Module.course_id == obj_in.course_id).scalar_subquery()
 
-    new_index = 1
-    if highest_index:
-        new_index = highest_index.order_index + 1
-
-    db_obj = Module(
+    stmt = insert(Module).values(
         course_id=obj_in.course_id,
         title=obj_in.title,
         description=obj_in.description,
-        order_index=new_index,
-    )
-    db.add(db_obj)
+        order_index=next_index,
+        is_published=False,
+    ).returning(Module)
+    db_obj = db.scalars(stmt).one()
+    outline_service.module_changed(db, db_obj)
+    search_service.module_changed(db, db_obj)
     db.commit()
-    db.refresh(db_obj)
+    cache.invalidate(course_tag(db_obj.course_id))
     return db_obj
 
 def update(
@@ -45,12 +46,16 @@ def update(
     else:
         update_data = obj_in.dict(exclude_unset=True)
 
+    previous_course_id = db_obj.course_id
     for field in update_data:
         setattr(db_obj, field, update_data[field])
 
     db.add(db_obj)
+    db.flush()
+    outline_service.module_changed(db, db_obj, previous_course_id=previous_course_id)
+    search_service.module_changed(db, db_obj, previous_course_id=previous_course_id)
     db.commit()
-    db.refresh(db_obj)
+    cache.invalidate(course_tag(previous_course_id), course_tag(db_obj.course_id))
     return db_obj
 
 def delete(db: Session, *, module_id: int) -> Module:
@@ -58,5 +63,9 @@ def delete(db: Session, *, module_id: int) -> Module:
     if not obj:
         raise HTTPException(status_code=404, detail="Module not found")
     db.delete(obj)
+    db.flush()
+    outline_service.module_removed(db, obj.course_id, module_id)
+    search_service.module_removed(db, module_id)
     db.commit()
+    cache.invalidate(course_tag(obj.course_id))
     return obj
\ No newline at end of file
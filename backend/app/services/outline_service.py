@@ -0,0 +1,267 @@
+# backend/app/services/outline_service.py
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import Select, inspect as sa_inspect, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.http_cache import ResourceVersion
+from app.db.pagination import Keyset, KeysetPage, paginate
+from app.db.replica import use_primary
+from app.models.course import Course, CourseOutline, Lesson, Module
+from app.schemas.course import CourseResponse, LessonSummary, ModuleSummary
+from app.services import facet_service
+
+# Same cursor name as course_service.COURSE_KEYSET: both walk courses by id
+OUTLINE_KEYSET = Keyset("courses", CourseOutline.course_id)
+
+# Course outlines: each course's tree (CourseResponse) kept serialized in
+# course_outlines, so reads are one primary key or index lookup and no
+# serialization. Module and lesson bodies are left out (ModuleSummary,
+# LessonSummary): they are read one lesson at a time. The course, module and lesson writers call the functions
+# below inside their transaction, after flushing; each patches only the part
+# of the outline its row appears in.
+
+def _columns(obj: Any) -> Dict[str, Any]:
+    return {attr.key: getattr(obj, attr.key) for attr in sa_inspect(obj).mapper.column_attrs}
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+def _header(course: Course) -> str:
+    return CourseResponse.model_validate({**_columns(course), "modules": []}).model_dump_json(exclude={"modules"})
+
+def _module_entry(module: Module, lessons: List[Dict[str, Any]]) -> Dict[str, Any]:
+    entry = ModuleSummary.model_validate({**_columns(module), "lessons": []}).model_dump(mode="json")
+    entry["lessons"] = lessons
+    return entry
+
+def _lesson_entry(lesson: Lesson) -> Dict[str, Any]:
+    return LessonSummary.model_validate(_columns(lesson)).model_dump(mode="json")
+
+def _sort(modules: List[Dict[str, Any]]) -> None:
+    modules.sort(key=lambda module: (module["order_index"], module["id"]))
+    for module in modules:
+        module["lessons"].sort(key=lambda lesson: (lesson["order"] or 0, lesson["id"]))
+
+def body(outline: CourseOutline) -> bytes:
+    """
+    The CourseResponse JSON of an outline.
+    """
+    return (outline.header[:-1] + ',"modules":' + outline.modules + "}").encode()
+
+def version(outline: CourseOutline) -> ResourceVersion:
+    return ResourceVersion("course", (outline.course_id, outline.version, outline.updated_at))
+
+
+# Reads
+
+def get(db: Session, course_id: int) -> Optional[CourseOutline]:
+    """
+    Get the outline of a course, building it first for courses that predate
+    outlines. None if the course does not exist.
+    """
+    outline = db.get(CourseOutline, course_id)
+    if outline is not None:
+        return outline
+    # The outline is built from, and written to, the primary
+    use_primary(db)
+    try:
+        outline = rebuild(db, course_id)
+        db.commit()
+    except IntegrityError:
+        # Another request built it first
+        db.rollback()
+        outline = db.get(CourseOutline, course_id)
+    return outline
+
+def _listing(published_only: bool, filters: Optional[Any]) -> Select:
+    query = select(CourseOutline)
+    if published_only:
+        query = query.where(CourseOutline.is_published == True)
+    if filters is not None:
+        query = query.where(*facet_service.clauses(filters, CourseOutline))
+    return query
+
+def get_multi(
+        db: Session, *, published_only: bool, skip: int = 0, limit: int = 100, filters: Optional[Any] = None,
+) -> List[CourseOutline]:
+    """
+    A catalog page, optionally filtered (see facet_service.clauses).
+    """
+    query = _listing(published_only, filters)
+    return list(db.scalars(query.order_by(CourseOutline.course_id).offset(skip).limit(limit)).all())
+
+def get_page(
+        db: Session, *, published_only: bool, cursor: Optional[str] = None, limit: int = 100,
+        filters: Optional[Any] = None,
+) -> KeysetPage:
+    return paginate(db, _listing(published_only, filters), OUTLINE_KEYSET, cursor=cursor, limit=limit)
+
+
+# Writes
+
+def rebuild(db: Session, course_id: int) -> Optional[CourseOutline]:
+    """
+    Build a course's outline from its rows, replacing any existing one.
+    """
+    course = db.scalars(
+        select(Course).options(selectinload(Course.modules).selectinload(Module.lessons))
+        .where(Course.id == course_id)
+        # Collections already in the session may predate this transaction's writes
+        .execution_options(populate_existing=True)
+    ).first()
+    if course is None:
+        return None
+    modules = [
+        _module_entry(module, [_lesson_entry(lesson) for lesson in module.lessons])
+        for module in course.modules
+    ]
+    _sort(modules)
+
+    outline = db.get(CourseOutline, course_id, populate_existing=True, with_for_update=True)
+    if outline is None:
+        outline = CourseOutline(course_id=course_id, version=0)
+        db.add(outline)
+    outline.version += 1
+    for name, value in facet_service.values(course).items():
+        setattr(outline, name, value)
+    outline.header = _header(course)
+    outline.modules = _dumps(modules)
+    db.flush()
+    return outline
+
+def rebuild_missing(db: Session) -> int:
+    """
+    Build the outlines of courses that have none. Returns how many were built.
+    """
+    course_ids = db.scalars(
+        select(Course.id).outerjoin(CourseOutline, CourseOutline.course_id == Course.id)
+        .where(CourseOutline.course_id.is_(None))
+    ).all()
+    for course_id in course_ids:
+        rebuild(db, course_id)
+    db.commit()
+    return len(course_ids)
+
+def course_created(db: Session, course: Course) -> None:
+    db.add(CourseOutline(
+        course_id=course.id,
+        **facet_service.values(course),
+        version=1,
+        header=_header(course),
+        modules="[]",
+    ))
+    db.flush()
+
+def course_changed(db: Session, course: Course) -> None:
+    result = db.execute(
+        update(CourseOutline).where(CourseOutline.course_id == course.id).values(
+            **facet_service.values(course),
+            header=_header(course),
+            version=CourseOutline.version + 1,
+        ).execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        rebuild(db, course.id)
+
+def course_removed(db: Session, course_id: int) -> None:
+    # ON DELETE CASCADE covers PostgreSQL; SQLite does not enforce foreign keys
+    db.query(CourseOutline).filter(CourseOutline.course_id == course_id).delete(synchronize_session=False)
+
+def _patch(
+        db: Session, change: Callable[[List[Dict[str, Any]]], bool], *,
+        course_id: Optional[int] = None, module_id: Optional[int] = None,
+) -> Optional[int]:
+    # Locate the outline by course or through one of its modules. The row
+    # lock (FOR UPDATE) makes concurrent writers to one course apply in turn
+    query = select(CourseOutline.course_id, CourseOutline.modules).with_for_update(of=CourseOutline)
+    if module_id is not None:
+        query = query.join(Module, Module.course_id == CourseOutline.course_id).where(Module.id == module_id)
+    else:
+        query = query.where(CourseOutline.course_id == course_id)
+    row = db.execute(query).first()
+    if row is None:
+        if module_id is not None:
+            course_id = db.scalar(select(Module.course_id).where(Module.id == module_id))
+        if course_id is not None:
+            rebuild(db, course_id)
+        return course_id
+
+    course_id, modules = row
+    modules = json.loads(modules)
+    if not change(modules):
+        # The outline disagrees with the rows; start again from the rows
+        rebuild(db, course_id)
+        return course_id
+    _sort(modules)
+    db.execute(
+        update(CourseOutline).where(CourseOutline.course_id == course_id).values(
+            modules=_dumps(modules), version=CourseOutline.version + 1,
+        ).execution_options(synchronize_session=False)
+    )
+    return course_id
+
+def _pop_module(modules: List[Dict[str, Any]], module_id: int) -> Optional[Dict[str, Any]]:
+    for index, module in enumerate(modules):
+        if module["id"] == module_id:
+            return modules.pop(index)
+    return None
+
+def module_changed(db: Session, module: Module, previous_course_id: Optional[int] = None) -> None:
+    """
+    Add or replace a module's entry; ``previous_course_id`` moves it from
+    another course's outline, lessons included.
+    """
+    lessons: List[Dict[str, Any]] = []
+    if previous_course_id is not None and previous_course_id != module.course_id:
+        def take(modules: List[Dict[str, Any]]) -> bool:
+            previous = _pop_module(modules, module.id)
+            lessons.extend(previous["lessons"] if previous else ())
+            return previous is not None
+        _patch(db, take, course_id=previous_course_id)
+
+    def put(modules: List[Dict[str, Any]]) -> bool:
+        previous = _pop_module(modules, module.id)
+        modules.append(_module_entry(module, previous["lessons"] if previous else lessons))
+        return True
+    _patch(db, put, course_id=module.course_id)
+
+def module_removed(db: Session, course_id: int, module_id: int) -> None:
+    _patch(db, lambda modules: _pop_module(modules, module_id) is not None, course_id=course_id)
+
+def _change_lesson(
+        db: Session, module_id: int, lesson_id: int, entry: Optional[Dict[str, Any]]
+) -> Optional[int]:
+    def change(modules: List[Dict[str, Any]]) -> bool:
+        for module in modules:
+            if module["id"] == module_id:
+                lessons = module["lessons"]
+                found = [i for i, lesson in enumerate(lessons) if lesson["id"] == lesson_id]
+                for index in reversed(found):
+                    del lessons[index]
+                if entry is not None:
+                    lessons.append(entry)
+                    return True
+                return bool(found)
+        return False
+    return _patch(db, change, module_id=module_id)
+
+def lesson_changed(db: Session, lesson: Lesson, previous_module_id: Optional[int] = None) -> List[int]:
+    """
+    Add or replace a lesson's entry; ``previous_module_id`` moves it from
+    another module. Returns the ids of the courses whose outline changed.
+    """
+    course_ids = []
+    if previous_module_id is not None and previous_module_id != lesson.module_id:
+        course_ids.append(_change_lesson(db, previous_module_id, lesson.id, None))
+    course_ids.append(_change_lesson(db, lesson.module_id, lesson.id, _lesson_entry(lesson)))
+    return [course_id for course_id in course_ids if course_id is not None]
+
+def lesson_removed(db: Session, module_id: int, lesson_id: int) -> List[int]:
+    """
+    Drop a lesson's entry. Returns the ids of the courses whose outline changed.
+    """
+    course_id = _change_lesson(db, module_id, lesson_id, None)
+    return [course_id] if course_id is not None else []
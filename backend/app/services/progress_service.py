@@ -1,8 +1,10 @@
 # backend/app/services/progress_service.py
 from typing import List, Dict, Any, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
 
+from app.db.dml import upsert_insert
 from app.models.user import User
 from app.models.course import Course, Module, Lesson
 from app.models.progress import LessonCompletion, AssessmentAttempt
@@ -22,21 +24,25 @@ def get_course_progress(db: Session, user_id: int, course_id: int) -> CourseProg
     course = db.query(Course).filter(Course.id == course_id).first()
 
     # Get all modules in the course
-    modules = db.query(Module).filter(Module.course_id == course_id).all()
-
-    # Get count of all lessons in the course
-    total_lessons = db.query(func.count(Lesson.id)). \
-                        join(Module, Module.id == Lesson.module_id). \
-                        filter(Module.course_id == course_id).scalar() or 0
-
-    # Get count of completed lessons by this user in this course
-    completed_lessons = db.query(func.count(LessonCompletion.id)). \
-                            join(Lesson, Lesson.id == LessonCompletion.lesson_id). \
-                            join(Module, Module.id == Lesson.module_id). \
-                            filter(
-        Module.course_id == course_id,
-        LessonCompletion.user_id == user_id
-    ).scalar() or 0
+    modules = db.query(Module).filter(Module.course_id == course_id).order_by(Module.order_index).all()
+
+    # Lesson and completion counts for every module in two grouped queries
+    lesson_counts = dict(
+        db.query(Lesson.module_id, func.count(Lesson.id)).
+            join(Module, Module.id == Lesson.module_id).
+            filter(Module.course_id == course_id).
+            group_by(Lesson.module_id).all()
+    )
+    completed_counts = dict(
+        db.query(Lesson.module_id, func.count(LessonCompletion.id)).
+            join(Lesson, Lesson.id == LessonCompletion.lesson_id).
+            join(Module, Module.id == Lesson.module_id).
+            filter(Module.course_id == course_id, LessonCompletion.user_id == user_id).
+            group_by(Lesson.module_id).all()
+    )
+
+    total_lessons = sum(lesson_counts.values())
+    completed_lessons = sum(completed_counts.values())
 
     # Calculate overall completion percentage
     overall_completion_percentage = (completed_lessons / total_lessons * 100) if total_lessons > 0 else 0
@@ -44,17 +50,8 @@ def get_course_progress(db: Session, user_id: int, course_id: int) -> CourseProg
     # Get module-specific progress
     module_progress = []
     for module in modules:
-        # Count lessons in this module
-        module_lessons = db.query(func.count(Lesson.id)). \
-                             filter(Lesson.module_id == module.id).scalar() or 0
-
-        # Count completed lessons in this module
-        module_completed = db.query(func.count(LessonCompletion.id)). \
-                               join(Lesson, Lesson.id == LessonCompletion.lesson_id). \
-                               filter(
-            Lesson.module_id == module.id,
-            LessonCompletion.user_id == user_id
-        ).scalar() or 0
+        module_lessons = lesson_counts.get(module.id, 0)
+        module_completed = completed_counts.get(module.id, 0)
 
         # Calculate module completion percentage
         module_completion = (module_completed / module_lessons * 100) if module_lessons > 0 else 0
@@ -77,6 +74,23 @@ def get_course_progress(db: Session, user_id: int, course_id: int) -> CourseProg
         module_progress=module_progress
     )
 
+def _completion_upsert(db, user_id: int, lesson_id: int, completion_data: LessonCompletionCreate):
+    """
+    INSERT ... ON CONFLICT (user_id, lesson_id) DO UPDATE ... RETURNING for a
+    lesson completion, so marking a lesson complete is a single statement.
+    """
+    stmt = upsert_insert(db, LessonCompletion).values(
+        user_id=user_id, lesson_id=lesson_id, **completion_data.dict()
+    )
+    # An existing completion only takes the fields the client actually sent
+    update_data = {
+        field: stmt.excluded[field] for field in completion_data.dict(exclude_unset=True)
+    } or {"lesson_id": stmt.excluded.lesson_id}
+    return stmt.on_conflict_do_update(
+        index_elements=[LessonCompletion.user_id, LessonCompletion.lesson_id],
+        set_=update_data,
+    ).returning(LessonCompletion)
+
 def mark_lesson_complete(
         db: Session,
         user_id: int,
@@ -86,36 +100,75 @@ def mark_lesson_complete(
     """
     Mark a lesson as complete for a user
     """
-    # Check if already completed
-    existing = db.query(LessonCompletion).filter(
-        LessonCompletion.user_id == user_id,
-        LessonCompletion.lesson_id == lesson_id
-    ).first()
-
-    if existing:
-        # Update existing completion record
-        update_data = completion_data.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(existing, field, value)
-        db.commit()
-        db.refresh(existing)
-        return existing
-
-    # Create new completion record
-    completion = LessonCompletion(
-        user_id=user_id,
-        lesson_id=lesson_id,
-        **completion_data.dict()
-    )
-    db.add(completion)
+    stmt = _completion_upsert(db, user_id, lesson_id, completion_data)
+    completion = db.scalars(stmt, execution_options={"populate_existing": True}).one()
     db.commit()
-    db.refresh(completion)
     return completion
 
-def get_user_assessment_results(db: Session, user_id: int, skip: int = 0, limit: int = 100):
+# Async equivalents for handlers running on AsyncSession (app/db/async_session.py)
+
+async def get_course_progress_async(db: AsyncSession, user_id: int, course_id: int) -> CourseProgressResponse:
     """
-    Get a user's assessment results
+    Get a user's progress in a specific course
     """
-    # This function should be implemented based on your assessment model
-    # Placeholder implementation
-    return []
\ No newline at end of file
+    course = await db.get(Course, course_id)
+
+    modules = (await db.execute(
+        select(Module).where(Module.course_id == course_id).order_by(Module.order_index)
+    )).scalars().all()
+
+    # Lesson and completion counts for every module in two grouped queries
+    lesson_counts = dict((await db.execute(
+        select(Lesson.module_id, func.count(Lesson.id))
+        .join(Module, Module.id == Lesson.module_id)
+        .where(Module.course_id == course_id)
+        .group_by(Lesson.module_id)
+    )).all())
+    completed_counts = dict((await db.execute(
+        select(Lesson.module_id, func.count(LessonCompletion.id))
+        .join(Lesson, Lesson.id == LessonCompletion.lesson_id)
+        .join(Module, Module.id == Lesson.module_id)
+        .where(Module.course_id == course_id, LessonCompletion.user_id == user_id)
+        .group_by(Lesson.module_id)
+    )).all())
+
+    total_lessons = sum(lesson_counts.values())
+    completed_lessons = sum(completed_counts.values())
+    overall_completion_percentage = (completed_lessons / total_lessons * 100) if total_lessons > 0 else 0
+
+    module_progress = []
+    for module in modules:
+        module_lessons = lesson_counts.get(module.id, 0)
+        module_completed = completed_counts.get(module.id, 0)
+        module_completion = (module_completed / module_lessons * 100) if module_lessons > 0 else 0
+        module_progress.append(ModuleProgressItem(
+            module_id=module.id,
+            module_title=module.title,
+            total_lessons=module_lessons,
+            completed_lessons=module_completed,
+            completion_percentage=module_completion
+        ))
+
+    return CourseProgressResponse(
+        course_id=course_id,
+        course_title=course.title,
+        total_modules=len(modules),
+        total_lessons=total_lessons,
+        completed_lessons=completed_lessons,
+        overall_completion_percentage=overall_completion_percentage,
+        module_progress=module_progress
+    )
+
+async def mark_lesson_complete_async(
+        db: AsyncSession,
+        user_id: int,
+        lesson_id: int,
+        completion_data: LessonCompletionCreate
+) -> LessonCompletionResponse:
+    """
+    Mark a lesson as complete for a user
+    """
+    stmt = _completion_upsert(db, user_id, lesson_id, completion_data)
+    completion = (await db.scalars(stmt, execution_options={"populate_existing": True})).one()
+    await db.commit()
+    return completion
@@ -0,0 +1,93 @@
+# backend/app/services/render_service.py
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core import rendering
+from app.db import content_store
+from app.db.dml import upsert_insert
+from app.models.course import Lesson, RenderedContent
+
+# Rendered lessons: the lesson writers render a body once, when it is written,
+# and lessons are read in that form, so clients no longer parse markdown.
+# Renders are keyed by content hash, so lessons sharing a body share a render
+# and unchanged bodies are never rendered again; a render from an older
+# RENDERER_VERSION, or a body written around the services, is rendered on
+# its next read instead.
+
+def _is_current(db: Session, content_hash: str) -> bool:
+    version = db.scalar(
+        select(RenderedContent.renderer_version).where(RenderedContent.content_hash == content_hash)
+    )
+    return version == rendering.RENDERER_VERSION
+
+def _store(db: Session, content_hash: str, rendered: Dict[str, Any]) -> None:
+    values = {
+        "renderer_version": rendering.RENDERER_VERSION,
+        "html_hash": content_store.put(db, rendered["html"]),
+        "toc": rendered["toc"],
+        "word_count": rendered["word_count"],
+        "reading_time_minutes": rendered["reading_time_minutes"],
+    }
+    stmt = upsert_insert(db, RenderedContent).values(content_hash=content_hash, **values)
+    db.execute(stmt.on_conflict_do_update(index_elements=["content_hash"], set_=values))
+
+def prepare(db: Session, content: str) -> Optional[Dict[str, Any]]:
+    """
+    Render a body about to be written, unless its current render is already
+    stored (None). Writers call this before they flush or lock anything, so
+    a long render never holds the locks of the outline and search writes.
+    """
+    if _is_current(db, content_store.digest(content)):
+        return None
+    return rendering.render_document(content)
+
+def lesson_changed(db: Session, lesson: Lesson, rendered: Optional[Dict[str, Any]]) -> None:
+    """
+    Store the render of a created or edited lesson's body, as returned by
+    prepare (or rendering.render_document_async); None stores nothing.
+    """
+    if rendered is not None:
+        _store(db, lesson.content_hash, rendered)
+
+def get(db: Session, lesson: Lesson) -> Dict[str, Any]:
+    """
+    The render of a lesson's body (as rendering.render returns it), rendering
+    it now if it is missing or stale.
+    """
+    stored = db.get(RenderedContent, lesson.content_hash, populate_existing=True)
+    if stored is not None and stored.renderer_version == rendering.RENDERER_VERSION:
+        return {
+            "html": stored.html,
+            "toc": stored.toc,
+            "word_count": stored.word_count,
+            "reading_time_minutes": stored.reading_time_minutes,
+        }
+    # Served from the render itself: the writes are statements, not flushes,
+    # so a read of the stored row could still be routed to the replica
+    rendered = rendering.render_document(lesson.content)
+    _store(db, lesson.content_hash, rendered)
+    db.commit()
+    return rendered
+
+def lesson_response(db: Session, lesson: Lesson) -> Dict[str, Any]:
+    """
+    A lesson as served to readers: its fields with the rendered body in
+    place of the source (schemas.course.RenderedLessonResponse).
+    """
+    rendered = get(db, lesson)
+    return {
+        "id": lesson.id,
+        "module_id": lesson.module_id,
+        "title": lesson.title,
+        "order": lesson.order,
+        "estimated_time_minutes": lesson.estimated_time_minutes,
+        "is_published": bool(lesson.is_published),
+        "created_at": lesson.created_at,
+        "updated_at": lesson.updated_at,
+        "html": rendered["html"],
+        "toc": rendered["toc"],
+        "word_count": rendered["word_count"],
+        "reading_time_minutes": rendered["reading_time_minutes"],
+    }
@@ -0,0 +1,202 @@
+# backend/app/services/search_service.py
+import html
+import re
+from typing import Any, Dict, Optional, Sequence
+
+from sqlalchemy import Double, Float, cast, column, delete, func, literal_column, select, table, update
+from sqlalchemy.orm import Session
+
+from app.db import fulltext
+from app.db.dml import upsert_insert
+from app.db.pagination import Keyset, KeysetPage, paginate
+from app.models.course import Course, Lesson, Module, SearchDocument
+
+# Highlight markers as returned by the database; replaced by <mark> after
+# the rest of the text is escaped, so stored HTML is never passed through
+_START, _STOP = "\x02", "\x03"
+
+SNIPPET_WORDS = 24
+
+# Search documents: one row per course, module and lesson holding its
+# searchable text and visibility (see SearchDocument). The course, module
+# and lesson writers call the functions below inside their transaction,
+# after flushing, next to the outline_service ones.
+
+def _body(*parts: Optional[str]) -> str:
+    return " ".join(part for part in parts if part)
+
+def _upsert(db: Session, kind: str, object_id: int, **values: Any) -> None:
+    stmt = upsert_insert(db, SearchDocument).values(kind=kind, object_id=object_id, **values)
+    db.execute(stmt.on_conflict_do_update(index_elements=["kind", "object_id"], set_=values))
+
+def _course_published(course_id: Any) -> Any:
+    return func.coalesce(
+        select(Course.is_published).where(Course.id == course_id).scalar_subquery(), False
+    )
+
+def _module_published(module_id: Any) -> Any:
+    return func.coalesce(
+        select(Module.is_published).where(Module.id == module_id).scalar_subquery(), False
+    )
+
+def course_created(db: Session, course: Course) -> None:
+    published = bool(course.is_published)
+    _upsert(
+        db, "course", course.id, course_id=course.id, module_id=None,
+        title=course.title, body=_body(course.description),
+        is_published=published, course_published=published, module_published=True,
+    )
+
+def course_changed(db: Session, course: Course, was_published: Optional[bool] = None) -> None:
+    """
+    Reindex a course; when its publication changed (or ``was_published`` is
+    unknown) everything in it is shown to or hidden from students.
+    """
+    course_created(db, course)
+    published = bool(course.is_published)
+    if was_published is None or bool(was_published) != published:
+        db.execute(
+            update(SearchDocument)
+            .where(SearchDocument.course_id == course.id, SearchDocument.course_published != published)
+            .values(course_published=published)
+            .execution_options(synchronize_session=False)
+        )
+
+def course_removed(db: Session, course_id: int) -> None:
+    # ON DELETE CASCADE covers PostgreSQL; SQLite does not enforce foreign keys
+    db.execute(delete(SearchDocument).where(SearchDocument.course_id == course_id))
+
+def module_changed(db: Session, module: Module, previous_course_id: Optional[int] = None) -> None:
+    """
+    Index a module; its publication is copied onto its lessons' documents, and
+    ``previous_course_id`` moves those documents along.
+    """
+    published = bool(module.is_published)
+    _upsert(
+        db, "module", module.id, course_id=module.course_id, module_id=module.id,
+        title=module.title, body=_body(module.description, module.content),
+        is_published=published, course_published=_course_published(module.course_id),
+        module_published=published,
+    )
+    lessons = update(SearchDocument).where(SearchDocument.kind == "lesson", SearchDocument.module_id == module.id)
+    if previous_course_id is not None and previous_course_id != module.course_id:
+        lessons = lessons.values(
+            course_id=module.course_id, course_published=_course_published(module.course_id),
+            module_published=published,
+        )
+    else:
+        lessons = lessons.where(SearchDocument.module_published != published).values(module_published=published)
+    db.execute(lessons.execution_options(synchronize_session=False))
+
+def module_removed(db: Session, module_id: int) -> None:
+    # Its lessons go with it
+    db.execute(delete(SearchDocument).where(
+        SearchDocument.kind.in_(("module", "lesson")), SearchDocument.module_id == module_id
+    ))
+
+def lesson_changed(db: Session, lesson: Lesson) -> None:
+    course_id = select(Module.course_id).where(Module.id == lesson.module_id).scalar_subquery()
+    _upsert(
+        db, "lesson", lesson.id, course_id=course_id, module_id=lesson.module_id,
+        title=lesson.title, body=_body(lesson.content),
+        is_published=bool(lesson.is_published), course_published=_course_published(course_id),
+        module_published=_module_published(lesson.module_id),
+    )
+
+def lesson_removed(db: Session, lesson_id: int) -> None:
+    db.execute(delete(SearchDocument).where(SearchDocument.kind == "lesson", SearchDocument.object_id == lesson_id))
+
+
+# Queries
+
+def _marked(fragment: Optional[str]) -> str:
+    return html.escape(fragment or "").replace(_START, "<mark>").replace(_STOP, "</mark>")
+
+def _match_postgresql(query: str) -> Dict[str, Any]:
+    tsquery = func.websearch_to_tsquery(fulltext.LANGUAGE, query)
+    vector = literal_column("search_documents.search_vector")
+    highlight = f"StartSel={_START}, StopSel={_STOP}"
+    return {
+        "from": SearchDocument,
+        "where": vector.op("@@")(tsquery),
+        # ts_rank is real; as double precision the cursor's float compares equal to it
+        "rank": cast(func.ts_rank(vector, tsquery), Double),
+        "title": func.ts_headline(fulltext.LANGUAGE, SearchDocument.title, tsquery, f"HighlightAll=true, {highlight}"),
+        "snippet": func.ts_headline(
+            fulltext.LANGUAGE, SearchDocument.body, tsquery,
+            f"MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}, MaxFragments=2, "
+            f"FragmentDelimiter=\" … \", {highlight}",
+        ),
+    }
+
+def _match_sqlite(query: str) -> Optional[Dict[str, Any]]:
+    # FTS5 has its own query syntax; each word becomes a quoted term, all required
+    terms = re.findall(r"\w+", query)
+    if not terms:
+        return None
+    fts = table(fulltext.FTS_TABLE, column("rowid"))
+    index = literal_column(fulltext.FTS_TABLE)
+    return {
+        "from": SearchDocument.__table__.join(fts, fts.c.rowid == SearchDocument.id),
+        "where": index.op("MATCH")(" ".join(f'"{term}"' for term in terms)),
+        # bm25 is lower for better matches; the title counts ten times the body
+        "rank": -func.bm25(index, 10.0, 1.0, type_=Float),
+        "title": func.highlight(index, 0, _START, _STOP),
+        "snippet": func.snippet(index, 1, _START, _STOP, " … ", SNIPPET_WORDS),
+    }
+
+def search(
+        db: Session, *, query: str, visible_only: bool, kinds: Optional[Sequence[str]] = None,
+        cursor: Optional[str] = None, limit: int = 20,
+) -> KeysetPage:
+    """
+    Courses, modules and lessons matching ``query``, best first, with the
+    matched words in the title and a body snippet wrapped in <mark>.
+
+    ``visible_only`` (students) drops unpublished items and everything in
+    unpublished modules or courses. Pages are keyset paginated on (rank, id); ranks
+    shift as documents are added, so a walk over a changing index may skip
+    or repeat a result at page boundaries.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        match = _match_postgresql(query)
+    else:
+        match = _match_sqlite(query)
+    if match is None:
+        return KeysetPage([], next_cursor=None, prev_cursor=None)
+
+    hits = select(
+        SearchDocument.id.label("document_id"),
+        SearchDocument.kind,
+        SearchDocument.object_id,
+        SearchDocument.course_id,
+        SearchDocument.module_id,
+        match["title"].label("title"),
+        match["snippet"].label("snippet"),
+        match["rank"].label("rank"),
+    ).select_from(match["from"]).where(match["where"])
+    if visible_only:
+        hits = hits.where(
+            SearchDocument.is_published == True,
+            SearchDocument.module_published == True,
+            SearchDocument.course_published == True,
+        )
+    if kinds:
+        hits = hits.where(SearchDocument.kind.in_(kinds))
+    hits = hits.subquery("hits")
+
+    keyset = Keyset("search", hits.c.rank, hits.c.document_id, descending=True)
+    page = paginate(db, select(hits), keyset, cursor=cursor, limit=limit, as_rows=True)
+    page.items = [
+        {
+            "kind": row.kind,
+            "id": row.object_id,
+            "course_id": row.course_id,
+            "module_id": row.module_id,
+            "title": _marked(row.title),
+            "snippet": _marked(row.snippet),
+            "rank": row.rank,
+        }
+        for row in page.items
+    ]
+    return page
@@ -2,15 +2,39 @@
 from datetime import datetime, timedelta
 from typing import Any, Dict, Optional, Union
 
-from fastapi import HTTPException
+from fastapi import HTTPException, status
 from jose import jwt
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from app.core.cache import cache, user_tag
 from app.core.config import settings
-from app.core.security import get_password_hash, verify_password
+from app.core.token_versions import token_versions
+from app.db.pagination import Keyset, KeysetPage, paginate
+from app.db.projection import project
+from app.core.security import (
+    PasswordHashingBusy,
+    get_password_hash,
+    get_password_hash_async,
+    verify_password,
+    verify_password_async,
+)
 from app.models.user import User
-from app.schemas.user import UserCreate, UserUpdate
+from app.schemas.token import TokenPayload
+from app.schemas.user import UserCreate, UserResponse, UserUpdate
 
+# Changing any of these invalidates tokens issued before the change
+TOKEN_CLAIM_FIELDS = ("role", "is_active", "hashed_password")
+
+USER_KEYSET = Keyset("users", User.id)
+# UserResponse as plain rows, for the fast list path (app/core/fast_json.py)
+USER_COLUMNS = project(UserResponse, User)
+
+# Also the authenticated user of each request (app/api/deps.py): writers drop
+# it by user_tag, which reaches every worker with the redis backend
+@cache.cached("user", tags=lambda user, id: [user_tag(id)])
 def get(db: Session, id: int) -> Optional[User]:
     return db.query(User).filter(User.id == id).first()
 
@@ -18,22 +42,42 @@ def get_by_email(db: Session, email: str) -> Optional[User]:
     return db.query(User).filter(User.email == email).first()
 
 def get_multi(db: Session, *, skip: int = 0, limit: int = 100) -> list[User]:
-    return db.query(User).offset(skip).limit(limit).all()
+    return db.query(User).order_by(User.id).offset(skip).limit(limit).all()
+
+def get_multi_rows(db: Session, *, skip: int = 0, limit: int = 100) -> list[Any]:
+    return db.execute(select(*USER_COLUMNS).order_by(User.id).offset(skip).limit(limit)).all()
 
-def create(db: Session, *, obj_in: UserCreate) -> User:
-    db_obj = User(
+def get_page_rows(db: Session, *, cursor: Optional[str] = None, limit: int = 100) -> KeysetPage:
+    return paginate(db, select(*USER_COLUMNS), USER_KEYSET, cursor=cursor, limit=limit, as_rows=True)
+
+def _build_user(obj_in: UserCreate, hashed_password: str) -> User:
+    return User(
         email=obj_in.email,
-        hashed_password=get_password_hash(obj_in.password),
+        hashed_password=hashed_password,
         first_name=obj_in.first_name,
         last_name=obj_in.last_name,
         role=obj_in.role,
         is_active=True,
     )
+
+def create(db: Session, *, obj_in: UserCreate, hashed_password: Optional[str] = None) -> User:
+    db_obj = _build_user(obj_in, hashed_password or get_password_hash(obj_in.password))
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
     return db_obj
 
+def _apply_update(db_obj: User, update_data: Dict[str, Any]) -> None:
+    if any(
+            field in update_data and update_data[field] != getattr(db_obj, field)
+            for field in TOKEN_CLAIM_FIELDS
+    ):
+        # Incremented in SQL so a stale (e.g. cached) db_obj cannot move it backwards
+        update_data["token_version"] = func.coalesce(User.token_version, 0) + 1
+
+    for field in update_data:
+        setattr(db_obj, field, update_data[field])
+
 def update(
         db: Session, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
 ) -> User:
@@ -47,12 +91,13 @@ def update(
         del update_data["password"]
         update_data["hashed_password"] = hashed_password
 
-    for field in update_data:
-        setattr(db_obj, field, update_data[field])
+    _apply_update(db_obj, update_data)
 
     db.add(db_obj)
     db.commit()
+    cache.invalidate(user_tag(db_obj.id))
     db.refresh(db_obj)
+    token_versions.record(db_obj.id, db_obj.token_version)
     return db_obj
 
 def delete(db: Session, *, id: int) -> User:
@@ -61,6 +106,8 @@ def delete(db: Session, *, id: int) -> User:
         raise HTTPException(status_code=404, detail="User not found")
     db.delete(obj)
     db.commit()
+    cache.invalidate(user_tag(id))
+    token_versions.revoke(id)
     return obj
 
 def authenticate(db: Session, *, email: str, password: str) -> Optional[User]:
@@ -71,6 +118,96 @@ def authenticate(db: Session, *, email: str, password: str) -> Optional[User]:
         return None
     return user
 
+async def authenticate_async(
+        db: Union[Session, AsyncSession], *, email: str, password: str
+) -> Optional[User]:
+    """
+    Authenticate with bcrypt running on the hashing pool instead of a request thread.
+    """
+    if isinstance(db, AsyncSession):
+        user = await get_by_email_async(db, email=email)
+    else:
+        user = await run_in_threadpool(get_by_email, db, email=email)
+    if not user:
+        return None
+    try:
+        valid = await verify_password_async(password, user.hashed_password)
+    except PasswordHashingBusy:
+        raise _hashing_busy()
+    if not valid:
+        return None
+    return user
+
+async def create_async(db: Union[Session, AsyncSession], *, obj_in: UserCreate) -> User:
+    """
+    Create a user with the password hashed on the hashing pool.
+    """
+    hashed_password = await _hash_password_async(obj_in.password)
+    if not isinstance(db, AsyncSession):
+        return await run_in_threadpool(create, db, obj_in=obj_in, hashed_password=hashed_password)
+
+    db_obj = _build_user(obj_in, hashed_password)
+    db.add(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
+    return db_obj
+
+async def _hash_password_async(password: str) -> str:
+    try:
+        return await get_password_hash_async(password)
+    except PasswordHashingBusy:
+        raise _hashing_busy()
+
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many concurrent login requests, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+# Async equivalents for handlers running on AsyncSession (app/db/async_session.py)
+
+async def get_async(db: AsyncSession, id: int) -> Optional[User]:
+    return await db.get(User, id)
+
+async def get_by_email_async(db: AsyncSession, email: str) -> Optional[User]:
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
+
+async def get_multi_async(db: AsyncSession, *, skip: int = 0, limit: int = 100) -> list[User]:
+    result = await db.execute(select(User).order_by(User.id).offset(skip).limit(limit))
+    return list(result.scalars().all())
+
+async def update_async(
+        db: AsyncSession, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
+) -> User:
+    if isinstance(obj_in, dict):
+        update_data = dict(obj_in)
+    else:
+        update_data = obj_in.model_dump(exclude_unset=True)
+
+    if "password" in update_data and update_data["password"]:
+        update_data["hashed_password"] = await _hash_password_async(update_data.pop("password"))
+
+    _apply_update(db_obj, update_data)
+
+    db.add(db_obj)
+    await db.commit()
+    cache.invalidate(user_tag(db_obj.id))
+    await db.refresh(db_obj)
+    token_versions.record(db_obj.id, db_obj.token_version)
+    return db_obj
+
+async def delete_async(db: AsyncSession, *, id: int) -> User:
+    obj = await db.get(User, id)
+    if not obj:
+        raise HTTPException(status_code=404, detail="User not found")
+    await db.delete(obj)
+    await db.commit()
+    cache.invalidate(user_tag(id))
+    token_versions.revoke(id)
+    return obj
+
 def is_active(user: User) -> bool:
     return user.is_active
 
@@ -80,8 +217,67 @@ def is_superuser(user: User) -> bool:
 def is_instructor_or_admin(user: User) -> bool:
     return user.role in ["instructor", "admin"]
 
-def create_access_token(user_id: int) -> str:
+def is_token_current(db: Session, token_data: TokenPayload) -> bool:
+    """
+    Check a token's version against the in-memory version map; users not in
+    the map are looked up once.
+    """
+    if token_versions.needs_refresh():
+        refresh_token_versions(db)
+    version = token_versions.get(token_data.sub)
+    if version is None:
+        token_versions.fill(token_data.sub, db.scalar(select(User.token_version).where(User.id == token_data.sub)))
+        version = token_versions.get(token_data.sub)
+    return version == token_data.token_version
+
+def refresh_token_versions(db: Session) -> None:
+    """
+    Load users changed since the last refresh into the token version map.
+    """
+    since = token_versions.begin_refresh()
+    if since is None:
+        return
+    rows = []
+    try:
+        rows = db.query(User.id, User.token_version, User.updated_at).filter(
+            User.updated_at > since
+        ).all()
+    finally:
+        token_versions.finish_refresh(rows)
+
+async def is_token_current_async(db: AsyncSession, token_data: TokenPayload) -> bool:
+    if token_versions.needs_refresh():
+        await refresh_token_versions_async(db)
+    version = token_versions.get(token_data.sub)
+    if version is None:
+        token_versions.fill(
+            token_data.sub, await db.scalar(select(User.token_version).where(User.id == token_data.sub))
+        )
+        version = token_versions.get(token_data.sub)
+    return version == token_data.token_version
+
+async def refresh_token_versions_async(db: AsyncSession) -> None:
+    since = token_versions.begin_refresh()
+    if since is None:
+        return
+    rows = []
+    try:
+        result = await db.execute(
+            select(User.id, User.token_version, User.updated_at).where(User.updated_at > since)
+        )
+        rows = result.all()
+    finally:
+        token_versions.finish_refresh(rows)
+
+def create_access_token(user: User) -> str:
+    token_versions.fill(user.id, user.token_version or 0)
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode = {"exp": expire, "sub": str(user_id)}
+    to_encode = {
+        "exp": expire,
+        "sub": str(user.id),
+        "role": user.role,
+        "is_active": user.is_active,
+        "token_version": user.token_version or 0,
+    }
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
     return encoded_jwt
\ No newline at end of file
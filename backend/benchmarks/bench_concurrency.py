@@ -0,0 +1,96 @@
+# backend/benchmarks/bench_concurrency.py
+"""
+Concurrency ceiling of sync (threadpool) routes against async routes.
+
+A sync route holds one threadpool token while it waits on I/O, so a worker
+serves at most THREADPOOL_TOKENS of them at a time and the rest queue. An
+async route waits on the event loop and takes no token. Each case fires
+``--concurrency`` simultaneous requests at an in-process app whose routes
+wait ``--latency-ms`` per request (a stand-in for a database round trip),
+using the same dependency shapes as app/api/deps.py.
+
+Run from backend/:
+
+    python -m benchmarks.bench_concurrency [--concurrency 500] [--latency-ms 50] [--tokens 40,200]
+
+The "ideal" column is the latency itself: what every request would see if
+nothing queued.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import anyio.to_thread
+import httpx
+from fastapi import Depends, FastAPI
+
+
+def _build_app(latency: float) -> FastAPI:
+    app = FastAPI()
+
+    # Sync chain: dependency and handler both run on the threadpool
+    def sync_principal() -> int:
+        time.sleep(latency / 2)
+        return 1
+
+    @app.get("/sync")
+    def sync_route(principal: int = Depends(sync_principal)):
+        time.sleep(latency / 2)
+        return {"principal": principal}
+
+    # Async chain, as with get_current_active_user_async and AsyncSession
+    async def async_principal() -> int:
+        await asyncio.sleep(latency / 2)
+        return 1
+
+    @app.get("/async")
+    async def async_route(principal: int = Depends(async_principal)):
+        await asyncio.sleep(latency / 2)
+        return {"principal": principal}
+
+    return app
+
+
+async def _burst(app: FastAPI, path: str, concurrency: int) -> List[float]:
+    transport = httpx.ASGITransport(app=app)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", limits=limits) as client:
+        async def one() -> float:
+            started = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            return time.perf_counter() - started
+
+        return await asyncio.gather(*(one() for _ in range(concurrency)))
+
+
+async def _case(app: FastAPI, path: str, concurrency: int, tokens: int) -> None:
+    anyio.to_thread.current_default_thread_limiter().total_tokens = tokens
+    await _burst(app, path, min(concurrency, 20))  # warm up the routes and worker threads
+    started = time.perf_counter()
+    timings = sorted(await _burst(app, path, concurrency))
+    elapsed = time.perf_counter() - started
+    p50 = statistics.median(timings) * 1000
+    p99 = timings[int(len(timings) * 0.99) - 1] * 1000
+    label = f"{path[1:]} ({tokens} tokens)" if path == "/sync" else path[1:]
+    print(f"{label:<20}{concurrency / elapsed:>10.0f}{p50:>10.1f}{p99:>10.1f}{timings[-1] * 1000:>10.1f}")
+
+
+async def run(concurrency: int, latency_ms: float, tokens: List[int]) -> None:
+    app = _build_app(latency_ms / 1000)
+    print(f"{concurrency} concurrent requests, {latency_ms:.0f} ms of I/O each (ideal {latency_ms:.0f} ms)")
+    print(f"{'route':<20}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for count in tokens:
+        await _case(app, "/sync", concurrency, count)
+    await _case(app, "/async", concurrency, tokens[0])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--tokens", default="40,200")
+    args = parser.parse_args()
+    anyio.run(run, args.concurrency, args.latency_ms, [int(count) for count in args.tokens.split(",")])
@@ -0,0 +1,131 @@
+# backend/benchmarks/bench_write_round_trips.py
+"""
+Statements and time per service mutation: the old add/commit/refresh
+pattern against the RETURNING write path the services use now.
+
+Run from backend/:
+
+    python -m benchmarks.bench_write_round_trips [--iterations N] [--database-url URL]
+
+Defaults to a throwaway SQLite database. Pointing --database-url at an
+empty PostgreSQL database shows the network round trips saved.
+"""
+import argparse
+import statistics
+import time
+from typing import Callable, List, Tuple
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.db.query_stats import track_queries
+from app.models.course import Course, Lesson, Module
+from app.models.enrollment import Enrollment
+from app.models.forum import ForumTopic
+from app.models.progress import LessonCompletion
+from app.models.user import User
+from app.schemas.course import CourseCreate
+from app.schemas.enrollment import EnrollmentCreate
+from app.schemas.forum import ForumTopicCreate
+from app.schemas.progress import LessonCompletionCreate
+from app.services import course_service, enrollment_service, forum_service, progress_service
+
+
+def _legacy_write(db: Session, obj) -> None:
+    # What every service create/update used to do
+    db.add(obj)
+    db.commit()
+    db.refresh(obj)
+
+
+def _measure(label: str, fn: Callable[[int], None], iterations: int) -> Tuple[str, float, float]:
+    counts: List[int] = []
+    timings: List[float] = []
+    for i in range(iterations):
+        with track_queries(strict_limit=0) as stats:
+            started = time.perf_counter()
+            fn(i)
+            timings.append((time.perf_counter() - started) * 1000)
+        counts.append(stats.statements)
+    return label, statistics.mean(counts), statistics.median(timings)
+
+
+def run(database_url: str, iterations: int) -> None:
+    if database_url.startswith("sqlite"):
+        engine = create_engine(database_url, poolclass=StaticPool, connect_args={"check_same_thread": False})
+    else:
+        engine = create_engine(database_url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    # The old services ran on an expiring session and refreshed after commit
+    legacy = sessionmaker(bind=engine, autoflush=False)()
+    current = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)()
+
+    user = User(email="bench@example.com", first_name="Bench", last_name="Mark", hashed_password="x")
+    _legacy_write(legacy, user)
+    users = [User(email=f"bench{i}@example.com", first_name="B", last_name="M", hashed_password="x")
+             for i in range(iterations * 2)]
+    legacy.add_all(users)
+    legacy.commit()
+    user_ids = [u.id for u in users]
+    course = Course(title="Bench", creator_id=user.id, difficulty_level="beginner")
+    _legacy_write(legacy, course)
+    module = Module(title="Bench", course_id=course.id, order_index=1)
+    _legacy_write(legacy, module)
+    lessons = [Lesson(title=f"L{i}", content="...", module_id=module.id, order=i) for i in range(iterations * 2)]
+    legacy.add_all(lessons)
+    legacy.commit()
+    lesson_ids = [lesson.id for lesson in lessons]
+    course_id, module_id, user_id = course.id, module.id, user.id
+
+    course_in = CourseCreate(title="Bench course", difficulty_level="beginner")
+    topic_in = ForumTopicCreate(title="Bench topic", content="...", course_id=course_id)
+    completion_in = LessonCompletionCreate()
+
+    legacy_course = legacy.get(Course, course_id)
+    current_course = current.get(Course, course_id)
+
+    rows = []
+    pairs = [
+        ("create course",
+         lambda i: _legacy_write(legacy, course_service._build_course(course_in, user_id)),
+         lambda i: course_service.create(current, obj_in=course_in, creator_id=user_id)),
+        ("update course",
+         lambda i: (setattr(legacy_course, "title", f"Legacy {i}"), legacy.commit(), legacy.refresh(legacy_course)),
+         lambda i: course_service.update(current, db_obj=current_course, obj_in={"title": f"Current {i}"})),
+        ("create forum topic",
+         lambda i: _legacy_write(legacy, ForumTopic(**topic_in.model_dump(), user_id=user_id)),
+         lambda i: forum_service.create_topic(current, topic_in, user_id)),
+        ("enroll in course",
+         lambda i: (enrollment_service.get_by_user_and_course(legacy, user_id=user_ids[i], course_id=course_id),
+                    _legacy_write(legacy, Enrollment(user_id=user_ids[i], course_id=course_id))),
+         lambda i: enrollment_service.create(
+             current, obj_in=EnrollmentCreate(user_id=user_ids[iterations + i], course_id=course_id))),
+        ("mark lesson complete",
+         lambda i: (legacy.query(LessonCompletion).filter_by(user_id=user_id, lesson_id=lesson_ids[i]).first(),
+                    _legacy_write(legacy, LessonCompletion(user_id=user_id, lesson_id=lesson_ids[i]))),
+         lambda i: progress_service.mark_lesson_complete(
+             current, user_id, lesson_ids[iterations + i], completion_in)),
+    ]
+    for label, legacy_fn, current_fn in pairs:
+        rows.append((label,) + _measure(label, legacy_fn, iterations)[1:] + _measure(label, current_fn, iterations)[1:])
+
+    print(f"{'mutation':<22}{'refresh stmts':>15}{'ms':>8}{'returning stmts':>18}{'ms':>8}{'saved':>7}")
+    for label, old_count, old_ms, new_count, new_ms in rows:
+        print(f"{label:<22}{old_count:>15.1f}{old_ms:>8.2f}{new_count:>18.1f}{new_ms:>8.2f}{old_count - new_count:>7.1f}")
+    print("(statement counts exclude COMMIT)")
+
+    legacy.close()
+    current.close()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--database-url", default="sqlite://")
+    args = parser.parse_args()
+    run(args.database_url, args.iterations)
@@ -3,13 +3,24 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool, StaticPool
 
 from app.main import app
-from app.db.base import Base, get_db
+from app.db.base import Base
+from app.db.async_session import get_async_db
+from app.db.session import get_db
+from app.db import content_store
+from app.core.cache import cache
 from app.core.config import settings
 from app.services import user_service
 
+# Tables come from create_all below, not from Alembic
+settings.DB_STARTUP_MODE = "skip"
+
+# Fail tests on N+1 query patterns
+settings.SQL_STRICT_REPEAT_LIMIT = 10
+
 # Test database setup
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(
@@ -19,8 +30,21 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine on the same database file; NullPool so no connection outlives its event loop
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Tests build their own databases, so cached rows must not leak between them
+    cache.clear()
+    content_store.content_cache.clear()
+    yield
+    cache.clear()
+    content_store.content_cache.clear()
+
 @pytest.fixture(scope="session")
-def db():
+def shared_db():
     # Create tables
     Base.metadata.create_all(bind=engine)
 
@@ -31,15 +55,38 @@ def db():
     finally:
         db.close()
 
+@pytest.fixture
+def session_factory(tmp_path):
+    # A database of the test's own, so row and statement counts see only its writes
+    test_engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=test_engine)
+    yield sessionmaker(bind=test_engine, autoflush=False, expire_on_commit=False)
+    test_engine.dispose()
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+@pytest.fixture
+def async_session_factory(shared_db):
+    return TestingAsyncSessionLocal
+
 @pytest.fixture(scope="module")
-def client(db):
+def client(shared_db):
     def override_get_db():
         try:
-            yield db
+            yield shared_db
         finally:
             pass
 
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as async_db:
+            yield async_db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
 
     with TestClient(app) as c:
         yield c
@@ -47,7 +94,7 @@ def client(db):
     app.dependency_overrides.clear()
 
 @pytest.fixture(scope="module")
-def test_user(db):
+def test_user(shared_db):
     user_data = {
         "email": "test@example.com",
         "password": "TestPassword123",
@@ -56,17 +103,17 @@ def test_user(db):
         "role": "student"
     }
 
-    user = user_service.get_by_email(db, email=user_data["email"])
+    user = user_service.get_by_email(shared_db, email=user_data["email"])
     if not user:
         user = user_service.create(
-            db,
+            shared_db,
             obj_in=user_data
         )
 
     return user
 
 @pytest.fixture(scope="module")
-def test_instructor(db):
+def test_instructor(shared_db):
     user_data = {
         "email": "instructor@example.com",
         "password": "InstructorPass123",
@@ -75,17 +122,17 @@ def test_instructor(db):
         "role": "instructor"
     }
 
-    user = user_service.get_by_email(db, email=user_data["email"])
+    user = user_service.get_by_email(shared_db, email=user_data["email"])
     if not user:
         user = user_service.create(
-            db,
+            shared_db,
             obj_in=user_data
         )
 
     return user
 
 @pytest.fixture(scope="module")
-def test_admin(db):
+def test_admin(shared_db):
     user_data = {
         "email": "admin@example.com",
         "password": "AdminPass123",
@@ -94,10 +141,10 @@ def test_admin(db):
         "role": "admin"
     }
 
-    user = user_service.get_by_email(db, email=user_data["email"])
+    user = user_service.get_by_email(shared_db, email=user_data["email"])
     if not user:
         user = user_service.create(
-            db,
+            shared_db,
             obj_in=user_data
         )
 
@@ -0,0 +1,118 @@
+# backend/tests/services/fake_redis.py
+import fnmatch
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+Key = Union[str, bytes]
+
+
+def _bytes(value: Any) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode()
+
+
+class FakeRedis:
+    """
+    In-memory stand-in for a redis-py client, covering the commands used by
+    ``RedisBackend``, for the cache tests.
+    """
+
+    def __init__(self):
+        self._data: Dict[bytes, Tuple[Optional[float], Any]] = {}
+        self._lock = threading.RLock()
+        self.expired_keys = 0
+
+    def _live(self, key: Key) -> Optional[Any]:
+        key = _bytes(key)
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            self.expired_keys += 1
+            return None
+        return value
+
+    def get(self, key: Key) -> Optional[bytes]:
+        with self._lock:
+            return self._live(key)
+
+    def set(self, key: Key, value: Any, ex: Optional[int] = None) -> bool:
+        with self._lock:
+            expires_at = time.monotonic() + ex if ex else None
+            self._data[_bytes(key)] = (expires_at, _bytes(value))
+            return True
+
+    def delete(self, *keys: Key) -> int:
+        with self._lock:
+            return sum(self._data.pop(_bytes(key), None) is not None for key in keys)
+
+    def incr(self, key: Key) -> int:
+        with self._lock:
+            value = int(self._live(key) or 0) + 1
+            expires_at = self._data.get(_bytes(key), (None, None))[0]
+            self._data[_bytes(key)] = (expires_at, _bytes(value))
+            return value
+
+    def sadd(self, key: Key, *members: Key) -> int:
+        with self._lock:
+            current = self._live(key)
+            if current is None:
+                current = set()
+                self._data[_bytes(key)] = (None, current)
+            before = len(current)
+            current.update(_bytes(member) for member in members)
+            return len(current) - before
+
+    def smembers(self, key: Key) -> set:
+        with self._lock:
+            return set(self._live(key) or ())
+
+    def expire(self, key: Key, seconds: int, nx: bool = False, gt: bool = False) -> bool:
+        with self._lock:
+            value = self._live(key)
+            if value is None:
+                return False
+            current = self._data[_bytes(key)][0]
+            new = time.monotonic() + seconds
+            # Same rules as Redis: NX only sets a missing TTL, GT treats a missing TTL as infinite
+            if (nx and current is not None) or (gt and (current is None or new <= current)):
+                return False
+            self._data[_bytes(key)] = (new, value)
+            return True
+
+    def scan_iter(self, match: str = "*") -> Iterator[bytes]:
+        with self._lock:
+            keys = [key for key in list(self._data) if self._live(key) is not None]
+        return iter([key for key in keys if fnmatch.fnmatchcase(key.decode(), match)])
+
+    def info(self, section: Optional[str] = None) -> Dict[str, int]:
+        return {"evicted_keys": 0, "expired_keys": self.expired_keys}
+
+    def pipeline(self) -> "FakePipeline":
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """
+    Queues commands and runs them on ``execute``, like a redis-py pipeline.
+    """
+
+    def __init__(self, client: FakeRedis):
+        self.client = client
+        self._commands: List[Tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        def queue(*args: Any, **kwargs: Any) -> "FakePipeline":
+            self._commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self) -> List[Any]:
+        with self.client._lock:
+            results = [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self._commands]
+        self._commands = []
+        return results
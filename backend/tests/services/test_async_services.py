@@ -0,0 +1,298 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from app.api import deps
+from app.core.token_versions import token_versions
+from app.db import content_store
+from app.models.assessment import Answer, Question
+from app.models.course import RenderedContent, SearchDocument
+from app.schemas.assessment import AssessmentCreate
+from app.schemas.course import CourseCreate, LessonCreate, ModuleCreate
+from app.schemas.enrollment import EnrollmentCreate
+from app.schemas.forum import ForumReplyCreate, ForumTopicCreate
+from app.schemas.progress import LessonCompletionCreate
+from app.schemas.user import UserCreate
+from app.services import (
+    assessment_service,
+    course_service,
+    enrollment_service,
+    facet_service,
+    forum_service,
+    outline_service,
+    progress_service,
+    user_service,
+)
+
+
+async def _user_async(db, email: str, role: str = "student"):
+    user = await user_service.get_by_email_async(db, email=email)
+    if not user:
+        user = await user_service.create_async(db, obj_in=UserCreate(
+            email=email, password="AsyncPass123", first_name="Async", last_name="Writer", role=role
+        ))
+    return user
+
+
+async def _outline_async(db, course_id: int):
+    outline = await db.run_sync(outline_service.get, course_id)
+    return json.loads(outline_service.body(outline)) if outline else None
+
+
+async def _search_documents(db, course_id: int):
+    result = await db.execute(
+        select(SearchDocument.kind, SearchDocument.title).where(SearchDocument.course_id == course_id)
+    )
+    return sorted(result.all())
+
+
+async def _certifications(db):
+    counts = await db.run_sync(facet_service.get_counts, published_only=False)
+    return counts["certification_type"]
+
+
+def test_async_user_and_course_round_trip(async_session_factory):
+    async def scenario():
+        async with async_session_factory() as db:
+            user = await user_service.get_by_email_async(db, email="async-instructor@example.com")
+            if not user:
+                user = await user_service.create_async(db, obj_in=UserCreate(
+                    email="async-instructor@example.com", password="AsyncPass123",
+                    first_name="Async", last_name="Instructor", role="instructor"
+                ))
+            authenticated = await user_service.authenticate_async(
+                db, email="async-instructor@example.com", password="AsyncPass123"
+            )
+            assert authenticated.id == user.id
+
+            course = await course_service.create_async(db, obj_in=CourseCreate(
+                title="Async Security+", difficulty_level="beginner"
+            ), creator_id=user.id)
+            assert course.created_at is not None
+            assert course.modules == []
+
+            progress = await progress_service.get_course_progress_async(
+                db, user_id=user.id, course_id=course.id
+            )
+            assert progress.total_lessons == 0
+
+            topic = await forum_service.create_topic_async(db, obj_in=ForumTopicCreate(
+                title="Welcome", content="Hello", course_id=course.id
+            ), user_id=user.id)
+            assert topic.replies == []
+
+        async with async_session_factory() as db:
+            loaded = await course_service.get_async(db, id=course.id)
+            assert loaded.title == "Async Security+"
+
+    asyncio.run(scenario())
+
+
+def test_async_token_chain_refreshes_and_revokes(async_session_factory):
+    async def scenario():
+        async with async_session_factory() as db:
+            user = await user_service.get_by_email_async(db, email="async-token@example.com")
+            if not user:
+                user = await user_service.create_async(db, obj_in=UserCreate(
+                    email="async-token@example.com", password="AsyncPass123",
+                    first_name="Async", last_name="Token"
+                ))
+            token = user_service.create_access_token(user)
+
+            # An empty version map is refreshed from the users table on the async session
+            token_versions.clear()
+            token_data = await deps.get_token_data_async(db=db, token=token)
+            assert token_data.sub == user.id
+            active = await deps.get_active_token_data_async(token_data=token_data)
+            assert await deps.get_current_user_async(db=db, token_data=active) is not None
+
+            token_versions.revoke(user.id)
+            with pytest.raises(HTTPException) as revoked:
+                await deps.get_token_data_async(db=db, token=token)
+            assert revoked.value.status_code == 401
+            with pytest.raises(HTTPException) as forbidden:
+                await deps.get_superuser_token_data_async(token_data=active)
+            assert forbidden.value.status_code == 403
+
+    asyncio.run(scenario())
+
+
+def test_async_course_writers_maintain_derived_state(async_session_factory):
+    # The same outline, search, facet and render rows as the sync writers
+    async def scenario():
+        async with async_session_factory() as db:
+            user = await _user_async(db, "async-writer@example.com", role="instructor")
+            course = await course_service.create_async(db, obj_in=CourseCreate(
+                title="Async writes", difficulty_level="beginner", certification_type="async-cert"
+            ), creator_id=user.id)
+            module = await course_service.create_module_async(
+                db, obj_in=ModuleCreate(title="Async module", order_index=1), course_id=course.id
+            )
+            await course_service.create_lesson_async(
+                db, obj_in=LessonCreate(title="Async lesson", content="Some **async** body"), module_id=module.id
+            )
+
+            outline = await _outline_async(db, course.id)
+            assert outline["title"] == "Async writes"
+            assert [m["title"] for m in outline["modules"]] == ["Async module"]
+            assert [entry["title"] for entry in outline["modules"][0]["lessons"]] == ["Async lesson"]
+            assert await _search_documents(db, course.id) == [
+                ("course", "Async writes"), ("lesson", "Async lesson"), ("module", "Async module"),
+            ]
+            assert (await _certifications(db))["async-cert"] == 1
+            rendered = await db.get(RenderedContent, content_store.digest("Some **async** body"))
+            assert "<strong>async</strong>" in rendered.html
+
+            course = await course_service.get_async(db, id=course.id)
+            await course_service.update_async(
+                db, db_obj=course, obj_in={"title": "Async renamed", "certification_type": "async-other"}
+            )
+            assert (await _outline_async(db, course.id))["title"] == "Async renamed"
+            assert ("course", "Async renamed") in await _search_documents(db, course.id)
+            certifications = await _certifications(db)
+            assert "async-cert" not in certifications
+            assert certifications["async-other"] == 1
+
+            await course_service.delete_async(db, id=course.id)
+            assert await _outline_async(db, course.id) is None
+            assert await _search_documents(db, course.id) == []
+            assert "async-other" not in await _certifications(db)
+
+    asyncio.run(scenario())
+
+
+def test_async_user_writers_invalidate_the_principal(async_session_factory):
+    async def scenario():
+        async with async_session_factory() as db:
+            user = await _user_async(db, "async-update@example.com")
+            assert (await db.run_sync(user_service.get, user.id)).role == "student"
+
+            await user_service.update_async(db, db_obj=user, obj_in={"role": "instructor"})
+            db.expunge_all()
+            assert (await db.run_sync(user_service.get, user.id)).role == "instructor"
+
+            await user_service.delete_async(db, id=user.id)
+            assert await db.run_sync(user_service.get, user.id) is None
+
+    asyncio.run(scenario())
+
+
+def test_async_enrollment_writers(async_session_factory):
+    async def scenario():
+        async with async_session_factory() as db:
+            instructor = await _user_async(db, "async-enroll-instructor@example.com", role="instructor")
+            student = await _user_async(db, "async-enroll-student@example.com")
+            course = await course_service.create_async(db, obj_in=CourseCreate(
+                title="Async enrollments", difficulty_level="beginner"
+            ), creator_id=instructor.id)
+            obj_in = EnrollmentCreate(user_id=student.id, course_id=course.id)
+
+            enrollment = await enrollment_service.create_async(db, obj_in=obj_in)
+            with pytest.raises(HTTPException) as duplicate:
+                await enrollment_service.create_async(db, obj_in=obj_in)
+            assert duplicate.value.status_code == 400
+
+            await enrollment_service.update_async(db, db_obj=enrollment, obj_in={"status": "withdrawn"})
+            reactivated = await enrollment_service.create_async(db, obj_in=obj_in)
+            assert reactivated.id == enrollment.id
+            assert reactivated.status == "active"
+
+            updated = await enrollment_service.update_async(db, db_obj=enrollment, obj_in={"status": "completed"})
+            assert updated.completed_at is not None
+
+            await enrollment_service.delete_async(db, enrollment_id=enrollment.id)
+            assert await enrollment_service.get_async(db, enrollment.id) is None
+
+    asyncio.run(scenario())
+
+
+def test_async_lesson_completion_and_reply(async_session_factory):
+    async def scenario():
+        async with async_session_factory() as db:
+            user = await _user_async(db, "async-progress@example.com", role="instructor")
+            course = await course_service.create_async(db, obj_in=CourseCreate(
+                title="Async progress", difficulty_level="beginner"
+            ), creator_id=user.id)
+            module = await course_service.create_module_async(
+                db, obj_in=ModuleCreate(title="Progress module", order_index=1), course_id=course.id
+            )
+            lesson = await course_service.create_lesson_async(
+                db, obj_in=LessonCreate(title="Progress lesson", content="x"), module_id=module.id
+            )
+
+            completion = await progress_service.mark_lesson_complete_async(
+                db, user_id=user.id, lesson_id=lesson.id,
+                completion_data=LessonCompletionCreate(completion_percentage=50),
+            )
+            again = await progress_service.mark_lesson_complete_async(
+                db, user_id=user.id, lesson_id=lesson.id,
+                completion_data=LessonCompletionCreate(notes="done"),
+            )
+            assert again.id == completion.id
+            assert (again.notes, again.completion_percentage) == ("done", 50)
+            progress = await progress_service.get_course_progress_async(db, user_id=user.id, course_id=course.id)
+            assert progress.completed_lessons == 1
+
+            topic = await forum_service.create_topic_async(db, obj_in=ForumTopicCreate(
+                title="Async replies", content="Hello", course_id=course.id
+            ), user_id=user.id)
+            reply = await forum_service.create_reply_async(
+                db, obj_in=ForumReplyCreate(content="Hi"), topic_id=topic.id, user_id=user.id
+            )
+            assert reply.id is not None
+
+        async with async_session_factory() as db:
+            loaded = await forum_service.get_topic_async(db, topic.id)
+            assert [r.content for r in loaded.replies] == ["Hi"]
+
+    asyncio.run(scenario())
+
+
+def test_async_assessment_writers(async_session_factory):
+    async def scenario():
+        async with async_session_factory() as db:
+            user = await _user_async(db, "async-assessment@example.com", role="instructor")
+            course = await course_service.create_async(db, obj_in=CourseCreate(
+                title="Async assessments", difficulty_level="beginner"
+            ), creator_id=user.id)
+            assessment = await assessment_service.create_async(
+                db, obj_in=AssessmentCreate(title="Quiz", course_id=course.id)
+            )
+            question = Question(assessment_id=assessment.id, question_text="2 + 2?", question_type="mcq", points=2)
+            db.add(question)
+            await db.flush()
+            right = Answer(question_id=question.id, answer_text="4", is_correct=True)
+            wrong = Answer(question_id=question.id, answer_text="5", is_correct=False)
+            db.add_all([right, wrong])
+            await db.commit()
+
+            assessment = await assessment_service.update_async(db, db_obj=assessment, obj_in={"is_published": True})
+            assert assessment.is_published
+            assert [q.id for q in assessment.questions] == [question.id]
+
+            started = await assessment_service.start_assessment_async(
+                db, user_id=user.id, assessment_id=assessment.id
+            )
+            submitted = await assessment_service.submit_assessment_async(
+                db, user_assessment_id=started.id,
+                answers=[{"question_id": question.id, "answer_id": right.id}],
+            )
+            assert submitted.status == "completed"
+            assert submitted.score == 100
+            assert [a.is_correct for a in submitted.answers] == [True]
+            with pytest.raises(HTTPException) as resubmitted:
+                await assessment_service.submit_assessment_async(
+                    db, user_assessment_id=started.id, answers=[]
+                )
+            assert resubmitted.value.status_code == 400
+
+            draft = await assessment_service.create_async(
+                db, obj_in=AssessmentCreate(title="Draft", course_id=course.id)
+            )
+            await assessment_service.delete_async(db, assessment_id=draft.id)
+            assert await assessment_service.get_async(db, draft.id) is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,115 @@
+# backend/tests/services/test_cache.py
+import time
+
+import pytest
+
+from app.core.cache import Cache, LRUBackend, RedisBackend, course_tag
+from app.db.query_stats import track_queries
+from app.models.course import Course, Module
+from app.models.user import User
+from app.schemas.course import LessonCreate, ModuleCreate
+from app.services import course_service
+
+from .fake_redis import FakeRedis
+
+
+@pytest.fixture(params=["memory", "redis"])
+def cache(request):
+    if request.param == "memory":
+        backend = LRUBackend(max_entries=2)
+    else:
+        backend = RedisBackend(FakeRedis(), prefix="test:")
+    return Cache(backend, default_ttl_seconds=60)
+
+
+def test_get_set_delete_and_ttl(cache):
+    cache.set("a", {"value": 1})
+    assert cache.get("a") == {"value": 1}
+    cache.delete("a")
+    assert cache.get("a") is None
+
+    cache.set("short", 1, ttl=1)
+    time.sleep(1.05)
+    assert cache.get("short") is None
+
+
+def test_tags_and_generation(cache):
+    cache.set("a", 1, tags=["course:1"])
+    cache.set("b", 2, tags=["course:2"])
+
+    started = cache.generation()
+    cache.invalidate("course:1")
+    assert cache.get("a") is None and cache.get("b") == 2
+
+    # A value computed from reads that started before a write is not stored
+    cache.set("a", "stale", tags=["course:1"], generation=started)
+    assert cache.get("a") is None
+    assert cache.stats()["stale_sets_skipped"] == 1
+
+
+def test_unsigned_entries_are_never_unpickled(cache):
+    cache.set("a", 1)
+    # Written by something without the key, e.g. another client of a shared Redis
+    Cache(cache.backend, default_ttl_seconds=60, secret="other").set("a", "forged")
+    cache.backend.set("b", b"\x80\x04K\x01.", 60, ())
+    assert cache.get("a") is None and cache.get("b") is None
+    assert cache.stats()["rejected"] == 2
+
+
+def test_lru_evicts_least_recently_used():
+    cache = Cache(LRUBackend(max_entries=2), default_ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None and cache.get("a") == 1
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["entries"] == 2
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+
+
+def test_cached_service_returns_rows_attached_to_the_callers_session(session_factory, cache):
+    session = session_factory()
+    session.add(User(id=1, email="cached@example.com", first_name="C", last_name="D", hashed_password="x"))
+    session.add(Course(id=1, title="Cached", creator_id=1, difficulty_level="beginner"))
+    session.commit()
+    course_service.create_module(session, obj_in=ModuleCreate(title="M", order_index=1), course_id=1)
+    session.close()
+
+    get_course = cache.cached("course", tags=lambda course, id: [course_tag(id)])(course_service.get.uncached)
+    get_modules = cache.cached("modules", relationships=("lessons",))(course_service.get_course_modules.uncached)
+    get_course(session_factory(), 1)
+    get_modules(session_factory(), 1)
+
+    session = session_factory()
+    with track_queries(strict_limit=0) as stats:
+        course = get_course(session, 1)
+        modules = get_modules(session, 1)
+        assert modules[0].lessons == []
+    assert stats.statements == 0
+    assert course in session and isinstance(modules[0], Module)
+
+    # Writes through the hit object are plain UPDATEs on the caller's session
+    course.title = "Renamed"
+    session.commit()
+    cache.invalidate(course_tag(1))
+    assert get_course(session_factory(), 1).title == "Renamed"
+    session.close()
+
+
+def test_adopters_are_invalidated_by_writes(session_factory):
+    session = session_factory()
+    session.add(User(id=1, email="adopter@example.com", first_name="A", last_name="D", hashed_password="x"))
+    session.add(Course(id=1, title="Adopted", creator_id=1, difficulty_level="beginner"))
+    session.commit()
+    module = course_service.create_module(session, obj_in=ModuleCreate(title="M", order_index=1), course_id=1)
+    session.close()
+
+    assert course_service.get_course_modules(session_factory(), 1)[0].lessons == []
+    course_service.create_lesson(session_factory(), obj_in=LessonCreate(title="L", content="x"), module_id=module.id)
+    assert [lesson.title for lesson in course_service.get_course_modules(session_factory(), 1)[0].lessons] == ["L"]
+
+    session = session_factory()
+    course_service.update(session, db_obj=course_service.get(session, 1), obj_in={"title": "Changed"})
+    assert course_service.get(session_factory(), 1).title == "Changed"
@@ -0,0 +1,37 @@
+# backend/tests/services/test_catalog_cache.py
+import json
+
+from app.db.query_stats import track_queries
+from app.models.user import User
+from app.schemas.course import CourseCreate, LessonCreate, ModuleCreate
+from app.services import course_service
+
+
+def _catalog(db, published_only=False):
+    with track_queries(strict_limit=0) as stats:
+        _, body = course_service.get_catalog(db, published_only=published_only)
+    return json.loads(body), stats.statements
+
+
+def test_catalog_served_from_cache_until_a_write(db):
+    user = User(email="catalog@example.com", first_name="Cat", last_name="Alog", hashed_password="x")
+    db.add(user)
+    db.commit()
+    course = course_service.create(
+        db, obj_in=CourseCreate(title="Listed", difficulty_level="beginner"), creator_id=user.id
+    )
+
+    courses, statements = _catalog(db)
+    assert [c["title"] for c in courses] == ["Listed"] and statements > 0
+    assert _catalog(db) == (courses, 0)
+    assert _catalog(db, published_only=True)[0] == []
+
+    module = course_service.create_module(db, obj_in=ModuleCreate(title="M", order_index=1), course_id=course.id)
+    course_service.create_lesson(db, obj_in=LessonCreate(title="L", content="x"), module_id=module.id)
+    db.expunge_all()  # as in the next request's session
+    courses, statements = _catalog(db)
+    assert len(courses[0]["modules"][0]["lessons"]) == 1 and statements > 0
+
+    course_service.update(db, db_obj=course_service.get(db, course.id), obj_in={"is_published": True})
+    assert [c["title"] for c in _catalog(db, published_only=True)[0]] == ["Listed"]
+
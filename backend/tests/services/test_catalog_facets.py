@@ -0,0 +1,90 @@
+# backend/tests/services/test_catalog_facets.py
+import json
+
+from sqlalchemy import func, select
+
+from app.api.deps import CourseFilters
+from app.models.course import Course
+from app.models.user import User
+from app.schemas.course import CourseCreate
+from app.services import course_service, facet_service
+
+
+def _filters(**kwargs):
+    values = {"certification_type": None, "difficulty_level": None, "min_duration": None,
+              "max_duration": None, "facets": False}
+    return CourseFilters(**{**values, **kwargs})
+
+
+def _catalog(db, published_only=False, **filters):
+    _, body = course_service.get_catalog(db, published_only=published_only, filters=_filters(**filters))
+    return json.loads(body)
+
+
+def _grouped(db, column):
+    rows = db.execute(select(column, func.count()).where(column.is_not(None)).group_by(column)).all()
+    return dict(rows)
+
+
+def test_facet_counts_follow_course_writes(db):
+    user = User(email="facets@example.com", first_name="Fa", last_name="Cets", hashed_password="x")
+    db.add(user)
+    db.commit()
+    courses = [
+        course_service.create(
+            db, obj_in=CourseCreate(title=title, certification_type=certification, difficulty_level=difficulty,
+                                    estimated_duration=hours),
+            creator_id=user.id,
+        )
+        for title, certification, difficulty, hours in [
+            ("Sec+ basics", "Security+", "beginner", 10),
+            ("Sec+ labs", "Security+", "intermediate", 30),
+            ("CEH", "CEH", "advanced", 40),
+            ("Intro", None, "beginner", 5),
+        ]
+    ]
+    course_service.update(db, db_obj=courses[0], obj_in={"is_published": True})
+
+    page = _catalog(db, facets=True)
+    assert page["facets"] == {
+        "certification_type": {"CEH": 1, "Security+": 2},
+        "difficulty_level": {"advanced": 1, "beginner": 2, "intermediate": 1},
+    }
+    assert page["facets"]["difficulty_level"] == _grouped(db, Course.difficulty_level)
+    assert _catalog(db, published_only=True, facets=True)["facets"] == {
+        "certification_type": {"Security+": 1}, "difficulty_level": {"beginner": 1},
+    }
+
+    # Changing a facet moves the course between buckets, and filtered pages follow
+    assert [c["title"] for c in _catalog(db, difficulty_level="advanced")] == ["CEH"]
+    course_service.update(db, db_obj=courses[1], obj_in={"difficulty_level": "advanced"})
+    course_service.delete(db, id=courses[2].id)
+    assert [c["title"] for c in _catalog(db, difficulty_level="advanced")] == ["Sec+ labs"]
+    assert _catalog(db, facets=True)["facets"] == {
+        "certification_type": {"Security+": 2},
+        "difficulty_level": {"advanced": 1, "beginner": 2},
+    }
+
+    assert [c["title"] for c in _catalog(db, certification_type="Security+", max_duration=20)] == ["Sec+ basics"]
+    assert [c["title"] for c in _catalog(db, min_duration=20)] == ["Sec+ labs"]
+
+
+def test_concurrent_publishes_count_once(session_factory):
+    first, second = session_factory(), session_factory()
+    user = User(email="twice@example.com", first_name="Twi", last_name="Ce", hashed_password="x")
+    first.add(user)
+    first.commit()
+    course = course_service.create(
+        first, obj_in=CourseCreate(title="Once", certification_type="CEH", difficulty_level="beginner"),
+        creator_id=user.id,
+    )
+    # Both requests read the unpublished course, then publish it in turn
+    stale = second.get(Course, course.id)
+    course_service.update(first, db_obj=course, obj_in={"is_published": True})
+    course_service.update(second, db_obj=stale, obj_in={"is_published": True})
+
+    assert facet_service.get_counts(session_factory(), published_only=True) == {
+        "certification_type": {"CEH": 1}, "difficulty_level": {"beginner": 1},
+    }
+    first.close()
+    second.close()
@@ -0,0 +1,98 @@
+# backend/tests/services/test_compression.py
+import asyncio
+
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core import compression
+from app.core.compression import CompressionMiddleware, choose_encoding
+from app.core.config import settings
+
+BODY = b'{"items":[' + b",".join(b'{"title":"Course %d"}' % i for i in range(200)) + b"]}"
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/large")
+    def large():
+        return Response(BODY, media_type="application/json", headers={"ETag": '"v1"'})
+
+    @app.get("/small")
+    def small():
+        return Response(b'{"ok":true}', media_type="application/json")
+
+    @app.get("/image")
+    def image():
+        return Response(BODY, media_type="image/png")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([BODY[:500], BODY[500:]]), media_type="text/plain")
+
+    return TestClient(app)
+
+
+def test_choose_encoding():
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("gzip;q=0, deflate") is None
+    assert choose_encoding("*") == "gzip"
+    assert choose_encoding("") is None
+
+
+def test_compresses_large_allowed_bodies_once_per_etag(monkeypatch):
+    calls = []
+    real_compress = compression.compress
+    monkeypatch.setattr(compression, "compress", lambda body, encoding: calls.append(encoding) or real_compress(body, encoding))
+    client = _client()
+
+    for _ in range(3):
+        response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+        assert response.content == BODY
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"] == 'W/"v1"'
+    assert calls == ["gzip"]
+
+    identity = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers and identity.headers["vary"] == "Accept-Encoding"
+    assert identity.headers["etag"] == '"v1"'
+
+
+def test_skips_small_and_disallowed_bodies_and_streams_the_rest():
+    client = _client()
+    for path in ("/small", "/image"):
+        response = client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers and "vary" not in response.headers
+
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip" and response.content == BODY
+
+
+def test_large_bodies_and_remote_cache_lookups_run_off_the_loop(monkeypatch):
+    on_loop = []
+
+    def running_loop() -> bool:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return True
+
+    real_compress = compression.compress
+    monkeypatch.setattr(compression, "compress", lambda body, encoding: on_loop.append(running_loop()) or real_compress(body, encoding))
+    monkeypatch.setattr(settings, "COMPRESSION_CACHE_TTL_SECONDS", 0)
+    client = _client()
+    for minimum_size in (len(BODY) + 1, len(BODY)):
+        monkeypatch.setattr(settings, "COMPRESSION_THREAD_MIN_SIZE", minimum_size)
+        assert client.get("/large", headers={"Accept-Encoding": "gzip"}).content == BODY
+    assert on_loop == [True, False]
+
+    # Cache lookups against redis go to the threadpool whatever the size
+    monkeypatch.setattr(settings, "COMPRESSION_CACHE_TTL_SECONDS", 60)
+    monkeypatch.setattr(settings, "CACHE_BACKEND", "redis")
+    monkeypatch.setattr(settings, "COMPRESSION_THREAD_MIN_SIZE", len(BODY) + 1)
+    assert client.get("/large", headers={"Accept-Encoding": "gzip"}).content == BODY
+    assert on_loop == [True, False, False]
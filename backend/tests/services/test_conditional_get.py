@@ -0,0 +1,48 @@
+# backend/tests/services/test_conditional_get.py
+from starlette.requests import Request
+
+from app.core.http_cache import ResourceVersion, is_not_modified
+from app.models.user import User
+from app.schemas.course import CourseCreate, LessonCreate, ModuleCreate
+from app.services import course_service
+
+
+def _request(**headers):
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "headers": raw})
+
+
+def test_course_version_changes_with_nested_rows(db):
+    user = User(email="etag@example.com", first_name="E", last_name="Tag", hashed_password="x")
+    db.add(user)
+    db.commit()
+    course = course_service.create(
+        db, obj_in=CourseCreate(title="Cached", difficulty_level="beginner"), creator_id=user.id
+    )
+    module = course_service.create_module(db, obj_in=ModuleCreate(title="M", order_index=1), course_id=course.id)
+
+    before = course_service.get_course_version(db, course.id)
+    assert before.etag == course_service.get_course_version(db, course.id).etag
+    assert before.last_modified is not None
+
+    first = course_service.create_lesson(db, obj_in=LessonCreate(title="L1", content="x"), module_id=module.id)
+    course_service.create_lesson(db, obj_in=LessonCreate(title="L2", content="y"), module_id=module.id)
+    after_insert = course_service.get_course_version(db, course.id)
+    assert after_insert.etag != before.etag
+
+    db.delete(first)
+    db.commit()
+    assert course_service.get_course_version(db, course.id).etag not in (before.etag, after_insert.etag)
+    assert course_service.get_course_version(db, course.id + 1) is None
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    version = ResourceVersion("thing", (1, 2))
+    assert is_not_modified(_request(if_none_match=version.etag), version)
+    assert is_not_modified(_request(if_none_match=f'"other", W/{version.etag}'), version)
+    assert is_not_modified(_request(if_none_match="*"), version)
+    assert not is_not_modified(_request(if_none_match='"other"'), version)
+    assert not is_not_modified(
+        _request(if_none_match='"other"', if_modified_since="Fri, 01 Jan 2100 00:00:00 GMT"), version
+    )
+    assert not is_not_modified(_request(), version)
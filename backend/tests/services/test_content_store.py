@@ -0,0 +1,88 @@
+# backend/tests/services/test_content_store.py
+import asyncio
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.db import content_store
+from app.db.query_stats import track_queries
+from app.models.content import ContentBlob
+from app.models.user import User
+from app.schemas.course import CourseCreate, LessonCreate, ModuleCreate
+from app.services import course_service, lesson_service
+
+
+def _module(db):
+    user = User(email="content@example.com", first_name="Con", last_name="Tent", hashed_password="x")
+    db.add(user)
+    db.commit()
+    course = course_service.create(db, obj_in=CourseCreate(title="Bodies", difficulty_level="beginner"),
+                                   creator_id=user.id)
+    return course_service.create_module(db, obj_in=ModuleCreate(title="M", order_index=1), course_id=course.id)
+
+
+def test_identical_bodies_are_stored_once_and_compressed(db):
+    module = _module(db)
+    body = "Defense in depth layers several controls. " * 100
+    for title in ("A", "B", "C"):
+        course_service.create_lesson(db, obj_in=LessonCreate(title=title, content=body), module_id=module.id)
+    course_service.create_lesson(db, obj_in=LessonCreate(title="D", content="short"), module_id=module.id)
+
+    blobs = {blob.hash: blob for blob in db.scalars(select(ContentBlob))}
+    # Two bodies and their two renders (see render_service)
+    assert len(blobs) == 4
+    long_blob = blobs[content_store.digest(body)]
+    assert long_blob.encoding == "zlib" and len(long_blob.data) < long_blob.size == len(body)
+    assert blobs[content_store.digest("short")].encoding == "identity"
+
+    # Editing moves the lesson to a new blob; the old one and its render are collected once unused
+    lesson = course_service.get_module_lessons(db, module.id)[3]
+    lesson_service.update(db, db_obj=lesson, obj_in={"content": "shorter"})
+    assert content_store.collect_garbage(db) == 2
+    assert db.scalar(select(func.count()).select_from(ContentBlob)) == 4
+
+
+def test_bodies_load_lazily_in_one_batch_then_from_cache(db):
+    module = _module(db)
+    for number in range(5):
+        course_service.create_lesson(db, obj_in=LessonCreate(title=f"L{number}", content=f"Body {number}"),
+                                     module_id=module.id)
+    db.expunge_all()
+    content_store.content_cache.clear()
+
+    with track_queries(strict_limit=0) as stats:
+        lessons = course_service.get_module_lessons(db, module.id)
+        titles = [lesson.title for lesson in lessons]
+    # Listing reads the rows only
+    assert titles == [f"L{number}" for number in range(5)] and stats.statements == 1
+
+    with track_queries(strict_limit=0) as stats:
+        assert [lesson.content for lesson in lessons] == [f"Body {number}" for number in range(5)]
+    # The first body loads those of the whole list
+    assert stats.statements == 1
+
+    db.expunge_all()
+    with track_queries(strict_limit=0) as stats:
+        lesson = course_service.get_lesson(db, lessons[2].id)
+        assert lesson.content == "Body 2"
+    assert stats.statements == 1
+
+
+def test_async_reads_do_not_depend_on_the_cache(db, session_factory, monkeypatch):
+    module = _module(db)
+    bodies = [f"{number} " + "Least privilege limits what each account can reach. " * 2 for number in range(3)]
+    for number, body in enumerate(bodies):
+        course_service.create_lesson(db, obj_in=LessonCreate(title=f"L{number}", content=body), module_id=module.id)
+    # Smaller than the page: preloading evicts the first bodies before they are read
+    monkeypatch.setattr(content_store, "content_cache", content_store.ContentCache(max_chars=150))
+    url = session_factory.kw["bind"].url.set(drivername="sqlite+aiosqlite")
+    async_engine = create_async_engine(url, poolclass=NullPool)
+
+    async def scenario():
+        async with async_sessionmaker(async_engine, expire_on_commit=False)() as async_db:
+            lessons = await course_service.get_module_lessons_async(async_db, module_id=module.id)
+            return [lesson.content for lesson in lessons]
+
+    assert asyncio.run(scenario()) == bodies
+    asyncio.run(async_engine.dispose())
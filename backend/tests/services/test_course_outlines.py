@@ -0,0 +1,136 @@
+# backend/tests/services/test_course_outlines.py
+import json
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.query_stats import track_queries
+from app.db.replica import RoutingSession
+from app.models.course import Course, Module, SearchDocument
+from app.models.user import User
+from app.schemas.course import CourseCreate, CourseResponse, LessonCreate, ModuleCreate
+from app.schemas.lesson import LessonCreate as StandaloneLessonCreate
+from app.schemas.module import ModuleCreate as StandaloneModuleCreate
+from app.services import course_service, lesson_service, module_service, outline_service
+
+
+def _from_rows(factory, course_id):
+    course = course_service.get_tree(factory(), course_id)
+    adapter = TypeAdapter(CourseResponse)
+    tree = json.loads(adapter.dump_json(adapter.validate_python(course, from_attributes=True)))
+    tree["modules"].sort(key=lambda module: (module["order_index"], module["id"]))
+    for module in tree["modules"]:
+        module["lessons"].sort(key=lambda lesson: (lesson["order"], lesson["id"]))
+    return tree
+
+
+def _outline(factory, course_id):
+    outline = outline_service.get(factory(), course_id)
+    return json.loads(outline_service.body(outline)), outline.version
+
+
+def test_writes_keep_the_outline_equal_to_the_rows(session_factory):
+    session = session_factory()
+    user = User(email="outline@example.com", first_name="Out", last_name="Line", hashed_password="x")
+    session.add(user)
+    session.commit()
+    course = course_service.create(
+        session, obj_in=CourseCreate(title="Outlined", difficulty_level="beginner"), creator_id=user.id
+    )
+    other = course_service.create(
+        session, obj_in=CourseCreate(title="Other", difficulty_level="beginner"), creator_id=user.id
+    )
+    first = course_service.create_module(session, obj_in=ModuleCreate(title="First", order_index=2), course_id=course.id)
+    second = module_service.create(session, obj_in=StandaloneModuleCreate(title="Second", course_id=course.id))
+    lesson = course_service.create_lesson(session, obj_in=LessonCreate(title="A", content="x"), module_id=first.id)
+    moved = lesson_service.create(session, obj_in=StandaloneLessonCreate(title="B", content="y", module_id=first.id))
+    assert _outline(session_factory, course.id)[0] == _from_rows(session_factory, course.id)
+    # Bodies stay out of the outline; they are read one lesson at a time
+    modules = _outline(session_factory, course.id)[0]["modules"]
+    assert sum(len(module["lessons"]) for module in modules) == 2
+    assert all("content" not in entry for module in modules for entry in [module, *module["lessons"]])
+
+    versions = [_outline(session_factory, course.id)[1]]
+    steps = [
+        lambda: course_service.update(session, db_obj=course, obj_in={"title": "Renamed", "is_published": True}),
+        lambda: module_service.update(session, db_obj=second, obj_in={"order_index": 0}),
+        lambda: lesson_service.update(session, db_obj=moved, obj_in={"module_id": second.id}),
+        lambda: lesson_service.update(session, db_obj=lesson, obj_in={"title": "A2", "order": 9}),
+        lambda: lesson_service.delete(session, lesson_id=lesson.id),
+        lambda: module_service.update(session, db_obj=second, obj_in={"course_id": other.id}),
+        lambda: module_service.delete(session, module_id=first.id),
+    ]
+    for step in steps:
+        step()
+        for course_id in (course.id, other.id):
+            assert _outline(session_factory, course_id)[0] == _from_rows(session_factory, course_id)
+        versions.append(_outline(session_factory, course.id)[1])
+    assert versions == sorted(versions) and len(set(versions)) > 1
+    assert [m["title"] for m in _outline(session_factory, other.id)[0]["modules"]] == ["Second"]
+
+    course_service.delete(session, id=course.id)
+    assert outline_service.get(session_factory(), course.id) is None
+    session.close()
+
+
+def test_course_writes_build_on_the_current_row(session_factory):
+    session = session_factory()
+    user = User(email="current@example.com", first_name="Cur", last_name="Rent", hashed_password="x")
+    session.add(user)
+    session.commit()
+    course = course_service.create(
+        session, obj_in=CourseCreate(title="Draft", difficulty_level="beginner"), creator_id=user.id
+    )
+    # Another request renames it after this one read the row
+    other = session_factory()
+    course_service.update(other, db_obj=other.get(Course, course.id), obj_in={"title": "Final"})
+    other.close()
+
+    course_service.update(session, db_obj=course, obj_in={"is_published": True})
+    assert course.title == "Final"
+    assert _outline(session_factory, course.id)[0] == _from_rows(session_factory, course.id)
+    document = session_factory().scalars(select(SearchDocument).where(SearchDocument.kind == "course")).one()
+    assert (document.title, document.is_published) == ("Final", True)
+    session.close()
+
+
+def test_outlines_built_on_read_use_the_primary(session_factory, tmp_path, monkeypatch):
+    session = session_factory()
+    session.add(User(id=1, email="primary@example.com", first_name="Pri", last_name="Mary", hashed_password="x"))
+    session.add(Course(id=1, title="Legacy", creator_id=1, difficulty_level="beginner", is_published=True))
+    session.commit()
+    session.close()
+    # A replica that has not caught up yet
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    Base.metadata.create_all(bind=replica)
+    monkeypatch.setattr(RoutingSession, "replica_engine", replica)
+    db = sessionmaker(bind=session_factory.kw["bind"], class_=RoutingSession)()
+    db.info["use_replica"] = True
+
+    outline = outline_service.get(db, 1)
+    assert outline is not None and json.loads(outline_service.body(outline))["title"] == "Legacy"
+    db.close()
+    replica.dispose()
+
+
+def test_reads_are_one_lookup_and_legacy_courses_are_built_on_demand(session_factory):
+    session = session_factory()
+    session.add(User(id=1, email="legacy@example.com", first_name="Leg", last_name="Acy", hashed_password="x"))
+    session.add(Course(id=1, title="Legacy", creator_id=1, difficulty_level="beginner", is_published=True))
+    session.add(Module(id=1, title="M", course_id=1, order_index=1))
+    session.commit()
+    session.close()
+
+    assert _outline(session_factory, 1)[0] == _from_rows(session_factory, 1)
+    with track_queries(strict_limit=0) as stats:
+        outline = outline_service.get(session_factory(), 1)
+        outline_service.body(outline)
+    assert stats.statements == 1
+
+    with track_queries(strict_limit=0) as stats:
+        _, body = course_service.get_catalog(session_factory(), published_only=True, use_cursor=True)
+        catalog = json.loads(body)
+    assert stats.statements == 1
+    assert catalog["items"] == [_from_rows(session_factory, 1)] and catalog["next_cursor"] is None
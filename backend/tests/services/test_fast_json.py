@@ -0,0 +1,59 @@
+# backend/tests/services/test_fast_json.py
+import json
+from datetime import datetime, timezone
+from typing import List
+
+import pytest
+from pydantic import TypeAdapter
+from sqlalchemy import select
+
+from app.core.fast_json import dumps, page_response, rows_response
+from app.db.pagination import paginate
+from app.models.course import Course
+from app.models.enrollment import Enrollment
+from app.models.user import User
+from app.schemas.enrollment import EnrollmentResponse
+from app.schemas.pagination import CursorPage
+from app.schemas.user import UserResponse
+from app.services import enrollment_service, user_service
+
+
+@pytest.fixture
+def db(db):
+    # The conftest database, seeded
+    for i in range(3):
+        db.add(User(id=i + 1, email=f"fast{i}@example.com", first_name="F", last_name=str(i),
+                    hashed_password="secret", is_active=i != 1))
+    db.add(Course(id=1, title="Fast", creator_id=1, difficulty_level="beginner"))
+    db.add_all(Enrollment(user_id=i + 1, course_id=1, progress=12.5 * i) for i in range(3))
+    db.commit()
+    return db
+
+
+def _response_model(schema, value):
+    adapter = TypeAdapter(schema)
+    return json.loads(adapter.dump_json(adapter.validate_python(value, from_attributes=True)))
+
+
+def test_rows_match_the_response_model_output(db):
+    body = rows_response(user_service.get_multi_rows(db)).body
+    assert json.loads(body) == _response_model(List[UserResponse], user_service.get_multi(db))
+    assert b"secret" not in body
+
+    enrollments = json.loads(rows_response(enrollment_service.get_multi_rows(db, user_id=2)).body)
+    expected = _response_model(List[EnrollmentResponse], db.query(Enrollment).filter(Enrollment.user_id == 2).all())
+    assert enrollments == expected and len(enrollments) == 1
+
+
+def test_pages_match_and_cursors_interchange(db):
+    first = user_service.get_page_rows(db, limit=2)
+    assert json.loads(page_response(first).body) == _response_model(
+        CursorPage[UserResponse], paginate(db, select(User), user_service.USER_KEYSET, cursor=None, limit=2)
+    )
+    rest = paginate(db, select(User), user_service.USER_KEYSET, cursor=first.next_cursor, limit=2)
+    assert [user.id for user in rest.items] == [3]
+
+
+def test_utc_datetimes_encode_like_pydantic():
+    value = {"at": datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)}
+    assert json.loads(dumps(value)) == {"at": "2026-01-02T03:04:05Z"}
@@ -0,0 +1,141 @@
+# backend/tests/services/test_lesson_rendering.py
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core import rendering
+from app.core.config import settings
+from app.db.base import Base
+from app.db.replica import RoutingSession
+from app.models.course import RenderedContent
+from app.models.user import User
+from app.schemas.course import CourseCreate, LessonCreate, ModuleCreate
+from app.schemas.lesson import LessonCreate as StandaloneLessonCreate
+from app.services import course_service, lesson_service, outline_service, render_service
+
+CHAPTER = """# Access control
+
+Models include *DAC*, **MAC** and [RBAC](https://example.com/rbac "Roles").
+<script>alert("x")</script><a href=" javascript:alert(1)" onclick="x">click</a>
+
+## Access control
+
+- Identification
+- Authentication
+
+```sql
+SELECT * FROM users WHERE name = '<admin>';
+```
+"""
+
+
+def test_render_sanitizes_and_builds_toc():
+    rendered = rendering.render(CHAPTER)
+    html = rendered["html"]
+    assert '<h1 id="access-control">Access control</h1>' in html
+    assert '<h2 id="access-control-1">Access control</h2>' in html
+    assert '<a href="https://example.com/rbac" title="Roles" rel="nofollow noopener">RBAC</a>' in html
+    assert "<script" not in html and "alert" not in html and "onclick" not in html
+    assert "<a>click</a>" in html
+    assert '<pre><code class="language-sql">SELECT * FROM users WHERE name = \'&lt;admin&gt;\';</code></pre>' in html
+    assert rendered["toc"] == [
+        {"level": 1, "id": "access-control", "title": "Access control"},
+        {"level": 2, "id": "access-control-1", "title": "Access control"},
+    ]
+    assert rendered["reading_time_minutes"] == 1
+    # Destinations keep balanced parentheses
+    assert rendering.render("[w](https://en.wikipedia.org/wiki/Foo_(bar)) (x)")["html"] == (
+        '<p><a href="https://en.wikipedia.org/wiki/Foo_(bar)" rel="nofollow noopener">w</a> (x)</p>'
+    )
+    assert '<img src="diagram_(v2).png" alt="d">' in rendering.render("![d](diagram_(v2).png)")["html"]
+    # Emphasis applies to link text, never to destinations
+    assert rendering.render("[*a*](http://x.com/*foo*) ![i](/_static_/i.png)")["html"] == (
+        '<p><a href="http://x.com/*foo*" rel="nofollow noopener"><em>a</em></a> <img src="/_static_/i.png" alt="i"></p>'
+    )
+    assert rendering.render("word " * 450)["reading_time_minutes"] == 3
+    # Bodies cannot forge the placeholders of set-aside spans
+    assert rendering.render("a \x000\x00 `b`")["html"] == "<p>a \ufffd0\ufffd <code>b</code></p>"
+
+
+def test_lessons_are_rendered_on_write_and_served_rendered(db, monkeypatch):
+    user = User(email="render@example.com", first_name="Ren", last_name="Der", hashed_password="x")
+    db.add(user)
+    db.commit()
+    course = course_service.create(db, obj_in=CourseCreate(title="CISSP", difficulty_level="advanced"),
+                                   creator_id=user.id)
+    module = course_service.create_module(db, obj_in=ModuleCreate(title="IAM", order_index=1), course_id=course.id)
+    lesson = course_service.create_lesson(db, obj_in=LessonCreate(title="Models", content=CHAPTER), module_id=module.id)
+    course_service.create_lesson(db, obj_in=LessonCreate(title="Copy", content=CHAPTER), module_id=module.id)
+    # Identical bodies share one render
+    assert db.scalar(select(func.count()).select_from(RenderedContent)) == 1
+
+    def no_render(source):
+        raise AssertionError("rendered on read")
+
+    monkeypatch.setattr(rendering, "render", no_render)
+    served = render_service.lesson_response(db, lesson)
+    assert served["html"] == render_service.get(db, lesson)["html"] and "content" not in served
+    assert [entry["id"] for entry in served["toc"]] == ["access-control", "access-control-1"]
+    monkeypatch.undo()
+
+    lesson_service.update(db, db_obj=lesson, obj_in={"content": "# Biometrics\n\nFalse accept rates"})
+    assert [entry["title"] for entry in render_service.lesson_response(db, lesson)["toc"]] == ["Biometrics"]
+
+    # Renders from an older renderer are redone on their next read
+    monkeypatch.setattr(rendering, "RENDERER_VERSION", rendering.RENDERER_VERSION + 1)
+    assert render_service.get(db, lesson)["toc"][0]["title"] == "Biometrics"
+    stored = db.get(RenderedContent, lesson.content_hash, populate_existing=True)
+    assert stored.renderer_version == rendering.RENDERER_VERSION
+
+
+def test_renders_on_read_are_served_without_reading_them_back(session_factory, tmp_path, monkeypatch):
+    db = session_factory()
+    user = User(email="replica@example.com", first_name="Re", last_name="Plica", hashed_password="x")
+    db.add(user)
+    db.commit()
+    course = course_service.create(db, obj_in=CourseCreate(title="Replicated", difficulty_level="beginner"),
+                                   creator_id=user.id)
+    module = course_service.create_module(db, obj_in=ModuleCreate(title="M", order_index=1), course_id=course.id)
+    lesson = course_service.create_lesson(db, obj_in=LessonCreate(title="L", content=CHAPTER), module_id=module.id)
+    db.close()
+    # The render is stale and the replica has not seen the new one
+    monkeypatch.setattr(rendering, "RENDERER_VERSION", rendering.RENDERER_VERSION + 1)
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    Base.metadata.create_all(bind=replica)
+    monkeypatch.setattr(RoutingSession, "replica_engine", replica)
+    routed = sessionmaker(bind=session_factory.kw["bind"], class_=RoutingSession)()
+    routed.info["use_replica"] = True
+
+    served = render_service.lesson_response(routed, lesson)
+    assert served["toc"][0] == {"level": 1, "id": "access-control", "title": "Access control"}
+    routed.close()
+    replica.dispose()
+
+
+def test_writers_render_before_locking_the_outline(db, monkeypatch):
+    user = User(email="order@example.com", first_name="Or", last_name="Der", hashed_password="x")
+    db.add(user)
+    db.commit()
+    course = course_service.create(db, obj_in=CourseCreate(title="Locks", difficulty_level="beginner"),
+                                   creator_id=user.id)
+    module = course_service.create_module(db, obj_in=ModuleCreate(title="M", order_index=1), course_id=course.id)
+    calls = []
+    render, lesson_changed = rendering.render, outline_service.lesson_changed
+    monkeypatch.setattr(rendering, "render", lambda source: calls.append("render") or render(source))
+    monkeypatch.setattr(outline_service, "lesson_changed",
+                        lambda *args, **kwargs: calls.append("lock") or lesson_changed(*args, **kwargs))
+
+    lesson = course_service.create_lesson(db, obj_in=LessonCreate(title="A", content="# One"), module_id=module.id)
+    lesson_service.update(db, db_obj=lesson, obj_in={"content": "# Two"})
+    lesson_service.create(db, obj_in=StandaloneLessonCreate(title="B", content="# Three", module_id=module.id))
+    assert calls == ["render", "lock"] * 3
+
+
+def test_large_bodies_render_on_the_pool(monkeypatch):
+    monkeypatch.setattr(settings, "RENDER_WORKERS", 1)
+    monkeypatch.setattr(settings, "RENDER_POOL_MIN_SIZE", 1024)
+    source = CHAPTER * 50
+    try:
+        assert rendering.render_document(source) == rendering.render(source)
+        assert rendering._render_executor is not None
+    finally:
+        rendering.shutdown_render_pool()
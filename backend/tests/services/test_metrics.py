@@ -0,0 +1,53 @@
+# backend/tests/services/test_metrics.py
+import pytest
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import metrics
+from app.db.query_stats import QueryStatsMiddleware
+
+prometheus_client = pytest.importorskip("prometheus_client")
+
+
+def _sample(name, **labels):
+    return prometheus_client.REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def _client() -> TestClient:
+    app = FastAPI(dependencies=[Depends(metrics.track_in_progress)])
+    app.add_middleware(metrics.MetricsMiddleware)
+    app.add_middleware(QueryStatsMiddleware)
+    router = APIRouter()
+
+    @router.get("/things/{thing_id}")
+    def read_thing(thing_id: int):
+        in_flight = _sample("http_requests_in_progress", method="GET", route="/metrics-test/things/{thing_id}")
+        return {"id": thing_id, "in_flight": in_flight}
+
+    app.include_router(router, prefix="/metrics-test")
+    return TestClient(app)
+
+
+def test_requests_are_labelled_by_route_template_and_status():
+    client = _client()
+    route = "/metrics-test/things/{thing_id}"
+    before = _sample("http_requests_total", method="GET", route=route, status="200")
+    unmatched = _sample("http_requests_total", method="GET", route=metrics.UNMATCHED_ROUTE, status="404")
+
+    for thing_id in (1, 2):
+        assert client.get(f"/metrics-test/things/{thing_id}").json()["in_flight"] == 1
+    client.get("/metrics-test/nothing/here")
+
+    assert _sample("http_requests_total", method="GET", route=route, status="200") == before + 2
+    assert _sample("http_requests_total", method="GET", route=metrics.UNMATCHED_ROUTE, status="404") == unmatched + 1
+    assert _sample("http_request_duration_seconds_count", method="GET", route=route) >= 2
+    assert _sample("db_request_time_seconds_count", method="GET", route=route) >= 2
+    assert _sample("http_requests_in_progress", method="GET", route=route) == 0
+
+
+def test_running_totals_become_counter_increments():
+    deltas = metrics._Deltas()
+    counter = prometheus_client.Counter("metrics_test_total", "test", ["source"], registry=None)
+    for total in (3, 5, 5, 2):  # the last one follows a reset of the source
+        deltas.inc(counter, ("pool",), total)
+    assert counter.labels("pool")._value.get() == 7
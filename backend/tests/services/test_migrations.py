@@ -0,0 +1,25 @@
+# backend/tests/services/test_migrations.py
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import create_engine
+
+from app.db.base import Base
+from app.db.fulltext import include_name
+from app.db.migrations import SchemaOutOfDate, alembic_config, verify_schema_revision
+
+
+def test_upgrade_head_matches_models(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migrations.db'}"
+    engine = create_engine(url)
+
+    with pytest.raises(SchemaOutOfDate):
+        verify_schema_revision(engine)
+
+    command.upgrade(alembic_config(url), "head")
+
+    verify_schema_revision(engine)
+    with engine.connect() as connection:
+        assert compare_metadata(MigrationContext.configure(connection, opts={"include_name": include_name}), Base.metadata) == []
+    engine.dispose()
@@ -0,0 +1,55 @@
+# backend/tests/services/test_pagination.py
+import pytest
+from fastapi import HTTPException
+
+from app.models.course import Course
+from app.models.forum import ForumTopic
+from app.models.user import User
+from app.services import forum_service, user_service
+
+
+def _walk(fetch):
+    ids, cursor, page = [], None, None
+    while True:
+        page = fetch(cursor)
+        ids += [item.id for item in page.items]
+        if not page.next_cursor:
+            return ids, page
+        cursor = page.next_cursor
+
+
+def test_forum_topics_keyset_walk(db):
+    user = User(email="pager@example.com", first_name="Pa", last_name="Ger", hashed_password="x")
+    db.add(user)
+    db.flush()
+    course = Course(title="Paging", creator_id=user.id, difficulty_level="beginner")
+    db.add(course)
+    db.flush()
+    # Created in the same second, so the id tiebreaker decides the order
+    db.add_all([
+        ForumTopic(title=f"Topic {i}", content="...", user_id=user.id, course_id=course.id)
+        for i in range(7)
+    ])
+    db.commit()
+
+    ids, last = _walk(lambda cursor: forum_service.get_topics_page(db, cursor=cursor, limit=3))
+    assert ids == sorted(ids, reverse=True) and len(set(ids)) == 7
+
+    previous = forum_service.get_topics_page(db, cursor=last.prev_cursor, limit=3)
+    assert [t.id for t in previous.items] == ids[3:6]
+    assert previous.next_cursor and previous.prev_cursor
+
+
+def test_cursor_from_another_listing_is_rejected(db):
+    db.add_all([
+        User(email=f"pager{i}@example.com", first_name="Pa", last_name="Ger", hashed_password="x")
+        for i in range(3)
+    ])
+    db.commit()
+    ids, _ = _walk(lambda cursor: user_service.get_page_rows(db, cursor=cursor, limit=2))
+    assert len(ids) == 3
+
+    page = user_service.get_page_rows(db, limit=2)
+    with pytest.raises(HTTPException) as exc:
+        forum_service.get_topics_page(db, cursor=page.next_cursor)
+    assert exc.value.status_code == 400
@@ -0,0 +1,61 @@
+# backend/tests/services/test_password_hashing.py
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import security
+from app.core.config import settings
+from app.schemas.user import UserCreate
+from app.services import user_service
+
+
+def _user_in(email):
+    return UserCreate(email=email, password="HashPass123", first_name="Ha", last_name="Sh")
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+def test_async_hashing_round_trips(db, monkeypatch, workers):
+    # 0 hashes on the threadpool, 1 on a worker process
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", workers)
+
+    async def scenario():
+        user = await user_service.create_async(db, obj_in=_user_in(f"hash{workers}@example.com"))
+        assert security.verify_password("HashPass123", user.hashed_password)
+        authenticated = await user_service.authenticate_async(
+            db, email=user.email, password="HashPass123"
+        )
+        assert authenticated.id == user.id
+        assert await user_service.authenticate_async(db, email=user.email, password="wrong") is None
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        security.shutdown_hash_pool()
+
+
+def test_full_queue_is_rejected_with_retry_after(db, monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 0)
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PENDING", 1)
+    release = threading.Event()
+
+    def slow_hash(password):
+        release.wait(5)
+        return "hashed"
+
+    monkeypatch.setattr(security, "get_password_hash", slow_hash)
+
+    async def scenario():
+        first = asyncio.create_task(security.get_password_hash_async("one"))
+        await asyncio.sleep(0.05)
+        with pytest.raises(HTTPException) as busy:
+            await user_service.create_async(db, obj_in=_user_in("busy@example.com"))
+        release.set()
+        assert await first == "hashed"
+        # The slot is free again once the job is done
+        assert await security.get_password_hash_async("two") == "hashed"
+        return busy.value
+
+    error = asyncio.run(scenario())
+    assert error.status_code == 503 and error.headers["Retry-After"] == "1"
@@ -0,0 +1,73 @@
+# backend/tests/services/test_pool_stats.py
+import sqlite3
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.api.endpoints import admin
+from app.core.token_versions import token_versions
+from app.db.async_session import get_async_db
+from app.db.pool import InstrumentedQueuePool, pool_status
+from app.models.user import User
+from app.services import user_service
+
+
+def test_checkouts_waits_and_timeouts_are_counted():
+    pool = InstrumentedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0, timeout=0.05)
+    first = pool.connect()
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+    first.close()
+    pool.connect().close()
+
+    status = pool_status(pool)
+    assert (status["checkouts"], status["timeouts"], status["wait_count"]) == (2, 1, 3)
+    assert status["checked_out"] == 0 and status["size"] == 1
+    # The timed out checkout waited for the whole timeout
+    assert status["wait_max_ms"] >= 50
+    assert status["wait_histogram"][-1] == {"le_ms": "+Inf", "count": 3}
+
+    def refuse():
+        raise sqlite3.OperationalError("refused")
+
+    failing = InstrumentedQueuePool(refuse, pool_size=1)
+    with pytest.raises(sqlite3.OperationalError):
+        failing.connect()
+    assert pool_status(failing)["connect_errors"] == 1
+
+
+def test_endpoint_is_admin_only(db, session_factory):
+    token_versions.clear()
+    url = session_factory.kw["bind"].url.set(drivername="sqlite+aiosqlite")
+    async_engine = create_async_engine(url, poolclass=NullPool)
+    factory = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with factory() as async_db:
+            yield async_db
+
+    app = FastAPI()
+    app.include_router(admin.router, prefix="/admin")
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    client = TestClient(app)
+
+    users = {}
+    for role in ("student", "instructor", "admin"):
+        users[role] = User(email=f"{role}@example.com", first_name="Po", last_name="Ol", hashed_password="x", role=role)
+        db.add(users[role])
+    db.commit()
+
+    def get(role=None):
+        headers = {"Authorization": f"Bearer {user_service.create_access_token(users[role])}"} if role else {}
+        return client.get("/admin/db/pool", headers=headers)
+
+    assert get().status_code == 401
+    assert get("student").status_code == 403
+    assert get("instructor").status_code == 403
+    response = get("admin")
+    assert response.status_code == 200 and "pool_class" in response.json()
+    token_versions.clear()
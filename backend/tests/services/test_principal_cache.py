@@ -0,0 +1,62 @@
+from sqlalchemy import event
+
+from app.core.cache import cache, user_tag
+from app.schemas.user import UserCreate
+from app.services import user_service
+
+
+def _user(db, email: str):
+    user = user_service.get_by_email(db, email=email)
+    if not user:
+        user = user_service.create(db, obj_in=UserCreate(
+            email=email, password="CachePass123", first_name="Cache", last_name="User"
+        ))
+    return user
+
+
+def test_principal_is_served_from_cache(db):
+    user = _user(db, "principal@example.com")
+    cache.clear()
+    db.expunge_all()
+
+    statements = []
+    def count(*args):
+        statements.append(args)
+    event.listen(db.get_bind(), "before_cursor_execute", count)
+    try:
+        first = user_service.get(db, id=user.id)
+        db.expunge_all()
+        second = user_service.get(db, id=user.id)
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", count)
+
+    assert first.email == second.email == "principal@example.com"
+    assert len(statements) == 1
+
+
+def test_update_invalidates_principal(db):
+    user = _user(db, "principal-update@example.com")
+    user_service.get(db, id=user.id)
+
+    user_service.update(db, db_obj=user, obj_in={"role": "instructor"})
+    db.expunge_all()
+    assert user_service.get(db, id=user.id).role == "instructor"
+
+
+def test_principal_is_tagged_by_user(db):
+    user = _user(db, "principal-tag@example.com")
+    cache.clear()
+    user_service.get(db, id=user.id)
+    db.expunge_all()
+
+    statements = []
+    def count(*args):
+        statements.append(args)
+    event.listen(db.get_bind(), "before_cursor_execute", count)
+    try:
+        cache.invalidate(user_tag(user.id))
+        user_service.get(db, id=user.id)
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", count)
+
+    assert len(statements) == 1
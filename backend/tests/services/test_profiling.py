@@ -0,0 +1,51 @@
+# backend/tests/services/test_profiling.py
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.core import profiling
+from app.core.profiling import PROFILE_ID_HEADER, ProfilingMiddleware, create_profile_token, verify_profile_token
+from app.db.query_stats import QueryStatsMiddleware
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+    app.add_middleware(QueryStatsMiddleware)
+    engine = create_engine("sqlite://")
+
+    @app.get("/slow")
+    def slow_endpoint():
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        time.sleep(0.05)
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_tokens_are_signed_and_expire(monkeypatch):
+    token, _ = create_profile_token(7)
+    assert verify_profile_token(token) == 7
+    assert verify_profile_token(token.replace("7.", "8.", 1)) is None
+    assert verify_profile_token("garbage") is None
+
+    monkeypatch.setattr(profiling.time, "time", lambda: 2 ** 40)
+    assert verify_profile_token(token) is None
+
+
+def test_profiles_only_requests_with_a_valid_token():
+    client = _client()
+    assert PROFILE_ID_HEADER.lower() not in client.get("/slow").headers
+    assert client.get("/slow", headers={"X-Profile": "1.1.forged"}).status_code == 403
+
+    token, _ = create_profile_token(1)
+    response = client.get("/slow", params={"_profile": token})
+    assert response.json() == {"ok": True}
+
+    stacks = [line.rpartition(" ")[0].split(";") for line in profiling.get_profile(response.headers[PROFILE_ID_HEADER]).splitlines()]
+    # The sync endpoint is sampled in its worker thread; its SQL is timed separately
+    assert any(any("slow_endpoint" in frame for frame in stack) and stack[0] == "GET /slow" for stack in stacks)
+    assert ["SQL", "GET /slow", "SELECT 1"] in stacks
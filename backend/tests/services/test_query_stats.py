@@ -0,0 +1,22 @@
+# backend/tests/services/test_query_stats.py
+import pytest
+
+from app.db.query_stats import RepeatedStatementError, track_queries
+from app.models.user import User
+
+
+def test_track_queries_counts_statement_shapes(db):
+    with track_queries(strict_limit=0) as stats:
+        for user_id in (1, 2, 3):
+            db.get(User, user_id)
+
+    assert stats.statements == 3
+    assert stats.most_repeated()[0] == 3
+    assert stats.total_time > 0
+
+
+def test_strict_mode_raises_on_repeated_statement(db):
+    with pytest.raises(RepeatedStatementError):
+        with track_queries(strict_limit=2):
+            for user_id in (11, 12, 13):
+                db.get(User, user_id)
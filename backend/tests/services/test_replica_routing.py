@@ -0,0 +1,51 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.replica import ReplicaHealth, RoutingSession
+from app.models.user import User
+
+
+def _engines(tmp_path):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    Base.metadata.create_all(bind=primary)
+    Base.metadata.create_all(bind=replica)
+    with replica.begin() as connection:
+        connection.execute(User.__table__.insert().values(
+            email="replica@example.com", first_name="Re", last_name="Plica", hashed_password="x"
+        ))
+    return primary, replica
+
+
+def test_reads_go_to_replica_until_the_session_writes(tmp_path, monkeypatch):
+    primary, replica = _engines(tmp_path)
+    monkeypatch.setattr(RoutingSession, "replica_engine", replica)
+    db = sessionmaker(bind=primary, class_=RoutingSession)()
+    db.info["use_replica"] = True
+
+    assert db.query(User).filter(User.email == "replica@example.com").first() is not None
+
+    db.add(User(email="primary@example.com", first_name="Pri", last_name="Mary", hashed_password="x"))
+    db.commit()
+    assert db.query(User).filter(User.email == "primary@example.com").first() is not None
+    assert db.query(User).filter(User.email == "replica@example.com").first() is None
+    db.close()
+
+
+def test_primary_used_when_routing_is_off(tmp_path, monkeypatch):
+    primary, replica = _engines(tmp_path)
+    monkeypatch.setattr(RoutingSession, "replica_engine", replica)
+    db = sessionmaker(bind=primary, class_=RoutingSession)()
+
+    assert db.query(User).count() == 0
+    db.close()
+
+
+def test_replica_health_check(tmp_path):
+    _, replica = _engines(tmp_path)
+    health = ReplicaHealth(replica, check_seconds=60, max_lag_seconds=5)
+    assert health.is_healthy()
+
+    health.mark_unhealthy()
+    assert not health.is_healthy()
@@ -0,0 +1,66 @@
+# backend/tests/services/test_response_shaping.py
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from app.db.query_stats import track_queries
+from app.models.user import User
+from app.schemas.course import CourseCreate, LessonCreate, ModuleCreate
+from app.services import course_service
+
+
+def _seed(db, courses):
+    user = User(email="shaping@example.com", first_name="Sha", last_name="Ping", hashed_password="x")
+    db.add(user)
+    db.commit()
+    for number in range(courses):
+        course = course_service.create(
+            db, obj_in=CourseCreate(title=f"Course {number}", difficulty_level="beginner"), creator_id=user.id
+        )
+        for index in (2, 1):
+            module = course_service.create_module(
+                db, obj_in=ModuleCreate(title=f"Module {index}", order_index=index), course_id=course.id
+            )
+            course_service.create_lesson(db, obj_in=LessonCreate(title="Lesson", content="x" * 100), module_id=module.id)
+    db.expunge_all()
+
+
+def _shaped_catalog(db, limit, **params):
+    shape = course_service.get_shape(course_service.COURSE_TREE, **params)
+    with track_queries(strict_limit=0) as stats:
+        _, body = course_service.get_catalog(db, published_only=False, limit=limit, shape=shape)
+    db.expunge_all()
+    return json.loads(body), stats.statements
+
+
+def test_query_count_does_not_grow_with_page_size(db):
+    _seed(db, 6)
+    params = {"expand": "modules.lessons", "fields": "title,modules.title,modules.lessons.title"}
+    small, small_statements = _shaped_catalog(db, 2, **params)
+    large, large_statements = _shaped_catalog(db, 6, **params)
+
+    assert len(small) == 2 and len(large) == 6
+    assert small_statements == large_statements == 3  # courses, modules, lessons
+    assert large[0] == {
+        "id": large[0]["id"],
+        "title": "Course 0",
+        "modules": [
+            {"id": large[0]["modules"][0]["id"], "title": "Module 1",
+             "lessons": [{"id": large[0]["modules"][0]["lessons"][0]["id"], "title": "Lesson"}]},
+            {"id": large[0]["modules"][1]["id"], "title": "Module 2",
+             "lessons": [{"id": large[0]["modules"][1]["lessons"][0]["id"], "title": "Lesson"}]},
+        ],
+    }
+
+
+def test_expand_none_and_unknown_fields(db):
+    _seed(db, 1)
+    courses, statements = _shaped_catalog(db, 10, expand="none", fields=None)
+    assert "modules" not in courses[0] and courses[0]["instructor_id"] and statements == 1
+
+    for params in ({"expand": "lessons", "fields": None}, {"expand": None, "fields": "title,modules.secret"}):
+        with pytest.raises(HTTPException) as error:
+            course_service.get_shape(course_service.COURSE_TREE, **params)
+        assert error.value.status_code == 400
+    assert course_service.get_shape(course_service.COURSE_TREE, expand=None, fields=None) is None
@@ -0,0 +1,74 @@
+# backend/tests/services/test_search.py
+from sqlalchemy.dialects import postgresql
+
+from app.models.user import User
+from app.schemas.course import CourseCreate, LessonCreate, ModuleCreate
+from app.services import course_service, lesson_service, module_service, search_service
+
+
+def _search(db, query, visible_only=False, **kwargs):
+    return search_service.search(db, query=query, visible_only=visible_only, **kwargs)
+
+
+def test_index_follows_writes_and_visibility(db):
+    user = User(email="search@example.com", first_name="Sea", last_name="Rch", hashed_password="x")
+    db.add(user)
+    db.commit()
+    course = course_service.create(
+        db, obj_in=CourseCreate(title="Network defense", description="Firewalls <b>and</b> IDS",
+                                difficulty_level="beginner"),
+        creator_id=user.id,
+    )
+    module = course_service.create_module(db, obj_in=ModuleCreate(title="Perimeter", order_index=1), course_id=course.id)
+    lesson = course_service.create_lesson(
+        db, obj_in=LessonCreate(title="Stateful inspection", content="How firewalls track connections"),
+        module_id=module.id,
+    )
+
+    hits = _search(db, "firewall").items
+    assert {(hit["kind"], hit["id"]) for hit in hits} == {("course", course.id), ("lesson", lesson.id)}
+    course_hit = next(hit for hit in hits if hit["kind"] == "course")
+    assert course_hit["snippet"] == "<mark>Firewalls</mark> &lt;b&gt;and&lt;/b&gt; IDS"
+
+    # Students see nothing until the item and everything it is in are published
+    assert _search(db, "firewall", visible_only=True).items == []
+    course_service.update(db, db_obj=course_service.get(db, course.id), obj_in={"is_published": True})
+    assert [hit["kind"] for hit in _search(db, "firewall", visible_only=True).items] == ["course"]
+    lesson_service.update(db, db_obj=lesson, obj_in={"is_published": True, "title": "Packet inspection"})
+    assert [hit["kind"] for hit in _search(db, "firewall", visible_only=True).items] == ["course"]
+    module_service.update(db, db_obj=module, obj_in={"is_published": True})
+    assert len(_search(db, "firewall", visible_only=True).items) == 2
+    module_service.update(db, db_obj=module, obj_in={"is_published": False})
+    assert [hit["kind"] for hit in _search(db, "firewall", visible_only=True).items] == ["course"]
+    module_service.update(db, db_obj=module, obj_in={"is_published": True})
+    assert _search(db, "stateful inspection").items == []
+    assert _search(db, "packet", kinds=["lesson"]).items[0]["title"] == "<mark>Packet</mark> inspection"
+
+    module_service.delete(db, module_id=module.id)
+    assert [hit["kind"] for hit in _search(db, "firewall").items] == ["course"]
+
+
+def test_results_are_keyset_paginated_by_rank(db):
+    user = User(email="pages@example.com", first_name="Pa", last_name="Ges", hashed_password="x")
+    db.add(user)
+    db.commit()
+    for number in range(5):
+        course_service.create(
+            db, obj_in=CourseCreate(title=f"Malware {number}", description="malware " * number,
+                                    difficulty_level="beginner"),
+            creator_id=user.id,
+        )
+
+    first = _search(db, "malware", limit=3)
+    second = _search(db, "malware", limit=3, cursor=first.next_cursor)
+    ranks = [hit["rank"] for hit in first.items + second.items]
+    assert len(ranks) == 5 and ranks == sorted(ranks, reverse=True)
+    assert second.next_cursor is None and second.prev_cursor is not None
+    assert _search(db, "malware", limit=3, cursor=second.prev_cursor).items == first.items
+    assert _search(db, "!!!").items == []
+
+
+def test_postgresql_rank_round_trips_through_the_cursor():
+    # ts_rank is real (float4); a float8 cursor value would never equal it
+    rank = search_service._match_postgresql("firewall")["rank"]
+    assert str(rank.compile(dialect=postgresql.dialect())).endswith("AS DOUBLE PRECISION)")
@@ -0,0 +1,98 @@
+# backend/tests/services/test_single_flight.py
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.cache import Cache, LRUBackend
+
+
+def _cache():
+    return Cache(LRUBackend(max_entries=100), default_ttl_seconds=60)
+
+
+def test_concurrent_misses_share_one_computation():
+    cache = _cache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return "tree"
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        results = list(pool.map(lambda _: cache.get_or_compute("course_detail:1", compute), range(20)))
+
+    assert results == ["tree"] * 20
+    assert len(calls) == 1
+    # Late arrivals find the stored value; everyone else waited for the leader
+    stats = cache.stats()
+    assert stats["coalesced"] + stats["hits"] == 19
+
+
+def test_callers_on_an_event_loop_never_wait():
+    # Async handlers reach the cache through run_sync, on the loop's thread:
+    # waiting there would stall the loop the leader's queries run on
+    cache = _cache()
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "leader"
+
+    async def main():
+        return cache.get_or_compute("k", lambda: "own")
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        leader = pool.submit(cache.get_or_compute, "k", slow)
+        started.wait(5)
+        began = time.monotonic()
+        assert asyncio.run(main()) == "own"
+        assert time.monotonic() - began < 1
+        release.set()
+        assert leader.result() == "leader"
+    assert cache.stats()["coalesced"] == 0
+
+
+def test_stale_value_served_while_one_caller_refreshes():
+    cache = _cache()
+    cache.get_or_compute("k", lambda: "v1", version=1, stale_ttl=30)
+    refreshing = threading.Event()
+    release = threading.Event()
+
+    def slow_rebuild():
+        refreshing.set()
+        release.wait(5)
+        return "v2"
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        leader = pool.submit(cache.get_or_compute, "k", slow_rebuild, version=2, stale_ttl=30)
+        refreshing.wait(5)
+        # Everyone else gets the previous value instead of waiting or rebuilding
+        assert cache.get_or_compute("k", lambda: "again", version=2, stale_ttl=30) == "v1"
+        release.set()
+        assert leader.result() == "v2"
+
+    assert cache.get_or_compute("k", lambda: "again", version=2, stale_ttl=30) == "v2"
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_leader_errors_reach_waiters_and_are_not_cached():
+    cache = _cache()
+    started = threading.Event()
+
+    def failing():
+        started.set()
+        time.sleep(0.1)
+        raise ValueError("boom")
+
+    def call():
+        try:
+            return cache.get_or_compute("k", failing)
+        except ValueError as e:
+            return str(e)
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        assert list(pool.map(lambda _: call(), range(5))) == ["boom"] * 5
+    assert cache.get_or_compute("k", lambda: "ok") == "ok"
@@ -0,0 +1,89 @@
+# backend/tests/services/test_token_versions.py
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import update
+
+from app.api import deps
+from app.core.token_versions import token_versions
+from app.db.query_stats import track_queries
+from app.models.user import User
+from app.services import user_service
+
+
+@pytest.fixture(autouse=True)
+def version_map():
+    # Per-test databases reuse user ids, so no versions may carry over
+    token_versions.clear()
+    yield token_versions
+    token_versions.clear()
+
+
+def _user(db, role="student"):
+    user = User(email=f"{role}@example.com", first_name="To", last_name="Ken", hashed_password="x", role=role)
+    db.add(user)
+    db.commit()
+    return user
+
+
+def _claims(db, token):
+    return deps.get_active_token_data(deps.get_token_data(db=db, token=token))
+
+
+def test_role_checks_use_the_token_claims_alone(db):
+    student = _user(db)
+    token = user_service.create_access_token(student)
+    user_service.refresh_token_versions(db)
+
+    with track_queries(strict_limit=0) as stats:
+        claims = _claims(db, token)
+        assert claims.role == "student"
+        with pytest.raises(HTTPException) as forbidden:
+            deps.get_instructor_token_data(token_data=claims)
+    assert forbidden.value.status_code == 403
+    assert stats.statements == 0
+
+
+def test_changes_revoke_tokens_locally_and_through_refresh(db, version_map, monkeypatch):
+    user = _user(db)
+    token = user_service.create_access_token(user)
+    user_service.update(db, db_obj=user, obj_in={"role": "instructor"})
+    with pytest.raises(HTTPException) as revoked:
+        _claims(db, token)
+    assert revoked.value.status_code == 401
+    token = user_service.create_access_token(user)
+    assert _claims(db, token).role == "instructor"
+
+    # Another worker deactivates the user: seen here on the next refresh
+    user_service.refresh_token_versions(db)
+    db.execute(update(User).where(User.id == user.id).values(
+        is_active=False, token_version=User.token_version + 1, updated_at=datetime.now(timezone.utc),
+    ))
+    db.commit()
+    assert _claims(db, token).sub == user.id
+    monkeypatch.setattr(version_map, "refresh_seconds", 0)
+    with pytest.raises(HTTPException) as revoked:
+        _claims(db, token)
+    assert revoked.value.status_code == 401
+
+
+def test_users_changed_before_the_refresh_window_are_looked_up(db, version_map):
+    # Password changed long ago, then the worker restarted with an empty map
+    user = _user(db)
+    stale = user_service.create_access_token(user)
+    db.execute(update(User).where(User.id == user.id).values(
+        token_version=3, updated_at=datetime.now(timezone.utc) - timedelta(days=30),
+    ))
+    db.commit()
+    db.refresh(user)
+    token = user_service.create_access_token(user)
+    version_map.clear()
+
+    with track_queries(strict_limit=0) as stats:
+        assert _claims(db, token).sub == user.id
+        assert _claims(db, token).sub == user.id
+    # The refresh, then one lookup whose result is kept
+    assert stats.statements == 2
+    with pytest.raises(HTTPException):
+        _claims(db, stale)
@@ -0,0 +1,53 @@
+# backend/tests/services/test_write_round_trips.py
+from app.db.query_stats import track_queries
+from app.models.course import Lesson, Module
+from app.models.user import User
+from app.schemas.course import CourseCreate
+from app.schemas.progress import LessonCompletionCreate
+from app.services import course_service, progress_service
+
+
+def test_create_and_update_read_back_server_values_without_refresh(db):
+    user = User(email="writer@example.com", first_name="Wri", last_name="Ter", hashed_password="x")
+    db.add(user)
+    db.commit()
+
+    with track_queries(strict_limit=0) as stats:
+        course = course_service.create(
+            db, obj_in=CourseCreate(title="Writes", difficulty_level="beginner"), creator_id=user.id
+        )
+        assert course.id and course.created_at and course.modules == []
+    # The course row, then its outline (see outline_service), search document and facet counts
+    assert stats.statements == 4
+
+    with track_queries(strict_limit=0) as stats:
+        course_service.update(db, db_obj=course, obj_in={"title": "Rewritten"})
+        assert course.updated_at is not None
+    # The row, read back under its lock; then the outline header and search
+    # document, replaced without reading them first. The facet counts are
+    # untouched as no facet changed
+    assert stats.statements == 4
+
+
+def test_mark_lesson_complete_upserts(db):
+    user = User(email="learner@example.com", first_name="Lea", last_name="Rner", hashed_password="x")
+    db.add(user)
+    db.flush()
+    course = course_service._build_course(CourseCreate(title="Upserts", difficulty_level="beginner"), user.id)
+    db.add(course)
+    db.flush()
+    module = Module(title="M", course_id=course.id, order_index=1)
+    db.add(module)
+    db.flush()
+    lesson = Lesson(title="L", content="...", module_id=module.id, order=1)
+    db.add(lesson)
+    db.commit()
+
+    with track_queries(strict_limit=0) as stats:
+        first = progress_service.mark_lesson_complete(db, user.id, lesson.id, LessonCompletionCreate())
+        second = progress_service.mark_lesson_complete(
+            db, user.id, lesson.id, LessonCompletionCreate(notes="Reviewed")
+        )
+    assert stats.statements == 2
+    assert first.id == second.id
+    assert second.notes == "Reviewed" and second.completion_percentage == 100